@@ -8,9 +8,10 @@ from sqlalchemy.ext.asyncio import async_engine_from_config
 from alembic import context
 from src.core.config import settings
 from src.core.db import Base
-from src.models.notification import Notification
+from src.models.notification import Notification, NotificationKey
+from src.models.outbox import NotificationOutbox
 
-__all__ = ("Notification",)
+__all__ = ("Notification", "NotificationKey", "NotificationOutbox")
 # this is the Alembic Config object, which provides
 # access to the values within the .ini file in use.
 config = context.config
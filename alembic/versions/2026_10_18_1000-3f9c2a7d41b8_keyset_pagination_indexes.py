@@ -0,0 +1,41 @@
+"""Keyset pagination indexes
+
+Revision ID: 3f9c2a7d41b8
+Revises: 6bee30ca3720
+Create Date: 2026-10-18 10:00:12.481517
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "3f9c2a7d41b8"
+down_revision: Union[str, None] = "6bee30ca3720"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        "ix_notifications_created_id",
+        "notifications",
+        ["created_at", "id"],
+        unique=False,
+    )
+    op.create_index(
+        "ix_notifications_user_created_id",
+        "notifications",
+        ["user_id", "created_at", "id"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(
+        "ix_notifications_user_created_id", table_name="notifications"
+    )
+    op.drop_index("ix_notifications_created_id", table_name="notifications")
@@ -0,0 +1,32 @@
+"""Notification row version
+
+Revision ID: 8d2e5b1c7a94
+Revises: 3f9c2a7d41b8
+Create Date: 2026-10-18 11:30:41.902215
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "8d2e5b1c7a94"
+down_revision: Union[str, None] = "3f9c2a7d41b8"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "notifications",
+        sa.Column("version", sa.Integer(), server_default="1", nullable=False),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column("notifications", "version")
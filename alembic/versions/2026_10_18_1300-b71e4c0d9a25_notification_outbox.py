@@ -0,0 +1,70 @@
+"""Notification outbox
+
+Revision ID: b71e4c0d9a25
+Revises: 8d2e5b1c7a94
+Create Date: 2026-10-18 13:00:12.417093
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "b71e4c0d9a25"
+down_revision: Union[str, None] = "8d2e5b1c7a94"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "notification_outbox",
+        sa.Column(
+            "id", sa.BigInteger(), sa.Identity(always=True), nullable=False
+        ),
+        sa.Column("notification_id", sa.UUID(), nullable=False),
+        sa.Column("user_id", sa.UUID(), nullable=False),
+        sa.Column(
+            "created_at",
+            postgresql.TIMESTAMP(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+        sa.Column(
+            "dispatched_at",
+            postgresql.TIMESTAMP(timezone=True),
+            nullable=True,
+        ),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        "ix_notification_outbox_pending",
+        "notification_outbox",
+        ["id"],
+        unique=False,
+        postgresql_where=sa.text("dispatched_at IS NULL"),
+    )
+    op.create_index(
+        "ix_notification_outbox_dispatched_at",
+        "notification_outbox",
+        ["dispatched_at"],
+        unique=False,
+        postgresql_where=sa.text("dispatched_at IS NOT NULL"),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(
+        "ix_notification_outbox_dispatched_at",
+        table_name="notification_outbox",
+    )
+    op.drop_index(
+        "ix_notification_outbox_pending", table_name="notification_outbox"
+    )
+    op.drop_table("notification_outbox")
@@ -0,0 +1,61 @@
+"""Notification keywords and full-text search
+
+Revision ID: 4c8d2f6a1e93
+Revises: b71e4c0d9a25
+Create Date: 2026-10-18 14:30:27.658104
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "4c8d2f6a1e93"
+down_revision: Union[str, None] = "b71e4c0d9a25"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "notifications",
+        sa.Column(
+            "keywords",
+            postgresql.ARRAY(sa.Text()),
+            server_default="{}",
+            nullable=False,
+        ),
+    )
+    op.add_column(
+        "notifications",
+        sa.Column(
+            "search_vector",
+            postgresql.TSVECTOR(),
+            sa.Computed(
+                "setweight(to_tsvector('simple', coalesce(title, '')), 'A')"
+                " || setweight(to_tsvector('simple', coalesce(text, '')),"
+                " 'B')",
+                persisted=True,
+            ),
+            nullable=True,
+        ),
+    )
+    op.create_index(
+        "ix_notifications_search_vector",
+        "notifications",
+        ["search_vector"],
+        unique=False,
+        postgresql_using="gin",
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_notifications_search_vector", table_name="notifications")
+    op.drop_column("notifications", "search_vector")
+    op.drop_column("notifications", "keywords")
@@ -0,0 +1,176 @@
+"""Partition notifications by month of created_at
+
+Revision ID: e5a93b7c2d18
+Revises: 4c8d2f6a1e93
+Create Date: 2026-10-18 16:00:53.281740
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "e5a93b7c2d18"
+down_revision: Union[str, None] = "4c8d2f6a1e93"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Секции создаются от месяца самого старого уведомления до текущего месяца
+# плюс MONTHS_AHEAD; дальше их создает задача обслуживания секций.
+MONTHS_AHEAD = 3
+
+SEARCH_VECTOR_EXPRESSION = (
+    "setweight(to_tsvector('simple', coalesce(title, '')), 'A')"
+    " || setweight(to_tsvector('simple', coalesce(text, '')), 'B')"
+)
+
+COLUMNS = (
+    "id, user_id, title, text, created_at, updated_at, read_at, "
+    "category, confidence, processing_status, version, keywords"
+)
+
+INDEXES = (
+    ("ix_notifications_category", ["category"], {}),
+    ("ix_notifications_processing_status", ["processing_status"], {}),
+    ("ix_notifications_user_id", ["user_id"], {}),
+    (
+        "ix_notifications_user_status_created",
+        ["user_id", "processing_status", "created_at"],
+        {},
+    ),
+    ("ix_notifications_created_id", ["created_at", "id"], {}),
+    (
+        "ix_notifications_user_created_id",
+        ["user_id", "created_at", "id"],
+        {},
+    ),
+    (
+        "ix_notifications_search_vector",
+        ["search_vector"],
+        {"postgresql_using": "gin"},
+    ),
+)
+
+CREATE_PARTITIONS = f"""
+DO $$
+DECLARE
+    month timestamp := date_trunc(
+        'month',
+        coalesce(
+            (SELECT min(created_at) FROM notifications_unpartitioned),
+            now()
+        ) AT TIME ZONE 'UTC'
+    );
+    last_month timestamp := date_trunc('month', now() AT TIME ZONE 'UTC')
+        + interval '{MONTHS_AHEAD} months';
+BEGIN
+    WHILE month <= last_month LOOP
+        EXECUTE format(
+            'CREATE TABLE %I PARTITION OF notifications '
+            'FOR VALUES FROM (%L) TO (%L)',
+            'notifications_' || to_char(month, 'YYYY_MM'),
+            month::text || '+00',
+            (month + interval '1 month')::text || '+00'
+        );
+        month := month + interval '1 month';
+    END LOOP;
+END
+$$;
+"""
+
+
+def _create_notifications_table(primary_key, **kwargs) -> None:
+    op.create_table(
+        "notifications",
+        sa.Column("id", sa.UUID(), nullable=False),
+        sa.Column("user_id", sa.UUID(), nullable=False),
+        sa.Column("title", sa.String(length=256), nullable=False),
+        sa.Column("text", sa.Text(), nullable=False),
+        sa.Column(
+            "created_at",
+            postgresql.TIMESTAMP(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+        sa.Column(
+            "updated_at",
+            postgresql.TIMESTAMP(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+        sa.Column(
+            "read_at", postgresql.TIMESTAMP(timezone=True), nullable=True
+        ),
+        sa.Column(
+            "category",
+            postgresql.ENUM(name="notification_category", create_type=False),
+            nullable=True,
+        ),
+        sa.Column("confidence", sa.Float(), nullable=True),
+        sa.Column(
+            "processing_status",
+            postgresql.ENUM(
+                name="notification_processing_status", create_type=False
+            ),
+            nullable=False,
+        ),
+        sa.Column("version", sa.Integer(), server_default="1", nullable=False),
+        sa.Column(
+            "keywords",
+            postgresql.ARRAY(sa.Text()),
+            server_default="{}",
+            nullable=False,
+        ),
+        sa.Column(
+            "search_vector",
+            postgresql.TSVECTOR(),
+            sa.Computed(SEARCH_VECTOR_EXPRESSION, persisted=True),
+            nullable=True,
+        ),
+        primary_key,
+        **kwargs,
+    )
+
+
+def _replace_notifications_table(primary_key, **kwargs) -> None:
+    """
+    Переименовывает текущую таблицу, создает новую с теми же колонками,
+    переносит в нее данные и удаляет старую.
+    """
+    for name, _, _ in INDEXES:
+        op.drop_index(name, table_name="notifications")
+    op.rename_table("notifications", "notifications_unpartitioned")
+    op.execute(
+        "ALTER TABLE notifications_unpartitioned "
+        "RENAME CONSTRAINT notifications_pkey "
+        "TO notifications_unpartitioned_pkey"
+    )
+    _create_notifications_table(primary_key, **kwargs)
+    if "postgresql_partition_by" in kwargs:
+        op.execute(CREATE_PARTITIONS)
+    op.execute(
+        f"INSERT INTO notifications ({COLUMNS}) "
+        f"SELECT {COLUMNS} FROM notifications_unpartitioned"
+    )
+    op.drop_table("notifications_unpartitioned")
+    for name, columns, options in INDEXES:
+        op.create_index(
+            name, "notifications", columns, unique=False, **options
+        )
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    _replace_notifications_table(
+        sa.PrimaryKeyConstraint("id", "created_at"),
+        postgresql_partition_by="RANGE (created_at)",
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    _replace_notifications_table(sa.PrimaryKeyConstraint("id"))
@@ -0,0 +1,97 @@
+"""Notification keys
+
+Revision ID: 9a4f1c6e3b27
+Revises: e5a93b7c2d18
+Create Date: 2026-10-18 17:00:41.620384
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "9a4f1c6e3b27"
+down_revision: Union[str, None] = "e5a93b7c2d18"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Триггеры уровня оператора с таблицами переходов: COPY и пакетная
+# вставка добавляют ключи одним INSERT на оператор, а не на строку.
+# Повтор id нарушает первичный ключ notification_keys и отменяет
+# вставку уведомлений целиком.
+CREATE_TRIGGERS = """
+CREATE FUNCTION notification_keys_insert() RETURNS trigger
+LANGUAGE plpgsql AS $$
+BEGIN
+    INSERT INTO notification_keys (id, created_at)
+    SELECT id, created_at FROM new_rows;
+    RETURN NULL;
+END
+$$;
+
+CREATE FUNCTION notification_keys_delete() RETURNS trigger
+LANGUAGE plpgsql AS $$
+BEGIN
+    DELETE FROM notification_keys k USING old_rows o WHERE k.id = o.id;
+    RETURN NULL;
+END
+$$;
+
+CREATE TRIGGER notification_keys_insert
+AFTER INSERT ON notifications
+REFERENCING NEW TABLE AS new_rows
+FOR EACH STATEMENT EXECUTE FUNCTION notification_keys_insert();
+
+CREATE TRIGGER notification_keys_delete
+AFTER DELETE ON notifications
+REFERENCING OLD TABLE AS old_rows
+FOR EACH STATEMENT EXECUTE FUNCTION notification_keys_delete();
+"""
+
+DROP_TRIGGERS = """
+DROP TRIGGER notification_keys_delete ON notifications;
+DROP TRIGGER notification_keys_insert ON notifications;
+DROP FUNCTION notification_keys_delete();
+DROP FUNCTION notification_keys_insert();
+"""
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "notification_keys",
+        sa.Column("id", sa.UUID(), nullable=False),
+        sa.Column(
+            "created_at",
+            postgresql.TIMESTAMP(timezone=True),
+            nullable=False,
+        ),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    # Из уже повторенных id в ключи попадает самая ранняя строка;
+    # поиск по id находит только ее.
+    op.execute(
+        "INSERT INTO notification_keys (id, created_at) "
+        "SELECT DISTINCT ON (id) id, created_at FROM notifications "
+        "ORDER BY id, created_at"
+    )
+    op.create_index(
+        "ix_notification_keys_created_at",
+        "notification_keys",
+        ["created_at"],
+        unique=False,
+    )
+    op.execute(CREATE_TRIGGERS)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute(DROP_TRIGGERS)
+    op.drop_index(
+        "ix_notification_keys_created_at", table_name="notification_keys"
+    )
+    op.drop_table("notification_keys")
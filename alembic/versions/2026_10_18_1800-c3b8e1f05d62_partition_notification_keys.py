@@ -0,0 +1,153 @@
+"""Partition notification keys by month of created_at
+
+Revision ID: c3b8e1f05d62
+Revises: 9a4f1c6e3b27
+Create Date: 2026-10-18 18:00:12.904517
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "c3b8e1f05d62"
+down_revision: Union[str, None] = "9a4f1c6e3b27"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Секции ключей повторяют границы секций уведомлений: месяц удаляется
+# вместе с его ключами через DROP TABLE.
+CREATE_PARTITIONS = """
+DO $$
+DECLARE
+    part record;
+BEGIN
+    FOR part IN
+        SELECT c.relname, pg_get_expr(c.relpartbound, c.oid) AS bound
+        FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid
+        WHERE i.inhparent = 'notifications'::regclass
+    LOOP
+        EXECUTE format(
+            'CREATE TABLE %I PARTITION OF notification_keys %s',
+            replace(part.relname, 'notifications_', 'notification_keys_'),
+            part.bound
+        );
+    END LOOP;
+END
+$$;
+"""
+
+# Первичный ключ секционированной таблицы включает created_at, поэтому
+# уникальность id проверяет триггер вставки: повтор id среди вставленных
+# строк или уже существующих ключей отменяет вставку с ошибкой
+# уникальности.
+CREATE_INSERT_FUNCTION = """
+CREATE OR REPLACE FUNCTION notification_keys_insert() RETURNS trigger
+LANGUAGE plpgsql AS $$
+DECLARE
+    duplicate uuid;
+BEGIN
+    SELECT id INTO duplicate FROM (
+        SELECT id FROM new_rows GROUP BY id HAVING count(*) > 1
+        UNION ALL
+        SELECT n.id FROM new_rows n
+        WHERE EXISTS (SELECT 1 FROM notification_keys k WHERE k.id = n.id)
+    ) duplicates
+    LIMIT 1;
+    IF FOUND THEN
+        RAISE EXCEPTION 'duplicate notification id %', duplicate
+            USING ERRCODE = 'unique_violation';
+    END IF;
+    INSERT INTO notification_keys (id, created_at)
+    SELECT id, created_at FROM new_rows;
+    RETURN NULL;
+END
+$$;
+
+CREATE OR REPLACE FUNCTION notification_keys_delete() RETURNS trigger
+LANGUAGE plpgsql AS $$
+BEGIN
+    DELETE FROM notification_keys k USING old_rows o
+    WHERE k.id = o.id AND k.created_at = o.created_at;
+    RETURN NULL;
+END
+$$;
+"""
+
+RESTORE_INSERT_FUNCTION = """
+CREATE OR REPLACE FUNCTION notification_keys_insert() RETURNS trigger
+LANGUAGE plpgsql AS $$
+BEGIN
+    INSERT INTO notification_keys (id, created_at)
+    SELECT id, created_at FROM new_rows;
+    RETURN NULL;
+END
+$$;
+
+CREATE OR REPLACE FUNCTION notification_keys_delete() RETURNS trigger
+LANGUAGE plpgsql AS $$
+BEGIN
+    DELETE FROM notification_keys k USING old_rows o WHERE k.id = o.id;
+    RETURN NULL;
+END
+$$;
+"""
+
+
+def _replace_keys_table(primary_key, **kwargs) -> None:
+    """
+    Переименовывает текущую таблицу ключей, создает новую, переносит
+    в нее ключи и удаляет старую.
+    """
+    op.rename_table("notification_keys", "notification_keys_old")
+    op.execute(
+        "ALTER TABLE notification_keys_old "
+        "RENAME CONSTRAINT notification_keys_pkey "
+        "TO notification_keys_old_pkey"
+    )
+    op.create_table(
+        "notification_keys",
+        sa.Column("id", sa.UUID(), nullable=False),
+        sa.Column(
+            "created_at",
+            postgresql.TIMESTAMP(timezone=True),
+            nullable=False,
+        ),
+        primary_key,
+        **kwargs,
+    )
+    if "postgresql_partition_by" in kwargs:
+        op.execute(CREATE_PARTITIONS)
+    op.execute(
+        "INSERT INTO notification_keys (id, created_at) "
+        "SELECT id, created_at FROM notification_keys_old"
+    )
+    op.drop_table("notification_keys_old")
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.drop_index(
+        "ix_notification_keys_created_at", table_name="notification_keys"
+    )
+    _replace_keys_table(
+        sa.PrimaryKeyConstraint("id", "created_at"),
+        postgresql_partition_by="RANGE (created_at)",
+    )
+    op.execute(CREATE_INSERT_FUNCTION)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute(RESTORE_INSERT_FUNCTION)
+    _replace_keys_table(sa.PrimaryKeyConstraint("id"))
+    op.create_index(
+        "ix_notification_keys_created_at",
+        "notification_keys",
+        ["created_at"],
+        unique=False,
+    )
@@ -0,0 +1,69 @@
+"""
+Сравнение сериализации уведомления для кэша: pickle ORM объекта
+против NotificationSerializer (orjson + версия формата).
+
+Запуск: python -m benchmarks.bench_cache_serialization
+"""
+
+import pickle
+import timeit
+import uuid
+from datetime import datetime, timezone
+
+from src.core.cache import NotificationSerializer
+from src.models.notification import Notification
+from src.schemas.enums import NotificationCategory, ProcessingStatus
+
+NUMBER = 20000
+
+
+def make_notification() -> Notification:
+    now = datetime.now(timezone.utc)
+    return Notification(
+        id=uuid.uuid4(),
+        user_id=uuid.uuid4(),
+        title="Disk usage on db-01",
+        text="Attention: disk usage on db-01 exceeded 85%, be careful.",
+        created_at=now,
+        updated_at=now,
+        read_at=None,
+        category=NotificationCategory.WARNING,
+        confidence=0.83,
+        processing_status=ProcessingStatus.COMPLETED,
+    )
+
+
+def measure(name: str, dumps, loads, value) -> dict:
+    payload = dumps(value)
+    encode = timeit.timeit(lambda: dumps(value), number=NUMBER)
+    decode = timeit.timeit(lambda: loads(payload), number=NUMBER)
+    return {
+        "name": name,
+        "size_bytes": len(payload),
+        "encode_us": encode / NUMBER * 1e6,
+        "decode_us": decode / NUMBER * 1e6,
+    }
+
+
+def run() -> list[dict]:
+    notification = make_notification()
+    serializer = NotificationSerializer()
+    return [
+        measure("pickle_orm", pickle.dumps, pickle.loads, notification),
+        measure(
+            "orjson_dto", serializer.dumps, serializer.loads, notification
+        ),
+    ]
+
+
+def main() -> None:
+    print(f"{'format':<12}{'size, B':>10}{'encode, us':>14}{'decode, us':>14}")
+    for row in run():
+        print(
+            f"{row['name']:<12}{row['size_bytes']:>10}"
+            f"{row['encode_us']:>14.2f}{row['decode_us']:>14.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""
+CPU время сериализации ответа списка уведомлений при limit=100:
+model_validate каждой строки, повторная проверка response_model и
+ORJSONResponse (как делает FastAPI) против NotificationJSONResponse,
+который сериализует NotificationDTO в JSON за один проход.
+
+Запуск: python -m benchmarks.bench_list_response
+"""
+
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import List
+
+from fastapi.responses import ORJSONResponse
+from pydantic import TypeAdapter
+
+from src.core.responses import NotificationJSONResponse
+from src.schemas.enums import NotificationCategory, ProcessingStatus
+from src.schemas.notifications import NotificationDTO, NotificationResponse
+
+LIMIT = 100
+NUMBER = 2000
+
+response_adapter = TypeAdapter(List[NotificationResponse])
+
+
+def make_page() -> list[NotificationDTO]:
+    now = datetime.now(timezone.utc)
+    user_id = uuid.uuid4()
+    return [
+        NotificationDTO(
+            id=uuid.uuid4(),
+            user_id=user_id,
+            title=f"Disk usage on db-{n:02d}",
+            text="Attention: disk usage exceeded 85%, be careful.",
+            created_at=now - timedelta(seconds=n),
+            updated_at=now,
+            read_at=None,
+            category=NotificationCategory.WARNING,
+            confidence=0.83,
+            processing_status=ProcessingStatus.COMPLETED,
+            keywords=["disk", "usage"],
+        )
+        for n in range(LIMIT)
+    ]
+
+
+def validated_response(page: list[NotificationDTO]) -> bytes:
+    content = [NotificationResponse.model_validate(n) for n in page]
+    validated = response_adapter.validate_python(content, from_attributes=True)
+    return ORJSONResponse(
+        response_adapter.dump_python(validated, mode="json")
+    ).body
+
+
+def fast_response(page: list[NotificationDTO]) -> bytes:
+    return NotificationJSONResponse(page).body
+
+
+def measure(name: str, build, page: list[NotificationDTO]) -> dict:
+    body = build(page)
+    start = time.process_time()
+    for _ in range(NUMBER):
+        build(page)
+    cpu = time.process_time() - start
+    return {
+        "name": name,
+        "size_bytes": len(body),
+        "request_us": cpu / NUMBER * 1e6,
+    }
+
+
+def run() -> list[dict]:
+    page = make_page()
+    assert validated_response(page) == fast_response(page)
+    return [
+        measure("pydantic", validated_response, page),
+        measure("orjson_dto", fast_response, page),
+    ]
+
+
+def main() -> None:
+    print(f"{'path':<12}{'size, B':>10}{'request, us':>14}")
+    for row in run():
+        print(
+            f"{row['name']:<12}{row['size_bytes']:>10}"
+            f"{row['request_us']:>14.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+"""
+Сравнение CPU стоимости строки для страницы из 100 уведомлений:
+ORM (select(Notification), identity map) против Core запроса с
+отображением строк в NotificationDTO. Оба пути включают
+NotificationResponse.model_validate и проверку response_model.
+
+Требует PostgreSQL из настроек POSTGRES_*; создает 100 уведомлений
+случайного пользователя и удаляет их после замера.
+
+Запуск: python -m benchmarks.bench_read_path
+"""
+
+import asyncio
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import List
+
+from pydantic import TypeAdapter
+from sqlalchemy import delete, insert, select
+
+from src.core.db import AsyncSessionLocal, engine
+from src.models.notification import Notification
+from src.repositories.notification_repo import NotificationRepository
+from src.schemas.enums import ProcessingStatus
+from src.schemas.filters import NotificationFilter
+from src.schemas.notifications import NotificationResponse
+
+PAGE_SIZE = 100
+NUMBER = 200
+
+response_adapter = TypeAdapter(List[NotificationResponse])
+
+
+async def orm_page(session, filters: NotificationFilter) -> list:
+    result = await session.execute(
+        select(Notification)
+        .where(Notification.user_id == filters.user_id)
+        .order_by(Notification.created_at.desc(), Notification.id.desc())
+        .limit(filters.limit)
+    )
+    return result.scalars().all()
+
+
+async def core_page(session, filters: NotificationFilter) -> list:
+    return await NotificationRepository(session).list(filters)
+
+
+async def measure(name: str, load, filters: NotificationFilter) -> dict:
+    cpu = 0.0
+    for _ in range(NUMBER):
+        async with AsyncSessionLocal() as session:
+            start = time.process_time()
+            rows = await load(session, filters)
+            responses = [NotificationResponse.model_validate(n) for n in rows]
+            response_adapter.validate_python(
+                [r.model_dump() for r in responses]
+            )
+            cpu += time.process_time() - start
+    assert len(rows) == PAGE_SIZE
+    return {
+        "name": name,
+        "page_ms": cpu / NUMBER * 1e3,
+        "row_us": cpu / NUMBER / PAGE_SIZE * 1e6,
+    }
+
+
+async def run() -> list[dict]:
+    user_id = uuid.uuid4()
+    now = datetime.now(timezone.utc)
+    async with AsyncSessionLocal() as session:
+        await session.execute(
+            insert(Notification),
+            [
+                {
+                    "user_id": user_id,
+                    "title": f"Disk usage on db-{n:02d}",
+                    "text": "Attention: disk usage exceeded 85%.",
+                    "created_at": now - timedelta(seconds=n),
+                    "processing_status": ProcessingStatus.COMPLETED,
+                    "keywords": ["disk", "usage"],
+                }
+                for n in range(PAGE_SIZE)
+            ],
+        )
+        await session.commit()
+    filters = NotificationFilter(user_id=user_id, limit=PAGE_SIZE)
+    try:
+        return [
+            await measure("orm", orm_page, filters),
+            await measure("core_dto", core_page, filters),
+        ]
+    finally:
+        async with AsyncSessionLocal() as session:
+            await session.execute(
+                delete(Notification).where(Notification.user_id == user_id)
+            )
+            await session.commit()
+        await engine.dispose()
+
+
+def main() -> None:
+    print(f"{'path':<10}{'page, ms':>12}{'row, us':>12}")
+    for row in asyncio.run(run()):
+        print(
+            f"{row['name']:<10}{row['page_ms']:>12.2f}{row['row_us']:>12.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,320 @@
+"""
+Набор микро-бенчмарков горячих путей: репозиторий, кэш, сериализация,
+AI классификация и задача analyze_notification.
+
+Работает без внешних сервисов: Redis заменяется fakeredis (группа
+зависимостей bench), брокер Celery - in-memory транспортом. Бенчмарки
+с БД выполняются на локальном PostgreSQL из --postgres-uri (asyncpg DSN с
+примененными миграциями) и пропускаются, если он не задан или недоступен.
+Результаты пишутся в JSON для сравнения между коммитами.
+
+Запуск: python -m benchmarks.suite --output bench.json
+        python -m benchmarks.suite --postgres-uri postgresql+asyncpg://...
+        python -m benchmarks.suite --compare bench.json
+"""
+
+import argparse
+import asyncio
+import platform
+import subprocess
+import time
+import uuid
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Awaitable, Callable
+from unittest.mock import patch
+
+import fakeredis
+import orjson
+from sqlalchemy import create_engine, delete, insert, make_url
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import Session, sessionmaker
+
+from benchmarks import bench_cache_serialization, bench_list_response
+from src.celery_app import app_celery
+from src.core.cache import CacheManager
+from src.models.notification import Notification
+from src.repositories.notification_repo import NotificationRepository
+from src.schemas.enums import ProcessingStatus
+from src.schemas.filters import NotificationFilter
+from src.services.mock_ai_service import AIService
+from src.tasks import task_analyze
+
+PAGE_SIZE = 100
+TEXT = "Attention: disk usage on db-01 exceeded 85%, be careful."
+
+
+def result(name: str, seconds: float, number: int, **extra) -> dict:
+    return {
+        "name": name,
+        "unit": "us",
+        "value": seconds / number * 1e6,
+        "number": number,
+        **extra,
+    }
+
+
+def measure(name: str, fn: Callable[[], object], number: int) -> dict:
+    fn()
+    start = time.perf_counter()
+    for _ in range(number):
+        fn()
+    return result(name, time.perf_counter() - start, number)
+
+
+async def ameasure(
+    name: str, fn: Callable[[], Awaitable[object]], number: int
+) -> dict:
+    await fn()
+    start = time.perf_counter()
+    for _ in range(number):
+        await fn()
+    return result(name, time.perf_counter() - start, number)
+
+
+def serialization_benchmarks() -> list[dict]:
+    results = []
+    for row in bench_cache_serialization.run():
+        for op in ("encode", "decode"):
+            results.append(
+                {
+                    "name": f"serialization.cache.{row['name']}.{op}",
+                    "unit": "us",
+                    "value": row[f"{op}_us"],
+                    "number": bench_cache_serialization.NUMBER,
+                }
+            )
+    for row in bench_list_response.run():
+        results.append(
+            {
+                "name": f"serialization.list_response.{row['name']}",
+                "unit": "us",
+                "value": row["request_us"],
+                "number": bench_list_response.NUMBER,
+            }
+        )
+    return results
+
+
+class NoDatabaseSession:
+    """Сессия-заглушка: при попадании в кэш репозиторий не идет в БД."""
+
+    async def execute(self, *_):
+        raise RuntimeError("database is not available in this benchmark")
+
+
+async def cache_benchmarks(redis, number: int) -> list[dict]:
+    manager = CacheManager(redis)
+    note = bench_cache_serialization.make_notification()
+    note.keywords = ["disk", "usage"]
+    note.version = 1
+    key = f"notification:{note.id}"
+    repo = NotificationRepository(NoDatabaseSession(), manager)
+
+    async def redis_get():
+        manager.local.delete(key)
+        return await manager.get(key)
+
+    return [
+        await ameasure(
+            "cache.set",
+            lambda: manager.set(key, note, NotificationRepository.CACHE_TTL),
+            number,
+        ),
+        await ameasure(
+            "cache.get.local_hit", lambda: manager.get(key), number
+        ),
+        await ameasure("cache.get.redis_hit", redis_get, number),
+        await ameasure(
+            "repository.get_by_id.cache_hit",
+            lambda: repo.get_by_id(note.id),
+            number,
+        ),
+    ]
+
+
+def ai_benchmarks(number: int) -> list[dict]:
+    service = AIService()
+    with patch("src.services.mock_ai_service.sleep"):
+        return [
+            measure(
+                "ai.analyze_text", lambda: service.analyze_text(TEXT), number
+            )
+        ]
+
+
+def enqueue_benchmarks(number: int) -> list[dict]:
+    app_celery.conf.broker_url = "memory://"
+    notification_id = uuid.uuid4()
+    return [
+        measure(
+            "task.analyze_notification.enqueue",
+            lambda: task_analyze.analyze_notification.delay(notification_id),
+            number,
+        )
+    ]
+
+
+def _notification_values(user_id: uuid.UUID, count: int) -> list[dict]:
+    return [
+        {
+            "user_id": user_id,
+            "title": f"Disk usage on db-{n:02d}",
+            "text": TEXT,
+            "processing_status": ProcessingStatus.PENDING,
+        }
+        for n in range(count)
+    ]
+
+
+async def database_benchmarks(
+    postgres_uri: str, sync_redis, number: int
+) -> list[dict]:
+    engine = create_async_engine(postgres_uri)
+    sync_engine = create_engine(
+        make_url(postgres_uri).set(drivername="postgresql+psycopg2")
+    )
+    async_session = sessionmaker(
+        bind=engine, class_=AsyncSession, expire_on_commit=False
+    )
+    user_id = uuid.uuid4()
+
+    @contextmanager
+    def sync_session():
+        with Session(sync_engine, expire_on_commit=False) as session:
+            yield session
+            session.commit()
+
+    try:
+        async with async_session() as session:
+            result_ids = await session.scalars(
+                insert(Notification).returning(Notification.id),
+                _notification_values(user_id, PAGE_SIZE + number + 1),
+            )
+            ids = list(result_ids)
+            await session.commit()
+
+        filters = NotificationFilter(user_id=user_id, limit=PAGE_SIZE)
+        async with async_session() as session:
+            repo = NotificationRepository(session)
+            results = [
+                await ameasure(
+                    "repository.get_by_id.db",
+                    lambda: repo.get_by_id(ids[0]),
+                    number,
+                ),
+                await ameasure(
+                    f"repository.list.{PAGE_SIZE}",
+                    lambda: repo.list(filters),
+                    number,
+                ),
+            ]
+
+        pending = iter(ids[PAGE_SIZE:])
+        with (
+            patch.object(task_analyze, "get_sync_db_session", sync_session),
+            patch.object(
+                task_analyze, "get_sync_redis", return_value=sync_redis
+            ),
+            patch("src.services.mock_ai_service.sleep"),
+        ):
+            results.append(
+                measure(
+                    "task.analyze_notification.run",
+                    lambda: task_analyze.analyze_notification.run(
+                        next(pending)
+                    ),
+                    number,
+                )
+            )
+        return results
+    finally:
+        async with async_session() as session:
+            await session.execute(
+                delete(Notification).where(Notification.user_id == user_id)
+            )
+            await session.commit()
+        await engine.dispose()
+        sync_engine.dispose()
+
+
+async def run(postgres_uri: str | None, number: int) -> list[dict]:
+    redis = fakeredis.aioredis.FakeRedis()
+    sync_redis = fakeredis.FakeRedis()
+    results = serialization_benchmarks()
+    results += await cache_benchmarks(redis, number)
+    results += ai_benchmarks(number)
+    results += enqueue_benchmarks(number)
+    if postgres_uri:
+        try:
+            results += await database_benchmarks(
+                postgres_uri, sync_redis, number
+            )
+        except (OSError, SQLAlchemyError) as exc:
+            print(f"Database benchmarks skipped: {exc}")
+    else:
+        print("Database benchmarks skipped: --postgres-uri is not set")
+    return results
+
+
+def _git_commit() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(results: list[dict], baseline_path: Path) -> None:
+    baseline = {
+        row["name"]: row["value"]
+        for row in orjson.loads(baseline_path.read_bytes())["results"]
+    }
+    print(f"{'benchmark':<48}{'base, us':>12}{'now, us':>12}{'delta':>9}")
+    for row in results:
+        base = baseline.get(row["name"])
+        delta = f"{(row['value'] / base - 1) * 100:+.1f}%" if base else "-"
+        base_text = f"{base:.2f}" if base else "-"
+        print(
+            f"{row['name']:<48}{base_text:>12}{row['value']:>12.2f}{delta:>9}"
+        )
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--output", type=Path, default=Path("bench.json"))
+    parser.add_argument("--postgres-uri")
+    parser.add_argument("--number", type=int, default=1000)
+    parser.add_argument(
+        "--compare", type=Path, help="JSON предыдущего прогона"
+    )
+    args = parser.parse_args(argv)
+
+    results = asyncio.run(run(args.postgres_uri, args.number))
+    if args.compare:
+        compare(results, args.compare)
+    else:
+        for row in results:
+            print(f"{row['name']:<48}{row['value']:>12.2f} {row['unit']}")
+    args.output.write_bytes(
+        orjson.dumps(
+            {
+                "commit": _git_commit(),
+                "created_at": datetime.now(timezone.utc),
+                "python": platform.python_version(),
+                "results": results,
+            },
+            option=orjson.OPT_INDENT_2,
+        )
+    )
+    print(f"Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
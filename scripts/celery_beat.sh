@@ -0,0 +1,5 @@
+#!/bin/sh
+
+uv run celery -A src.celery_app beat \
+  --loglevel=${CELERY_LOGLEVEL:-info} \
+  --schedule=/tmp/celerybeat-schedule
@@ -1,5 +1,13 @@
 #!/bin/sh
 
+# Файлы метрик процессов prefork пула от предыдущего запуска.
+if [ -n "$PROMETHEUS_MULTIPROC_DIR" ]; then
+  rm -rf "$PROMETHEUS_MULTIPROC_DIR"
+  mkdir -p "$PROMETHEUS_MULTIPROC_DIR"
+fi
+
 uv run celery -A src.celery_app worker \
   --loglevel=${CELERY_LOGLEVEL:-info} \
   --hostname=note_worker_%h \
+  --pool=${CELERY_POOL:-prefork} \
+  ${CELERY_CONCURRENCY:+--concurrency=$CELERY_CONCURRENCY}
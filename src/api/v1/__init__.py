@@ -1,6 +1,10 @@
 from fastapi.routing import APIRouter
 
 from src.api.v1.notifications import router as notification_router
+from src.api.v1.stats import router as stats_router
+from src.api.v1.users import router as users_router
 
 router = APIRouter()
 router.include_router(notification_router)
+router.include_router(users_router)
+router.include_router(stats_router)
@@ -2,11 +2,32 @@ import logging
 import uuid
 from typing import List
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import StreamingResponse
 
 from src.core.dependencies import get_notific_service
-from src.schemas.filters import NotificationFilter
-from src.schemas.notifications import NotificationCreate, NotificationResponse
+from src.core.events import (
+    EventBroadcaster,
+    format_sse,
+    get_event_broadcaster,
+)
+from src.core.export import MEDIA_TYPES
+from src.core.pagination import encode_cursor, encode_rank_cursor
+from src.core.responses import NotificationJSONResponse
+from src.schemas.filters import (
+    NotificationExport,
+    NotificationFilter,
+    NotificationSearch,
+)
+from src.schemas.notifications import (
+    EVENTS_MAX_SUBSCRIPTIONS,
+    NotificationBatchCreate,
+    NotificationBulkRead,
+    NotificationBulkReadResponse,
+    NotificationCreate,
+    NotificationResponse,
+    NotificationSearchResult,
+)
 from src.services.notifications_service import NotificationService
 
 logger = logging.getLogger(__name__)
@@ -38,11 +59,35 @@ async def create_notification(
     return NotificationResponse.model_validate(notification)
 
 
+@router.post(
+    "/batch",
+    response_model=List[NotificationResponse],
+    status_code=status.HTTP_201_CREATED,
+    summary="Пакетное создание уведомлений",
+    description="""
+    Создает пачку уведомлений одним запросом к БД и инициирует их анализ
+    через AI. Результаты возвращаются в порядке входного списка.
+    """,
+)
+async def create_notifications_batch(
+    payload: NotificationBatchCreate,
+    service: NotificationService = Depends(get_notific_service),
+):
+    logger.info("Request for batch create, size=%d", len(payload))
+    notifications = await service.create_notifications(payload)
+    logger.info("Success created %d notifications", len(notifications))
+    return [NotificationResponse.model_validate(n) for n in notifications]
+
+
 @router.get(
     "/",
     response_model=List[NotificationResponse],
     summary="Получить список уведомлений",
-    description="Возвращает список уведомлений с фильтрацией и пагинацией.",
+    description="""
+    Возвращает список уведомлений с фильтрацией и пагинацией, от новых к
+    старым. Если страница заполнена, курсор следующей страницы передается
+    в заголовке X-Next-Cursor.
+    """,
 )
 async def list_notifications(
     filters: NotificationFilter = Depends(),
@@ -50,8 +95,111 @@ async def list_notifications(
 ):
     logger.info("Request for list notifications")
     notifications = await service.list_notifications(filters)
+    headers = {}
+    if len(notifications) == filters.limit:
+        last = notifications[-1]
+        headers["X-Next-Cursor"] = encode_cursor(last.created_at, last.id)
     logger.info("Success sending notifications with filters")
-    return [NotificationResponse.model_validate(n) for n in notifications]
+    return NotificationJSONResponse(notifications, headers=headers)
+
+
+@router.get(
+    "/search",
+    response_model=List[NotificationSearchResult],
+    summary="Полнотекстовый поиск уведомлений",
+    description="""
+    Ищет уведомления по заголовку и тексту, результаты упорядочены по
+    релевантности. Если страница заполнена, курсор следующей страницы
+    передается в заголовке X-Next-Cursor.
+    """,
+)
+async def search_notifications(
+    filters: NotificationSearch = Depends(),
+    service: NotificationService = Depends(get_notific_service),
+):
+    logger.info("Request for search notifications")
+    rows = await service.search_notifications(filters)
+    headers = {}
+    if len(rows) == filters.limit:
+        last = rows[-1]
+        headers["X-Next-Cursor"] = encode_rank_cursor(last.rank, last.id)
+    results = [
+        NotificationSearchResult.model_validate(row._mapping) for row in rows
+    ]
+    logger.info("Success sending %d found notifications", len(rows))
+    return NotificationJSONResponse(results, headers=headers)
+
+
+@router.get(
+    "/export",
+    summary="Потоковая выгрузка уведомлений",
+    description="""
+    Выгружает все уведомления по фильтрам в NDJSON или CSV, от старых к
+    новым. Ответ передается потоком через серверный курсор БД, поэтому
+    память не растет с размером выгрузки.
+    """,
+    response_class=StreamingResponse,
+)
+async def export_notifications(
+    filters: NotificationExport = Depends(),
+    service: NotificationService = Depends(get_notific_service),
+):
+    logger.info("Request for export notifications, format=%s", filters.format)
+    extension = filters.format.value
+    return StreamingResponse(
+        service.export_notifications(filters),
+        media_type=MEDIA_TYPES[filters.format],
+        headers={
+            "Content-Disposition": (
+                f'attachment; filename="notifications.{extension}"'
+            )
+        },
+    )
+
+
+@router.get(
+    "/events",
+    summary="Поток событий смены статуса уведомлений",
+    description="""
+    Server-Sent Events поток смены статуса обработки всех уведомлений
+    пользователей user_id и отдельных уведомлений notification_id.
+    Параметры можно повторять, все подписки обслуживаются одним
+    соединением. Сначала передается текущий статус отдельных уведомлений;
+    поток только по ним закрывается, когда все они обработаны.
+    """,
+    response_class=StreamingResponse,
+)
+async def stream_status_events(
+    user_id: List[uuid.UUID] = Query(
+        default=[], max_length=EVENTS_MAX_SUBSCRIPTIONS
+    ),
+    notification_id: List[uuid.UUID] = Query(
+        default=[], max_length=EVENTS_MAX_SUBSCRIPTIONS
+    ),
+    service: NotificationService = Depends(get_notific_service),
+    broadcaster: EventBroadcaster = Depends(get_event_broadcaster),
+):
+    logger.info("Request for status events stream")
+    if not user_id and not notification_id:
+        raise HTTPException(
+            status_code=400,
+            detail="user_id or notification_id is required",
+        )
+    notifications = []
+    for nid in dict.fromkeys(notification_id):
+        notification = await service.get_notification(nid)
+        if not notification:
+            logger.info("Notification with id: %s not found", nid)
+            raise HTTPException(
+                status_code=404, detail="Notification not found"
+            )
+        notifications.append(notification)
+    events = service.stream_status_events(broadcaster, user_id, notifications)
+    return StreamingResponse(
+        (format_sse(event) async for event in events),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
 
 
 @router.get(
@@ -70,7 +218,27 @@ async def get_notification(
         logger.info("Notification with id: %s not found", notification_id)
         raise HTTPException(status_code=404, detail="Notification not found")
     logger.info("Success sending info for notification: %s", notification_id)
-    return NotificationResponse.model_validate(notification)
+    return NotificationJSONResponse(notification)
+
+
+@router.patch(
+    "/read",
+    response_model=NotificationBulkReadResponse,
+    summary="Отметить уведомления как прочитанные",
+    description="""
+    Отмечает прочитанными уведомления из списка ids или все непрочитанные
+    уведомления пользователя user_id, с необязательными фильтрами по
+    категории и времени создания. Возвращает количество отмеченных.
+    """,
+)
+async def mark_notifications_as_read(
+    payload: NotificationBulkRead,
+    service: NotificationService = Depends(get_notific_service),
+):
+    logger.info("Request for bulk read notifications")
+    updated = await service.mark_many_as_read(payload)
+    logger.info("Success marked %d notifications as read", updated)
+    return NotificationBulkReadResponse(updated=updated)
 
 
 @router.patch(
@@ -0,0 +1,52 @@
+import logging
+
+from fastapi import APIRouter, Depends
+from redis.asyncio import Redis
+
+from src.core.analysis_cache import (
+    ANALYSIS_INDEX_KEY,
+    ANALYSIS_STATS_KEY,
+    AnalysisCache,
+)
+from src.core.cache import cache_stats, local_cache
+from src.core.redis_client import get_redis
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(
+    prefix="/stats",
+    tags=["Stats"],
+)
+
+
+@router.get(
+    "/cache",
+    summary="Статистика кэша",
+    description="""
+    Возвращает счетчики попаданий и промахов локального кэша и Redis
+    для текущего процесса, а также размер локального кэша.
+    """,
+    response_model=dict,
+)
+async def get_cache_stats():
+    stats = cache_stats.as_dict()
+    stats["local"]["size"] = len(local_cache)
+    return stats
+
+
+@router.get(
+    "/analysis-cache",
+    summary="Статистика кэша AI анализа",
+    description="""
+    Возвращает попадания и промахи кэша результатов AI анализа по всем
+    воркерам, долю попаданий, число сэкономленных вызовов AI сервиса и
+    текущий размер кэша.
+    """,
+    response_model=dict,
+)
+async def get_analysis_cache_stats(redis: Redis = Depends(get_redis)):
+    async with redis.pipeline(transaction=False) as pipe:
+        pipe.hgetall(ANALYSIS_STATS_KEY)
+        pipe.zcard(ANALYSIS_INDEX_KEY)
+        fields, size = await pipe.execute()
+    return AnalysisCache.stats_from_fields(fields, size)
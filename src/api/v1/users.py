@@ -0,0 +1,33 @@
+import logging
+import uuid
+
+from fastapi import APIRouter, Depends
+
+from src.core.dependencies import get_notific_service
+from src.schemas.counters import UserCountersResponse
+from src.services.notifications_service import NotificationService
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(
+    prefix="/users",
+    tags=["Users"],
+)
+
+
+@router.get(
+    "/{user_id}/counters",
+    response_model=UserCountersResponse,
+    summary="Счетчики уведомлений пользователя",
+    description="""
+    Возвращает общее количество и количество непрочитанных уведомлений
+    пользователя, непрочитанные по категориям и количество по статусу
+    обработки.
+    """,
+)
+async def get_user_counters(
+    user_id: uuid.UUID,
+    service: NotificationService = Depends(get_notific_service),
+):
+    logger.info("Request counters for user: %s", user_id)
+    return await service.get_user_counters(user_id)
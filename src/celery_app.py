@@ -1,6 +1,7 @@
 from celery import Celery
 
 from src.core.config import settings
+from src.core.metrics import instrument_celery
 
 app_celery = Celery(
     "tasks",
@@ -12,4 +13,26 @@ app_celery = Celery(
     task_track_started=True,
     task_acks_late=True,
     broker_connection_retry_on_startup=True,
+    beat_schedule={
+        "reconcile-user-counters": {
+            "task": "src.tasks.task_counters.reconcile_user_counters",
+            "schedule": settings.counters.reconcile_interval,
+        },
+        "maintain-notification-partitions": {
+            "task": (
+                "src.tasks.task_partitions.maintain_notification_partitions"
+            ),
+            "schedule": settings.partitions.maintenance_interval,
+        },
+        "requeue-stale-notifications": {
+            "task": "src.tasks.task_analyze.requeue_stale_notifications",
+            "schedule": settings.analysis.requeue_interval,
+        },
+        "archive-notifications": {
+            "task": "src.tasks.task_archive.archive_notifications",
+            "schedule": settings.archive.interval,
+        },
+    },
 )
+
+instrument_celery(settings.metrics.worker_port)
@@ -0,0 +1,162 @@
+import hashlib
+import logging
+import re
+import time
+from typing import Any
+
+import orjson
+from redis import Redis as SyncRedis
+
+from src.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+ANALYSIS_KEY_PREFIX = "analysis:"
+ANALYSIS_INDEX_KEY = "analysis:index"
+ANALYSIS_STATS_KEY = "analysis:stats"
+
+# Число команд удаления вытесненных записей в одном пайплайне.
+EVICT_BATCH_SIZE = 500
+
+# Удаляет из индекса истекшие записи и самые давние записи сверх max_size
+# и возвращает ключи вытесненных записей. Сами ключи удаляет вызывающий
+# код: скрипт меняет только ключи из KEYS, как требует Redis Cluster,
+# а их число не ограничено пределом unpack в Lua.
+TRIM_SCRIPT = """
+redis.call('ZREMRANGEBYSCORE', KEYS[1], '-inf', ARGV[2])
+local excess = redis.call('ZCARD', KEYS[1]) - tonumber(ARGV[1])
+if excess <= 0 then
+    return {}
+end
+local keys = redis.call('ZRANGE', KEYS[1], 0, excess - 1)
+redis.call('ZREMRANGEBYRANK', KEYS[1], 0, excess - 1)
+return keys
+"""
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+class AnalysisCache:
+    """
+    Кэш результатов AI анализа в Redis по хэшу нормализованного текста.
+    Хранит category, confidence и keywords с TTL. Размер ограничен
+    max_size записями: индекс (ZSET по времени последнего обращения)
+    вытесняет давно не использованные записи. Попадания и промахи
+    считаются в общем для всех воркеров хэше analysis:stats.
+    """
+
+    def __init__(
+        self,
+        redis: SyncRedis,
+        ttl: int | None = None,
+        max_size: int | None = None,
+    ):
+        self.redis = redis
+        self.ttl = ttl or settings.analysis.cache_ttl
+        self.max_size = max_size or settings.analysis.cache_max_size
+        self._trim = redis.register_script(TRIM_SCRIPT)
+
+    @staticmethod
+    def normalize(text: str) -> str:
+        """Приводит текст к нижнему регистру и схлопывает пробелы."""
+        return _WHITESPACE.sub(" ", text).strip().casefold()
+
+    @classmethod
+    def key(cls, text: str) -> str:
+        digest = hashlib.sha256(cls.normalize(text).encode()).hexdigest()
+        return f"{ANALYSIS_KEY_PREFIX}{digest}"
+
+    def get_many(self, keys: list[str]) -> list[dict | None]:
+        """
+        Возвращает результаты анализа по ключам, None для промахов.
+        Найденные записи продлеваются в индексе вытеснения.
+        """
+        if not keys:
+            return []
+        try:
+            values = self.redis.mget(keys)
+            hits = [
+                key for key, value in zip(keys, values, strict=True) if value
+            ]
+            with self.redis.pipeline(transaction=False) as pipe:
+                if hits:
+                    now = time.time()
+                    pipe.zadd(
+                        ANALYSIS_INDEX_KEY,
+                        dict.fromkeys(hits, now),
+                        xx=True,
+                    )
+                    pipe.hincrby(ANALYSIS_STATS_KEY, "hits", len(hits))
+                if len(hits) < len(keys):
+                    pipe.hincrby(
+                        ANALYSIS_STATS_KEY, "misses", len(keys) - len(hits)
+                    )
+                pipe.execute()
+        except Exception as ex:
+            logger.error("Error retrieving analysis cache: %s", ex)
+            return [None] * len(keys)
+        return [orjson.loads(value) if value else None for value in values]
+
+    def set_many(self, analyses: dict[str, dict]) -> None:
+        """
+        Сохраняет результаты анализа по ключам и вытесняет записи
+        сверх max_size.
+        """
+        if not analyses:
+            return
+        now = time.time()
+        try:
+            with self.redis.pipeline(transaction=False) as pipe:
+                for key, analysis in analyses.items():
+                    value = {
+                        "category": analysis["category"],
+                        "confidence": analysis["confidence"],
+                        "keywords": analysis.get("keywords", []),
+                    }
+                    pipe.set(key, orjson.dumps(value), ex=self.ttl)
+                pipe.zadd(ANALYSIS_INDEX_KEY, dict.fromkeys(analyses, now))
+                pipe.hincrby(ANALYSIS_STATS_KEY, "stored", len(analyses))
+                self._trim(
+                    keys=[ANALYSIS_INDEX_KEY],
+                    args=[self.max_size, now - self.ttl],
+                    client=pipe,
+                )
+                evicted = pipe.execute()[-1]
+            self._evict(evicted)
+        except Exception as ex:
+            logger.error("Error storing analysis cache: %s", ex)
+
+    def _evict(self, keys: list[bytes]) -> None:
+        """
+        Удаляет ключи вытесненных записей пайплайнами по EVICT_BATCH_SIZE
+        команд, по одному ключу на команду.
+        """
+        for start in range(0, len(keys), EVICT_BATCH_SIZE):
+            with self.redis.pipeline(transaction=False) as pipe:
+                for key in keys[start : start + EVICT_BATCH_SIZE]:
+                    pipe.unlink(key)
+                pipe.execute()
+
+    def get(self, text: str) -> dict | None:
+        return self.get_many([self.key(text)])[0]
+
+    def set(self, text: str, analysis: dict) -> None:
+        self.set_many({self.key(text): analysis})
+
+    @staticmethod
+    def stats_from_fields(fields: dict, size: int) -> dict[str, Any]:
+        """
+        Собирает статистику кэша анализа: попадания и промахи, доля
+        попаданий и число сэкономленных вызовов AI сервиса.
+        """
+        hits = int(fields.get(b"hits", 0))
+        misses = int(fields.get(b"misses", 0))
+        total = hits + misses
+        return {
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": hits / total if total else 0.0,
+            "analyzer_calls_saved": hits,
+            "stored": int(fields.get(b"stored", 0)),
+            "size": size,
+        }
@@ -0,0 +1,110 @@
+import gzip
+import os
+import uuid
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Sequence
+
+import orjson
+from sqlalchemy import Row
+
+CHECKPOINT_FILE = "checkpoint.json"
+
+
+class ArchiveVerificationError(Exception):
+    """Записанный файл архива не совпадает с исходной пачкой"""
+
+
+def write_chunk(path: Path, rows: Sequence[Row]) -> None:
+    """
+    Записывает пачку строк в NDJSON.gz и проверяет запись.
+    Файл пишется во временный путь, сбрасывается на диск, перечитывается
+    и сверяется по id строк, после чего атомарно переименовывается.
+    """
+    tmp_path = path.with_name(path.name + ".tmp")
+    with open(tmp_path, "wb") as raw:
+        with gzip.GzipFile(fileobj=raw, mode="wb") as archive:
+            for row in rows:
+                archive.write(orjson.dumps(dict(row._mapping)))
+                archive.write(b"\n")
+        raw.flush()
+        os.fsync(raw.fileno())
+
+    expected = [str(row.id) for row in rows]
+    with gzip.open(tmp_path, "rb") as archive:
+        written = [orjson.loads(line)["id"] for line in archive]
+    if written != expected:
+        tmp_path.unlink(missing_ok=True)
+        raise ArchiveVerificationError(str(path))
+    os.replace(tmp_path, path)
+
+
+@dataclass
+class ArchiveCheckpoint:
+    """
+    Состояние прогона архивации: граница read_at, позиция последней
+    заархивированной строки (created_at, id) и номер следующей пачки.
+    Сохраняется после каждой пачки, чтобы прерванный прогон продолжился
+    с того же места и с той же границей.
+    """
+
+    read_before: datetime
+    created_at: datetime | None = None
+    id: uuid.UUID | None = None
+    chunk: int = 0
+    archived: int = 0
+
+    @property
+    def position(self) -> tuple[datetime, uuid.UUID] | None:
+        if self.created_at is None or self.id is None:
+            return None
+        return self.created_at, self.id
+
+    def chunk_path(self, directory: Path, first_row: Row) -> Path:
+        """
+        Путь файла пачки по ее первой строке (created_at, id).
+        Если пачка удалена из БД, а checkpoint не успел сохраниться,
+        повторный прогон начинает со следующих строк и пишет их в другой
+        файл, не перезаписывая уже заархивированную пачку.
+        """
+        created_at = first_row.created_at.astimezone(timezone.utc)
+        return directory / (
+            f"notifications_{self.read_before:%Y%m%dT%H%M%S}"
+            f"_{created_at:%Y%m%dT%H%M%S%f}_{first_row.id}.ndjson.gz"
+        )
+
+    def advance(self, last_row: Row, count: int) -> None:
+        self.created_at = last_row.created_at
+        self.id = last_row.id
+        self.chunk += 1
+        self.archived += count
+
+    @classmethod
+    def load(cls, directory: Path) -> "ArchiveCheckpoint | None":
+        path = directory / CHECKPOINT_FILE
+        if not path.exists():
+            return None
+        data = orjson.loads(path.read_bytes())
+        return cls(
+            read_before=datetime.fromisoformat(data["read_before"]),
+            created_at=(
+                datetime.fromisoformat(data["created_at"])
+                if data["created_at"]
+                else None
+            ),
+            id=uuid.UUID(data["id"]) if data["id"] else None,
+            chunk=data["chunk"],
+            archived=data["archived"],
+        )
+
+    def save(self, directory: Path) -> None:
+        """Атомарно сохраняет checkpoint."""
+        path = directory / CHECKPOINT_FILE
+        tmp_path = path.with_name(path.name + ".tmp")
+        tmp_path.write_bytes(orjson.dumps(asdict(self)))
+        os.replace(tmp_path, path)
+
+    @staticmethod
+    def clear(directory: Path) -> None:
+        (directory / CHECKPOINT_FILE).unlink(missing_ok=True)
@@ -1,39 +1,572 @@
+import asyncio
 import logging
-import pickle
-from typing import Any
+import time
+import uuid
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Protocol
 
+import orjson
+from redis import Redis as SyncRedis
 from redis.asyncio import Redis
 
 from src.core.config import settings
+from src.core.metrics import CACHE_REQUESTS
+from src.schemas.enums import NotificationCategory, ProcessingStatus
+from src.schemas.notifications import NotificationDTO
 
 logger = logging.getLogger(__name__)
 
 
+# Хэш без поля d - надгробие удаленного значения: он хранит версию v,
+# которая больше не актуальна, поэтому отклоняется и запись той же версии.
+VERSIONED_SET_SCRIPT = """
+if redis.call('TYPE', KEYS[1])['ok'] == 'hash' then
+    local current = redis.call('HGET', KEYS[1], 'v')
+    if current then
+        current = tonumber(current)
+        local version = tonumber(ARGV[2])
+        if current > version or (
+            current == version
+            and redis.call('HEXISTS', KEYS[1], 'd') == 0
+        ) then
+            return 0
+        end
+    end
+else
+    redis.call('DEL', KEYS[1])
+end
+redis.call('HSET', KEYS[1], 'v', ARGV[2], 'd', ARGV[1])
+redis.call('EXPIRE', KEYS[1], ARGV[3])
+return 1
+"""
+
+# Заменяет значения надгробиями с их версией на ARGV[1] секунд.
+TOMBSTONE_SCRIPT = """
+for _, key in ipairs(KEYS) do
+    local current = false
+    if redis.call('TYPE', key)['ok'] == 'hash' then
+        current = redis.call('HGET', key, 'v')
+    end
+    redis.call('DEL', key)
+    if current then
+        redis.call('HSET', key, 'v', current)
+        redis.call('EXPIRE', key, ARGV[1])
+    end
+end
+return #KEYS
+"""
+
+
+def _orjson_default(value: Any) -> Any:
+    # asyncpg возвращает собственный подкласс UUID, который orjson
+    # не сериализует нативно.
+    if isinstance(value, uuid.UUID):
+        return str(value)
+    raise TypeError
+
+
+class CacheSerializer(Protocol):
+    def dumps(self, value: Any) -> bytes: ...
+
+    def loads(self, payload: bytes) -> Any | None: ...
+
+    def version(self, value: Any) -> int: ...
+
+
+class NotificationSerializer:
+    """
+    Компактная сериализация уведомлений для кэша.
+    Поля NotificationResponse и версия строки хранятся orjson-массивом,
+    первым элементом которого идет версия формата. Значения другой версии
+    считаются промахом кэша, поэтому формат можно менять без сброса Redis.
+    """
+
+    VERSION = 3
+
+    def dumps(self, value: Any) -> bytes:
+        return orjson.dumps(
+            [
+                self.VERSION,
+                value.version,
+                value.id,
+                value.user_id,
+                value.title,
+                value.text,
+                value.created_at,
+                value.updated_at,
+                value.read_at,
+                value.category,
+                value.confidence,
+                value.processing_status,
+                value.keywords,
+            ],
+            default=_orjson_default,
+        )
+
+    def loads(self, payload: bytes) -> NotificationDTO | None:
+        data = orjson.loads(payload)
+        if not isinstance(data, list) or data[0] != self.VERSION:
+            return None
+        (
+            _,
+            version,
+            notific_id,
+            user_id,
+            title,
+            text,
+            created_at,
+            updated_at,
+            read_at,
+            category,
+            confidence,
+            processing_status,
+            keywords,
+        ) = data
+        return NotificationDTO(
+            id=uuid.UUID(notific_id),
+            user_id=uuid.UUID(user_id),
+            title=title,
+            text=text,
+            created_at=datetime.fromisoformat(created_at),
+            updated_at=datetime.fromisoformat(updated_at),
+            read_at=datetime.fromisoformat(read_at) if read_at else None,
+            category=NotificationCategory(category) if category else None,
+            confidence=confidence,
+            processing_status=ProcessingStatus(processing_status),
+            keywords=keywords,
+            version=version,
+        )
+
+    def version(self, value: Any) -> int:
+        return value.version
+
+
+class LocalCache:
+    """
+    Ограниченный по размеру in-process кэш с TTL и вытеснением LRU.
+    Используется как первый уровень перед Redis.
+    """
+
+    def __init__(self, max_size: int, ttl: float):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._data: OrderedDict[str, tuple[float, Any]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get(self, key: str) -> Any | None:
+        """Возвращает значение, если оно есть и не протухло."""
+        item = self._data.get(key)
+        if item is None:
+            return None
+        expires_at, value = item
+        if expires_at <= time.monotonic():
+            del self._data[key]
+            return None
+        self._data.move_to_end(key)
+        return value
+
+    def set(self, key: str, value: Any, ttl: float | None = None) -> None:
+        """Сохраняет значение, вытесняя самые давние при переполнении."""
+        if self.max_size <= 0:
+            return
+        ttl = self.ttl if ttl is None else min(ttl, self.ttl)
+        if ttl <= 0:
+            return
+        self._data[key] = (time.monotonic() + ttl, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.max_size:
+            self._data.popitem(last=False)
+
+    def delete(self, key: str) -> None:
+        self._data.pop(key, None)
+
+    def clear(self) -> None:
+        self._data.clear()
+
+
+class CacheStats:
+    """Счетчики попаданий и промахов по уровням кэша."""
+
+    def __init__(self) -> None:
+        self.local_hits = 0
+        self.local_misses = 0
+        self.redis_hits = 0
+        self.redis_misses = 0
+        self._counters = {
+            (tier, result): CACHE_REQUESTS.labels(tier, result)
+            for tier in ("local", "redis")
+            for result in ("hit", "miss")
+        }
+
+    def local_hit(self) -> None:
+        self.local_hits += 1
+        self._counters["local", "hit"].inc()
+
+    def local_miss(self) -> None:
+        self.local_misses += 1
+        self._counters["local", "miss"].inc()
+
+    def redis_hit(self) -> None:
+        self.redis_hits += 1
+        self._counters["redis", "hit"].inc()
+
+    def redis_miss(self) -> None:
+        self.redis_misses += 1
+        self._counters["redis", "miss"].inc()
+
+    def as_dict(self) -> dict[str, dict[str, int]]:
+        return {
+            "local": {"hits": self.local_hits, "misses": self.local_misses},
+            "redis": {"hits": self.redis_hits, "misses": self.redis_misses},
+        }
+
+
+class SingleFlight:
+    """
+    Объединяет конкурентные вызовы с одинаковым ключом в рамках процесса:
+    загрузку выполняет первый вызов, остальные ждут его результат.
+    """
+
+    _RETRY = object()
+
+    def __init__(self) -> None:
+        self._calls: dict[str, asyncio.Future] = {}
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[Any]]) -> Any:
+        future = self._calls.get(key)
+        if future is not None:
+            result = await asyncio.shield(future)
+            if result is not self._RETRY:
+                return result
+            return await self.do(key, fn)
+
+        future = asyncio.get_running_loop().create_future()
+        self._calls[key] = future
+        try:
+            result = await fn()
+        except asyncio.CancelledError:
+            # Отмена ведущего запроса не должна отменять ожидающих.
+            future.set_result(self._RETRY)
+            raise
+        except Exception as exc:
+            future.set_exception(exc)
+            future.exception()
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            del self._calls[key]
+
+
+local_cache = LocalCache(
+    max_size=settings.cache.local_max_size,
+    ttl=settings.cache.local_ttl,
+)
+cache_stats = CacheStats()
+single_flight = SingleFlight()
+
+
 class CacheManager:
-    def __init__(self):
-        self.redis = Redis.from_url(settings.redis.connection_url)
+    """
+    Двухуровневый кэш: локальный кэш процесса перед Redis.
+    Значения хранятся в Redis хэшем с полями v (версия строки) и d
+    (данные); запись более старой версии поверх новой игнорируется.
+    """
+
+    def __init__(
+        self,
+        redis: Redis,
+        serializer: CacheSerializer | None = None,
+    ):
+        self.redis = redis
+        self.serializer = serializer or NotificationSerializer()
+        self.local = local_cache
+        self.stats = cache_stats
+        self.single_flight = single_flight
+        self.versioned_set = redis.register_script(VERSIONED_SET_SCRIPT)
+        self.tombstone = redis.register_script(TOMBSTONE_SCRIPT)
 
-    async def get(self, key: str) -> str | None:
-        """Получение данных из кэша."""
+    async def get(self, key: str) -> Any | None:
+        """Получение данных из кэша: сначала локального, затем Redis."""
+        cached_val = self.local.get(key)
+        if cached_val is not None:
+            self.stats.local_hit()
+            return cached_val
+        self.stats.local_miss()
         try:
-            cached_val = await self.redis.get(key)
-            return pickle.loads(cached_val) if cached_val else None
+            payload = await self.redis.hget(key, "d")
+            cached_val = self.serializer.loads(payload) if payload else None
         except Exception as ex:
             logger.error("Error retrieving from cache: %s", ex)
             return None
+        if cached_val is None:
+            self.stats.redis_miss()
+            return None
+        self.stats.redis_hit()
+        self.local.set(key, cached_val)
+        return cached_val
+
+    async def get_or_load(
+        self,
+        key: str,
+        loader: Callable[[], Awaitable[Any]],
+        ttl: int = 300,
+    ) -> Any | None:
+        """
+        Получение данных из кэша с загрузкой при промахе.
+        Конкурентные промахи по одному ключу в процессе ждут одну загрузку.
+        Значение в Redis живет ttl + stale_ttl секунд: после ttl оно
+        считается устаревшим, и перезагружает его только реплика,
+        захватившая короткую блокировку, остальные отдают старое значение.
+        Если перезагрузка упала, тоже отдается старое значение.
+        """
+        cached_val = self.local.get(key)
+        if cached_val is not None:
+            self.stats.local_hit()
+            return cached_val
+        self.stats.local_miss()
+        return await self.single_flight.do(
+            key, lambda: self._get_or_load(key, loader, ttl)
+        )
 
-    async def set(self, key: str, value: Any, ttl: int = 300) -> None:
-        """Сохранение данных в кэш с TTL."""
+    async def _get_or_load(
+        self,
+        key: str,
+        loader: Callable[[], Awaitable[Any]],
+        ttl: int,
+    ) -> Any | None:
+        stale_ttl = settings.cache.stale_ttl
+        cached_val = None
         try:
-            await self.redis.set(key, pickle.dumps(value), ex=ttl)
-            logger.debug("Result stored in cache")
+            async with self.redis.pipeline(transaction=False) as pipe:
+                pipe.hget(key, "d")
+                pipe.pttl(key)
+                payload, pttl = await pipe.execute()
+            cached_val = self.serializer.loads(payload) if payload else None
+        except Exception as ex:
+            logger.error("Error retrieving from cache: %s", ex)
+            pttl = -2
+
+        if cached_val is not None:
+            self.stats.redis_hit()
+            if pttl == -1 or pttl > stale_ttl * 1000:
+                self.local.set(key, cached_val)
+                return cached_val
+            if not await self._try_lock(key):
+                logger.debug("Serving stale cache value for %s", key)
+                return cached_val
+        else:
+            self.stats.redis_miss()
+
+        try:
+            value = await loader()
+        except Exception as ex:
+            if cached_val is None:
+                raise
+            logger.error(
+                "Error reloading %s, serving stale value: %s", key, ex
+            )
+            return cached_val
+        if value is not None:
+            await self.set(key, value, ttl, stale_ttl=stale_ttl)
+        return value
+
+    async def _try_lock(self, key: str) -> bool:
+        """Пытается захватить блокировку на перезагрузку ключа."""
+        try:
+            return bool(
+                await self.redis.set(
+                    f"{key}:lock",
+                    1,
+                    px=settings.cache.lock_ttl_ms,
+                    nx=True,
+                )
+            )
+        except Exception as ex:
+            logger.error("Error acquiring cache lock: %s", ex)
+            return True
+
+    async def set(
+        self,
+        key: str,
+        value: Any,
+        ttl: int = 300,
+        stale_ttl: int = 0,
+    ) -> bool:
+        """
+        Сохранение данных в кэш с TTL, если в Redis нет более новой
+        версии. stale_ttl продлевает жизнь значения в Redis для отдачи
+        устаревших данных во время перезагрузки.
+        """
+        try:
+            payload = self.serializer.dumps(value)
+            written = await self.versioned_set(
+                keys=[key],
+                args=[
+                    payload,
+                    self.serializer.version(value),
+                    ttl + stale_ttl,
+                ],
+            )
         except Exception as ex:
             logger.error("Error storing to cache: %s", ex)
+            return False
+        if written:
+            self.local.set(key, self.serializer.loads(payload), ttl)
+            logger.debug("Result stored in cache")
+        return bool(written)
+
+    async def write_through(self, values: dict[str, Any], ttl: int) -> None:
+        """
+        Сохраняет свежие значения после записи в БД одним пайплайном.
+        Более старые версии не перезаписывают новые, локальные копии
+        на всех репликах сбрасываются через канал инвалидации.
+        """
+        if not values:
+            return
+        for key in values:
+            self.local.delete(key)
+        try:
+            async with self.redis.pipeline(transaction=False) as pipe:
+                for key, value in values.items():
+                    await self.versioned_set(
+                        keys=[key],
+                        args=[
+                            self.serializer.dumps(value),
+                            self.serializer.version(value),
+                            ttl + settings.cache.stale_ttl,
+                        ],
+                        client=pipe,
+                    )
+                pipe.publish(
+                    settings.cache.invalidation_channel, " ".join(values)
+                )
+                await pipe.execute()
+        except Exception as ex:
+            logger.error("Error writing through cache: %s", ex)
 
     async def delete(self, key: str) -> None:
-        """Удаление данных из кэша."""
+        """
+        Удаление данных из кэша. Остальные реплики получают ключ через
+        Redis pub/sub и удаляют его из своего локального кэша.
+        """
+        await self.delete_many([key])
+
+    async def delete_many(self, keys: list[str]) -> None:
+        """
+        Удаление пачки ключей одним пайплайном с одним сообщением
+        инвалидации для остальных реплик.
+        Вместо значения на tombstone_ttl секунд остается надгробие с его
+        версией: конкурентная загрузка, прочитавшая ту же или более
+        старую строку, не вернет ее в кэш.
+        """
+        if not keys:
+            return
+        for key in keys:
+            self.local.delete(key)
         try:
-            await self.redis.delete(key)
+            async with self.redis.pipeline(transaction=False) as pipe:
+                await self.tombstone(
+                    keys=keys,
+                    args=[settings.cache.tombstone_ttl],
+                    client=pipe,
+                )
+                pipe.publish(
+                    settings.cache.invalidation_channel, " ".join(keys)
+                )
+                await pipe.execute()
         except Exception as ex:
             logger.error("Error deleting from cache: %s", ex)
-            return None
+
+
+class SyncCacheManager:
+    """
+    Синхронная запись в кэш для Celery воркеров.
+    Использует тот же формат, версионную запись и надгробия,
+    что и CacheManager.
+    """
+
+    def __init__(
+        self,
+        redis: SyncRedis,
+        serializer: CacheSerializer | None = None,
+    ):
+        self.redis = redis
+        self.serializer = serializer or NotificationSerializer()
+        self.versioned_set = redis.register_script(VERSIONED_SET_SCRIPT)
+        self.tombstone = redis.register_script(TOMBSTONE_SCRIPT)
+
+    def write_through(self, values: dict[str, Any], ttl: int) -> None:
+        """Синхронный вариант CacheManager.write_through."""
+        if not values:
+            return
+        try:
+            with self.redis.pipeline(transaction=False) as pipe:
+                for key, value in values.items():
+                    self.versioned_set(
+                        keys=[key],
+                        args=[
+                            self.serializer.dumps(value),
+                            self.serializer.version(value),
+                            ttl + settings.cache.stale_ttl,
+                        ],
+                        client=pipe,
+                    )
+                pipe.publish(
+                    settings.cache.invalidation_channel, " ".join(values)
+                )
+                pipe.execute()
+        except Exception as ex:
+            logger.error("Error writing through cache: %s", ex)
+
+    def delete_many(self, keys: list[str]) -> None:
+        """Синхронный вариант CacheManager.delete_many."""
+        if not keys:
+            return
+        try:
+            with self.redis.pipeline(transaction=False) as pipe:
+                self.tombstone(
+                    keys=keys,
+                    args=[settings.cache.tombstone_ttl],
+                    client=pipe,
+                )
+                pipe.publish(
+                    settings.cache.invalidation_channel, " ".join(keys)
+                )
+                pipe.execute()
+        except Exception as ex:
+            logger.error("Error deleting from cache: %s", ex)
+
+
+async def listen_invalidations(redis: Redis, retry_delay: float = 1.0) -> None:
+    """
+    Фоновая задача: слушает канал инвалидации и удаляет полученные ключи
+    из локального кэша процесса. При потере соединения переподключается.
+    Сообщения читаются get_message с таймаутом, как в EventBroadcaster:
+    pubsub.listen() ждет с socket_timeout общего пула и на тихом канале
+    завершается TimeoutError.
+    """
+    channel = settings.cache.invalidation_channel
+    while True:
+        try:
+            async with redis.pubsub() as pubsub:
+                await pubsub.subscribe(channel)
+                # Пока не были подписаны, могли пропустить инвалидации.
+                local_cache.clear()
+                while True:
+                    message = await pubsub.get_message(
+                        ignore_subscribe_messages=True, timeout=1.0
+                    )
+                    if message and message["type"] == "message":
+                        for key in message["data"].decode().split():
+                            local_cache.delete(key)
+        except asyncio.CancelledError:
+            raise
+        except Exception as ex:
+            logger.error("Cache invalidation listener error: %s", ex)
+            local_cache.clear()
+            await asyncio.sleep(retry_delay)
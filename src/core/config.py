@@ -23,6 +23,9 @@ class RedisSettings(AppBaseSettings):
     host: str = Field(default="redis", min_length=1)
     port: int = Field(default=6379, ge=1, le=65535)
     max_connections: int = 100
+    pool_timeout: float = Field(default=5.0, gt=0)
+    socket_timeout: float = Field(default=2.0, gt=0)
+    socket_connect_timeout: float = Field(default=2.0, gt=0)
 
     @computed_field
     def connection_url(self) -> str:
@@ -49,6 +52,11 @@ class PsqlSettings(AppBaseSettings):
     pool_size: int = 20
     max_overflow: int = 10
 
+    replica_uris: list[str] = Field(default_factory=list)
+    replica_check_interval: float = Field(default=5.0, gt=0)
+    replica_max_lag: float = Field(default=10.0, gt=0)
+    read_your_writes_window: float = Field(default=5.0, ge=0)
+
     @computed_field
     def db_async_uri(self) -> str:
         """URI для асинхронного подключения к PostgreSQL."""
@@ -80,6 +88,108 @@ class PsqlSettings(AppBaseSettings):
         return str(dsn)
 
 
+class CacheSettings(AppBaseSettings):
+    """Настройки двухуровневого кэша."""
+
+    model_config = SettingsConfigDict(env_prefix="CACHE_")
+
+    local_max_size: int = Field(default=10000, ge=0)
+    local_ttl: float = Field(default=5.0, ge=0)
+    invalidation_channel: str = "cache:invalidate"
+    stale_ttl: int = Field(default=30, ge=0)
+    lock_ttl_ms: int = Field(default=5000, ge=1)
+    tombstone_ttl: int = Field(default=60, ge=1)
+
+
+class AnalysisSettings(AppBaseSettings):
+    """Настройки AI анализа уведомлений."""
+
+    model_config = SettingsConfigDict(env_prefix="ANALYSIS_")
+
+    batch_size: int = Field(default=100, ge=1, le=10000)
+    concurrency: int = Field(default=32, ge=1, le=1000)
+    cache_enabled: bool = True
+    cache_ttl: int = Field(default=86400, ge=1)
+    cache_max_size: int = Field(default=100000, ge=1)
+    processing_timeout: int = Field(default=900, ge=1)
+    requeue_interval: int = Field(default=300, ge=1)
+
+
+class CountersSettings(AppBaseSettings):
+    """Настройки счетчиков уведомлений пользователей."""
+
+    model_config = SettingsConfigDict(env_prefix="COUNTERS_")
+
+    reconcile_interval: int = Field(default=3600, ge=1)
+    reconcile_batch_size: int = Field(default=1000, ge=1)
+
+
+class EventsSettings(AppBaseSettings):
+    """Настройки потоковой отдачи событий смены статуса уведомлений."""
+
+    model_config = SettingsConfigDict(env_prefix="EVENTS_")
+
+    channel_prefix: str = "notifications:events:"
+    heartbeat_interval: float = Field(default=15.0, gt=0)
+    queue_size: int = Field(default=100, ge=1)
+
+
+class OutboxSettings(AppBaseSettings):
+    """Настройки диспетчера outbox задач AI анализа."""
+
+    model_config = SettingsConfigDict(env_prefix="OUTBOX_")
+
+    batch_size: int = Field(default=500, ge=1)
+    poll_interval: float = Field(default=0.5, gt=0)
+    retention: int = Field(default=86400, ge=0)
+    purge_interval: float = Field(default=600.0, gt=0)
+
+
+class PartitionSettings(AppBaseSettings):
+    """Настройки месячных секций таблицы уведомлений."""
+
+    model_config = SettingsConfigDict(env_prefix="PARTITIONS_")
+
+    months_ahead: int = Field(default=3, ge=1)
+    retention_months: int = Field(default=12, ge=0)
+    maintenance_interval: int = Field(default=86400, ge=1)
+
+
+class ArchiveSettings(AppBaseSettings):
+    """Настройки архивации прочитанных уведомлений в файлы."""
+
+    model_config = SettingsConfigDict(env_prefix="ARCHIVE_")
+
+    directory: str = "archive"
+    read_older_than_days: int = Field(default=90, ge=1)
+    chunk_size: int = Field(default=5000, ge=1, le=100000)
+    interval: int = Field(default=86400, ge=1)
+
+
+class ExportSettings(AppBaseSettings):
+    """Настройки потоковой выгрузки уведомлений."""
+
+    model_config = SettingsConfigDict(env_prefix="EXPORT_")
+
+    chunk_size: int = Field(default=1000, ge=1, le=100000)
+
+
+class IngestSettings(AppBaseSettings):
+    """Настройки массовой загрузки уведомлений через COPY."""
+
+    model_config = SettingsConfigDict(env_prefix="INGEST_")
+
+    chunk_size: int = Field(default=20000, ge=1, le=1000000)
+
+
+class MetricsSettings(AppBaseSettings):
+    """Настройки метрик Prometheus."""
+
+    model_config = SettingsConfigDict(env_prefix="METRICS_")
+
+    worker_port: int = Field(default=9100, ge=0, le=65535)
+
+
 class Settings(AppBaseSettings):
     """Настройки приложения."""
 
@@ -87,6 +197,16 @@ class Settings(AppBaseSettings):
 
     redis: RedisSettings = Field(default_factory=RedisSettings)
     postgres: PsqlSettings = Field(default_factory=PsqlSettings)
+    cache: CacheSettings = Field(default_factory=CacheSettings)
+    analysis: AnalysisSettings = Field(default_factory=AnalysisSettings)
+    counters: CountersSettings = Field(default_factory=CountersSettings)
+    events: EventsSettings = Field(default_factory=EventsSettings)
+    outbox: OutboxSettings = Field(default_factory=OutboxSettings)
+    partitions: PartitionSettings = Field(default_factory=PartitionSettings)
+    archive: ArchiveSettings = Field(default_factory=ArchiveSettings)
+    export: ExportSettings = Field(default_factory=ExportSettings)
+    ingest: IngestSettings = Field(default_factory=IngestSettings)
+    metrics: MetricsSettings = Field(default_factory=MetricsSettings)
 
 
 settings = Settings()
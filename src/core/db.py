@@ -6,26 +6,52 @@ from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
 from sqlalchemy.orm import Session, declarative_base, sessionmaker
 
 from src.core.config import settings
+from src.core.metrics import (
+    TimedAsyncQueuePool,
+    TimedQueuePool,
+    instrument_engine,
+)
+from src.core.routing import ReplicaRouter, RoutingSession
 
 DATABASE_URL_ASYNC = settings.postgres.db_async_uri
 DATABASE_URL_SYNC = settings.postgres.db_sync_uri
 
+
+def _create_async_engine(url: str, name: str):
+    async_engine = create_async_engine(
+        url,
+        echo=settings.postgres.echo,
+        pool_size=settings.postgres.pool_size,
+        max_overflow=settings.postgres.max_overflow,
+        poolclass=TimedAsyncQueuePool,
+    )
+    instrument_engine(async_engine.sync_engine, name)
+    return async_engine
+
+
 # async
-engine = create_async_engine(
-    DATABASE_URL_ASYNC,
-    echo=settings.postgres.echo,
-    pool_size=settings.postgres.pool_size,
-    max_overflow=settings.postgres.max_overflow,
+engine = _create_async_engine(DATABASE_URL_ASYNC, "primary")
+replica_engines = [
+    _create_async_engine(url, f"replica{index}")
+    for index, url in enumerate(settings.postgres.replica_uris)
+]
+replica_router = ReplicaRouter(
+    engine, replica_engines, max_lag=settings.postgres.replica_max_lag
 )
 
 AsyncSessionLocal = sessionmaker(
     bind=engine,
     class_=AsyncSession,
+    sync_session_class=RoutingSession,
+    router=replica_router if replica_engines else None,
     expire_on_commit=False,
 )
 
 # sync
-SyncEngine = create_engine(DATABASE_URL_SYNC, echo=False)
+SyncEngine = create_engine(
+    DATABASE_URL_SYNC, echo=False, poolclass=TimedQueuePool
+)
+instrument_engine(SyncEngine, "sync")
 SyncSessionLocal = sessionmaker(bind=SyncEngine, expire_on_commit=False)
 
 Base = declarative_base()
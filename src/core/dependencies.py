@@ -1,20 +1,33 @@
 from fastapi import Depends
+from redis.asyncio import Redis
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from src.core.cache import CacheManager
 from src.core.db import get_db
+from src.core.redis_client import get_redis
+from src.repositories.counters_repo import CountersRepository
 from src.repositories.notification_repo import NotificationRepository
 from src.services.notifications_service import NotificationService
 
 
 def get_notification_repo(
     db: AsyncSession = Depends(get_db),
+    redis: Redis = Depends(get_redis),
 ) -> NotificationRepository:
     """Возвращает экземпляр NotificationRepository."""
-    return NotificationRepository(db)
+    return NotificationRepository(db, CacheManager(redis))
+
+
+def get_counters_repo(
+    redis: Redis = Depends(get_redis),
+) -> CountersRepository:
+    """Возвращает экземпляр CountersRepository."""
+    return CountersRepository(redis)
 
 
 def get_notific_service(
     repo: NotificationRepository = Depends(get_notification_repo),
+    counters: CountersRepository = Depends(get_counters_repo),
 ) -> NotificationService:
     """Возвращает экземпляр NotificationService."""
-    return NotificationService(repo)
+    return NotificationService(repo, counters)
@@ -2,6 +2,7 @@ from fastapi import Request, Response, status
 from fastapi.responses import JSONResponse
 
 from src.core.exceptions import (
+    InvalidCursorError,
     NotificationNotFoundError,
     NotificationRepositoryError,
 )
@@ -29,7 +30,19 @@ async def not_found_notification_error_handler(
     )
 
 
+async def invalid_cursor_error_handler(
+    _: Request,
+    exc: InvalidCursorError,
+) -> Response:
+    """Invalid pagination cursor error handler"""
+    return JSONResponse(
+        status_code=status.HTTP_400_BAD_REQUEST,
+        content={"detail": "Invalid cursor"},
+    )
+
+
 exception_handlers = {
     NotificationRepositoryError: repository_error_handler,
     NotificationNotFoundError: not_found_notification_error_handler,
+    InvalidCursorError: invalid_cursor_error_handler,
 }
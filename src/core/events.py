@@ -0,0 +1,186 @@
+import asyncio
+import logging
+import uuid
+from contextlib import asynccontextmanager
+from enum import Enum
+from typing import Any, AsyncIterator, Iterable
+
+import orjson
+from redis import Redis as SyncRedis
+from redis.asyncio import Redis
+
+from src.core.cache import _orjson_default
+from src.core.config import settings
+from src.schemas.enums import ProcessingStatus
+
+logger = logging.getLogger(__name__)
+
+FINAL_STATUSES = frozenset(
+    (ProcessingStatus.COMPLETED.value, ProcessingStatus.FAILED.value)
+)
+
+
+def user_channel(user_id: uuid.UUID) -> str:
+    """Канал Redis pub/sub событий уведомлений пользователя."""
+    return f"{settings.events.channel_prefix}{user_id}"
+
+
+def _enum_value(value: Any) -> Any:
+    return value.value if isinstance(value, Enum) else value
+
+
+def status_event(notification) -> dict[str, Any]:
+    """Событие смены статуса обработки уведомления."""
+    return {
+        "id": str(notification.id),
+        "user_id": str(notification.user_id),
+        "processing_status": _enum_value(notification.processing_status),
+        "category": _enum_value(notification.category),
+        "confidence": notification.confidence,
+        "version": notification.version,
+    }
+
+
+def publish_status_events(redis: SyncRedis, notifications: Iterable) -> None:
+    """
+    Публикует события смены статуса из Celery воркера в каналы
+    пользователей одним pipeline. Ошибки Redis не прерывают обработку.
+    """
+    try:
+        with redis.pipeline(transaction=False) as pipe:
+            for note in notifications:
+                if note is None:
+                    continue
+                pipe.publish(
+                    user_channel(note.user_id),
+                    orjson.dumps(status_event(note), default=_orjson_default),
+                )
+            pipe.execute()
+    except Exception as ex:
+        logger.error("Error publishing status events: %s", ex)
+
+
+def format_sse(event: dict[str, Any] | None) -> bytes:
+    """
+    Кодирует событие в формат Server-Sent Events.
+    None кодируется комментарием, поддерживающим соединение.
+    """
+    if event is None:
+        return b": keep-alive\n\n"
+    data = orjson.dumps(event, default=_orjson_default)
+    return b"event: status\ndata: " + data + b"\n\n"
+
+
+class EventBroadcaster:
+    """
+    Раздает события из Redis pub/sub подписчикам процесса.
+    Все клиенты процесса мультиплексируются через одно соединение pub/sub:
+    на канал пользователя подписка оформляется при появлении первого
+    слушателя и снимается после ухода последнего.
+    """
+
+    def __init__(self, redis: Redis, retry_delay: float = 1.0):
+        self.redis = redis
+        self.retry_delay = retry_delay
+        self._subscribers: dict[str, set[asyncio.Queue]] = {}
+        self._pubsub = None
+        self._wakeup = asyncio.Event()
+
+    @asynccontextmanager
+    async def subscribe(
+        self, user_ids: Iterable[uuid.UUID]
+    ) -> AsyncIterator[asyncio.Queue]:
+        """Подписывает очередь на события пользователей."""
+        queue: asyncio.Queue = asyncio.Queue(settings.events.queue_size)
+        channels = {user_channel(user_id) for user_id in user_ids}
+        new_channels = []
+        for channel in channels:
+            queues = self._subscribers.setdefault(channel, set())
+            if not queues:
+                new_channels.append(channel)
+            queues.add(queue)
+        try:
+            if new_channels:
+                await self._execute("subscribe", new_channels)
+            yield queue
+        finally:
+            unused_channels = []
+            for channel in channels:
+                queues = self._subscribers.get(channel, set())
+                queues.discard(queue)
+                if not queues:
+                    self._subscribers.pop(channel, None)
+                    unused_channels.append(channel)
+            if unused_channels:
+                await self._execute("unsubscribe", unused_channels)
+
+    async def _execute(self, command: str, channels: list[str]) -> None:
+        # Без соединения подписки восстановит run() при переподключении.
+        if self._pubsub is None:
+            return
+        try:
+            await getattr(self._pubsub, command)(*channels)
+        except Exception as ex:
+            logger.error("Error on events %s: %s", command, ex)
+        self._wakeup.set()
+
+    def _dispatch(self, message: dict) -> None:
+        queues = self._subscribers.get(message["channel"].decode())
+        if not queues:
+            return
+        event = orjson.loads(message["data"])
+        for queue in queues:
+            try:
+                queue.put_nowait(event)
+            except asyncio.QueueFull:
+                logger.warning("Events queue is full, event dropped")
+
+    async def run(self) -> None:
+        """
+        Фоновая задача: читает сообщения pub/sub и раздает их очередям
+        подписчиков. При потере соединения переподключается и
+        восстанавливает подписки.
+        """
+        while True:
+            try:
+                async with self.redis.pubsub() as pubsub:
+                    self._pubsub = pubsub
+                    if self._subscribers:
+                        await pubsub.subscribe(*self._subscribers)
+                    await self._listen(pubsub)
+            except asyncio.CancelledError:
+                raise
+            except Exception as ex:
+                logger.error("Events listener error: %s", ex)
+                await asyncio.sleep(self.retry_delay)
+            finally:
+                self._pubsub = None
+
+    async def _listen(self, pubsub) -> None:
+        while True:
+            self._wakeup.clear()
+            if not pubsub.subscribed:
+                await self._wakeup.wait()
+                continue
+            message = await pubsub.get_message(
+                ignore_subscribe_messages=True, timeout=1.0
+            )
+            if message and message["type"] == "message":
+                self._dispatch(message)
+
+
+event_broadcaster: EventBroadcaster | None = None
+
+
+def init_event_broadcaster(redis: Redis) -> EventBroadcaster:
+    """Создает общий для процесса EventBroadcaster при старте."""
+    global event_broadcaster
+    event_broadcaster = EventBroadcaster(redis)
+    return event_broadcaster
+
+
+def get_event_broadcaster() -> EventBroadcaster:
+    """Зависимость для FastAPI."""
+    if event_broadcaster is None:
+        raise RuntimeError("Event broadcaster is not initialized")
+    return event_broadcaster
@@ -9,3 +9,10 @@ class NotificationRepositoryError(Exception):
 
 class NotificationNotFoundError(Exception):
     """Запрашиваемая нотификация не найдена"""
+
+
+class InvalidCursorError(Exception):
+    """Некорректный курсор пагинации"""
+
+    def __init__(self, cursor: str):
+        self.cursor = cursor
@@ -0,0 +1,52 @@
+import csv
+import io
+from datetime import datetime
+from enum import Enum
+from typing import Any
+
+from src.core.responses import RESPONSE_FIELDS, dumps
+from src.schemas.enums import ExportFormat
+from src.schemas.notifications import NotificationDTO
+
+MEDIA_TYPES = {
+    ExportFormat.NDJSON: "application/x-ndjson",
+    ExportFormat.CSV: "text/csv",
+}
+
+
+def _csv_value(value: Any) -> Any:
+    if value is None:
+        return ""
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, list):
+        return ";".join(value)
+    return value
+
+
+def ndjson_chunk(notifications: list[NotificationDTO]) -> bytes:
+    """Пачка уведомлений в NDJSON, по одному JSON объекту на строку."""
+    return b"".join(dumps(note) + b"\n" for note in notifications)
+
+
+def csv_header() -> bytes:
+    """Строка заголовка CSV с полями NotificationResponse."""
+    buffer = io.StringIO()
+    csv.writer(buffer).writerow(RESPONSE_FIELDS)
+    return buffer.getvalue().encode()
+
+
+def csv_chunk(notifications: list[NotificationDTO]) -> bytes:
+    """
+    Пачка уведомлений в CSV. Пустое поле означает null, ключевые слова
+    разделяются точкой с запятой.
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for note in notifications:
+        writer.writerow(
+            _csv_value(getattr(note, name)) for name in RESPONSE_FIELDS
+        )
+    return buffer.getvalue().encode()
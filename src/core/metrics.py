@@ -0,0 +1,243 @@
+import logging
+import os
+import time
+from datetime import datetime, timezone
+from typing import Iterable
+
+from celery.signals import (
+    task_postrun,
+    task_prerun,
+    worker_init,
+    worker_process_shutdown,
+)
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+    start_http_server,
+)
+from sqlalchemy import Engine, event
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+from starlette.requests import Request
+from starlette.responses import Response
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+logger = logging.getLogger(__name__)
+
+# Границы гистограмм: от долей миллисекунды для кэша и БД до минут для
+# ожидания уведомлений в очереди.
+FAST_BUCKETS = (
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+)
+LAG_BUCKETS = (0.1, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 300.0, 900.0, 3600.0)
+
+HTTP_REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds",
+    "Время обработки HTTP запроса",
+    ["method", "route", "status"],
+    buckets=FAST_BUCKETS,
+)
+CACHE_REQUESTS = Counter(
+    "cache_requests_total",
+    "Обращения к кэшу уведомлений по уровням",
+    ["tier", "result"],
+)
+DB_POOL_CHECKOUT = Histogram(
+    "db_pool_checkout_seconds",
+    "Ожидание соединения из пула SQLAlchemy",
+    buckets=FAST_BUCKETS,
+)
+DB_POOL_IN_USE = Gauge(
+    "db_pool_connections_in_use",
+    "Соединения, выданные из пула",
+    ["engine"],
+    multiprocess_mode="livesum",
+)
+DB_QUERY_DURATION = Histogram(
+    "db_query_duration_seconds",
+    "Время выполнения SQL запроса",
+    ["engine", "operation"],
+    buckets=FAST_BUCKETS,
+)
+TASK_DURATION = Histogram(
+    "celery_task_duration_seconds",
+    "Время выполнения Celery задачи",
+    ["task", "state"],
+    buckets=FAST_BUCKETS + (5.0, 10.0, 30.0, 60.0),
+)
+NOTIFICATION_PENDING_LAG = Histogram(
+    "notification_pending_lag_seconds",
+    "Время от создания уведомления до начала его анализа",
+    buckets=LAG_BUCKETS,
+)
+
+SQL_OPERATIONS = frozenset({"SELECT", "INSERT", "UPDATE", "DELETE"})
+
+
+def _registry() -> CollectorRegistry:
+    # В режиме нескольких процессов (gunicorn, prefork воркеры Celery)
+    # значения собираются из файлов PROMETHEUS_MULTIPROC_DIR.
+    if "PROMETHEUS_MULTIPROC_DIR" not in os.environ:
+        return REGISTRY
+    registry = CollectorRegistry()
+    multiprocess.MultiProcessCollector(registry)
+    return registry
+
+
+async def metrics_endpoint(_: Request) -> Response:
+    """Метрики в текстовом формате Prometheus."""
+    return Response(
+        generate_latest(_registry()), media_type=CONTENT_TYPE_LATEST
+    )
+
+
+def start_metrics_server(port: int) -> None:
+    """HTTP сервер метрик для процессов без API (воркер Celery)."""
+    start_http_server(port, registry=_registry())
+    logger.info("Metrics server started on port %d", port)
+
+
+class PrometheusMiddleware:
+    """
+    Гистограмма времени HTTP запросов по шаблону маршрута.
+    Запросы без найденного маршрута учитываются как route="unmatched",
+    чтобы произвольные пути не порождали новые ряды.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        status = 500
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            route = scope.get("route")
+            HTTP_REQUEST_DURATION.labels(
+                scope["method"],
+                route.path if route else "unmatched",
+                status,
+            ).observe(time.perf_counter() - start)
+
+
+class _CheckoutTimingMixin:
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            DB_POOL_CHECKOUT.observe(time.perf_counter() - start)
+
+
+class TimedQueuePool(_CheckoutTimingMixin, QueuePool):
+    """QueuePool с гистограммой ожидания соединения."""
+
+
+class TimedAsyncQueuePool(_CheckoutTimingMixin, AsyncAdaptedQueuePool):
+    """AsyncAdaptedQueuePool с гистограммой ожидания соединения."""
+
+
+def instrument_engine(engine: Engine, name: str) -> None:
+    """
+    Подключает к engine метрики времени запросов и числа выданных
+    соединений. Для AsyncEngine передается его sync_engine.
+    """
+    in_use = DB_POOL_IN_USE.labels(name)
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def before_cursor_execute(conn, cursor, statement, *_):
+        conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def after_cursor_execute(conn, cursor, statement, *_):
+        start = conn.info["query_start"].pop()
+        operation = statement.lstrip()[:6].upper()
+        DB_QUERY_DURATION.labels(
+            name, operation if operation in SQL_OPERATIONS else "OTHER"
+        ).observe(time.perf_counter() - start)
+
+    @event.listens_for(engine, "handle_error")
+    def handle_error(context):
+        if context.connection is not None:
+            starts = context.connection.info.get("query_start")
+            if starts:
+                starts.pop()
+
+    @event.listens_for(engine.pool, "checkout")
+    def checkout(*_):
+        in_use.inc()
+
+    @event.listens_for(engine.pool, "checkin")
+    def checkin(*_):
+        in_use.dec()
+
+
+def observe_pending_lag(notifications: Iterable) -> None:
+    """
+    Учитывает ожидание уведомлений от создания до начала анализа.
+    Объекты без created_at (еще не загруженные из БД) пропускаются.
+    """
+    now = datetime.now(timezone.utc)
+    for note in notifications:
+        if note.created_at is not None:
+            NOTIFICATION_PENDING_LAG.observe(
+                (now - note.created_at).total_seconds()
+            )
+
+
+def instrument_celery(worker_port: int) -> None:
+    """
+    Гистограмма времени выполнения задач по сигналам Celery и HTTP
+    сервер метрик в главном процессе воркера на порту worker_port.
+    """
+    starts: dict[str, float] = {}
+
+    if worker_port:
+
+        @worker_init.connect(weak=False)
+        def on_worker_init(**_):
+            start_metrics_server(worker_port)
+
+    @worker_process_shutdown.connect(weak=False)
+    def on_process_shutdown(**_):
+        if "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+            multiprocess.mark_process_dead(os.getpid())
+
+    @task_prerun.connect(weak=False)
+    def on_prerun(task_id=None, **_):
+        starts[task_id] = time.perf_counter()
+
+    @task_postrun.connect(weak=False)
+    def on_postrun(task_id=None, task=None, state=None, **_):
+        start = starts.pop(task_id, None)
+        if start is not None:
+            TASK_DURATION.labels(task.name, state or "UNKNOWN").observe(
+                time.perf_counter() - start
+            )
@@ -0,0 +1,40 @@
+import base64
+import binascii
+import uuid
+from datetime import datetime
+
+from src.core.exceptions import InvalidCursorError
+
+
+def encode_cursor(created_at: datetime, notification_id: uuid.UUID) -> str:
+    """Кодирует позицию (created_at, id) в непрозрачный курсор."""
+    raw = f"{created_at.isoformat()}|{notification_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def encode_rank_cursor(rank: float, notification_id: uuid.UUID) -> str:
+    """Кодирует позицию (rank, id) результатов поиска в курсор."""
+    raw = f"{rank!r}|{notification_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_rank_cursor(cursor: str) -> tuple[float, uuid.UUID]:
+    """Декодирует курсор поиска обратно в позицию (rank, id)."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        raw = base64.urlsafe_b64decode(padded.encode()).decode()
+        rank, notification_id = raw.split("|", 1)
+        return float(rank), uuid.UUID(notification_id)
+    except (binascii.Error, UnicodeDecodeError, ValueError) as exc:
+        raise InvalidCursorError(cursor) from exc
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, uuid.UUID]:
+    """Декодирует курсор обратно в позицию (created_at, id)."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        raw = base64.urlsafe_b64decode(padded.encode()).decode()
+        created_at, notification_id = raw.split("|", 1)
+        return datetime.fromisoformat(created_at), uuid.UUID(notification_id)
+    except (binascii.Error, UnicodeDecodeError, ValueError) as exc:
+        raise InvalidCursorError(cursor) from exc
@@ -0,0 +1,64 @@
+from redis import BlockingConnectionPool as SyncBlockingConnectionPool
+from redis import Redis as SyncRedis
+from redis.asyncio import BlockingConnectionPool, Redis
+
+from src.core.config import settings
+
+redis_client: Redis | None = None
+sync_redis_client: SyncRedis | None = None
+
+
+def create_redis() -> Redis:
+    """
+    Создает клиент Redis с общим пулом соединений.
+    При исчерпании пула запрос ждет свободное соединение pool_timeout
+    секунд вместо открытия нового.
+    """
+    pool = BlockingConnectionPool.from_url(
+        settings.redis.connection_url,
+        max_connections=settings.redis.max_connections,
+        timeout=settings.redis.pool_timeout,
+        socket_timeout=settings.redis.socket_timeout,
+        socket_connect_timeout=settings.redis.socket_connect_timeout,
+    )
+    return Redis.from_pool(pool)
+
+
+async def init_redis() -> Redis:
+    """Создает клиент Redis приложения при старте."""
+    global redis_client
+    redis_client = create_redis()
+    return redis_client
+
+
+async def close_redis() -> None:
+    """Закрывает клиент Redis и его пул соединений при остановке."""
+    global redis_client
+    if redis_client is not None:
+        await redis_client.aclose()
+        redis_client = None
+
+
+def get_redis() -> Redis:
+    """Зависимость для FastAPI."""
+    if redis_client is None:
+        raise RuntimeError("Redis client is not initialized")
+    return redis_client
+
+
+def get_sync_redis() -> SyncRedis:
+    """
+    Синхронный клиент Redis для Celery воркеров.
+    Создается лениво, чтобы каждый процесс воркера имел свой пул.
+    """
+    global sync_redis_client
+    if sync_redis_client is None:
+        pool = SyncBlockingConnectionPool.from_url(
+            settings.redis.connection_url,
+            max_connections=settings.redis.max_connections,
+            timeout=settings.redis.pool_timeout,
+            socket_timeout=settings.redis.socket_timeout,
+            socket_connect_timeout=settings.redis.socket_connect_timeout,
+        )
+        sync_redis_client = SyncRedis(connection_pool=pool)
+    return sync_redis_client
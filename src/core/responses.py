@@ -0,0 +1,52 @@
+import uuid
+from typing import Any
+
+import orjson
+from fastapi.responses import Response
+from pydantic import BaseModel
+
+from src.schemas.notifications import NotificationDTO, NotificationResponse
+
+# Поля ответа в порядке схемы NotificationResponse (без версии строки).
+RESPONSE_FIELDS = tuple(NotificationResponse.model_fields)
+
+
+def _default(value: Any) -> Any:
+    if isinstance(value, NotificationDTO):
+        return {name: getattr(value, name) for name in RESPONSE_FIELDS}
+    if isinstance(value, BaseModel):
+        return value.model_dump()
+    # asyncpg возвращает собственный подкласс UUID, который orjson
+    # не сериализует нативно.
+    if isinstance(value, uuid.UUID):
+        return str(value)
+    raise TypeError
+
+
+def dumps(content: Any) -> bytes:
+    """
+    Сериализует NotificationDTO или уже проверенные pydantic модели
+    (или их список) в JSON.
+    """
+    return orjson.dumps(
+        content,
+        default=_default,
+        option=orjson.OPT_PASSTHROUGH_DATACLASS | orjson.OPT_UTC_Z,
+    )
+
+
+class NotificationJSONResponse(Response):
+    """
+    JSON ответ из NotificationDTO без pydantic валидации.
+    DTO сериализуются orjson за один проход в поля NotificationResponse;
+    UUID, datetime (UTC с суффиксом Z, как у pydantic) и Enum
+    обрабатываются orjson. Уже проверенные pydantic модели (результаты
+    поиска) передаются orjson через model_dump. Схема OpenAPI задается
+    response_model роута, FastAPI не валидирует возвращенный Response
+    повторно.
+    """
+
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
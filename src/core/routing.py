@@ -0,0 +1,188 @@
+import asyncio
+import itertools
+import logging
+import math
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from sqlalchemy import Engine, Select, text
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.orm import Session
+from starlette.datastructures import MutableHeaders
+from starlette.requests import HTTPConnection
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+logger = logging.getLogger(__name__)
+
+# Флаг запроса: читать с основного сервера (окно read-your-writes).
+use_primary: ContextVar[bool] = ContextVar("use_primary", default=False)
+
+
+@contextmanager
+def primary_reads():
+    """Направляет чтения внутри блока на основной сервер."""
+    token = use_primary.set(True)
+    try:
+        yield
+    finally:
+        use_primary.reset(token)
+
+
+# Отставание реплики в секундах; реплика без отставания по WAL
+# считается синхронной, даже если на основном сервере не было записей.
+REPLICA_LAG_QUERY = text(
+    "SELECT CASE "
+    "WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 "
+    "ELSE extract(epoch FROM now() - pg_last_xact_replay_timestamp()) "
+    "END"
+)
+
+
+class ReplicaRouter:
+    """
+    Выбирает сервер для чтения: реплики по кругу среди здоровых,
+    основной сервер - если реплик нет, все они недоступны или запрос
+    находится в окне read-your-writes.
+    """
+
+    def __init__(
+        self,
+        primary: AsyncEngine,
+        replicas: list[AsyncEngine],
+        max_lag: float,
+        check_timeout: float = 2.0,
+    ):
+        self.primary = primary
+        self.replicas = replicas
+        self.max_lag = max_lag
+        self.check_timeout = check_timeout
+        self._healthy = list(replicas)
+        self._counter = itertools.count()
+
+    @property
+    def has_healthy_replica(self) -> bool:
+        """Есть ли реплика, прошедшая последнюю проверку."""
+        return bool(self._healthy)
+
+    def reader(self) -> Engine:
+        """Возвращает sync engine для очередного чтения."""
+        healthy = self._healthy
+        if use_primary.get() or not healthy:
+            return self.primary.sync_engine
+        return healthy[next(self._counter) % len(healthy)].sync_engine
+
+    async def _is_healthy(self, replica: AsyncEngine) -> bool:
+        try:
+            async with replica.connect() as conn:
+                lag = await asyncio.wait_for(
+                    conn.scalar(REPLICA_LAG_QUERY), self.check_timeout
+                )
+        except Exception as exc:
+            logger.warning("Replica %s is unavailable: %s", replica.url, exc)
+            return False
+        if lag is not None and lag > self.max_lag:
+            logger.warning("Replica %s lags by %.1f s", replica.url, lag)
+            return False
+        return True
+
+    async def check(self) -> None:
+        """Проверяет реплики и обновляет список здоровых."""
+        results = await asyncio.gather(
+            *(self._is_healthy(replica) for replica in self.replicas)
+        )
+        self._healthy = [
+            replica
+            for replica, healthy in zip(self.replicas, results, strict=True)
+            if healthy
+        ]
+
+    async def run(self, interval: float) -> None:
+        """Периодически проверяет здоровье реплик."""
+        while True:
+            await self.check()
+            await asyncio.sleep(interval)
+
+
+class RoutingSession(Session):
+    """
+    Сессия, направляющая чтения на реплики, а записи на основной сервер.
+    После первой записи (или SELECT ... FOR UPDATE) сессия закрепляется
+    за основным сервером до закрытия, чтобы видеть свои изменения.
+    """
+
+    PINNED = "pinned_to_primary"
+
+    def __init__(self, router: ReplicaRouter | None = None, **kwargs):
+        super().__init__(**kwargs)
+        self.router = router
+
+    def get_bind(self, mapper=None, clause=None, **kwargs):
+        if self.router is None:
+            return super().get_bind(mapper, clause=clause, **kwargs)
+        is_read = isinstance(clause, Select) and clause._for_update_arg is None
+        if self._flushing or not is_read:
+            self.info[self.PINNED] = True
+        if self.info.get(self.PINNED):
+            return self.router.primary.sync_engine
+        return self.router.reader()
+
+    def reads_from_replica(self) -> bool:
+        """Может ли очередное чтение сессии уйти на реплику."""
+        return (
+            self.router is not None
+            and self.router.has_healthy_replica
+            and not self.info.get(self.PINNED)
+            and not use_primary.get()
+        )
+
+
+class ReadYourWritesMiddleware:
+    """
+    После успешного изменяющего запроса выставляет cookie, в течение
+    window секунд запросы этого клиента читают с основного сервера.
+    Окно действует только для клиента с этим cookie; чтения по id
+    других клиентов при промахе на реплике перепроверяются на основном
+    сервере в NotificationRepository.get_by_id.
+    """
+
+    COOKIE = "db_primary_until"
+    SAFE_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+
+    def __init__(self, app: ASGIApp, window: float):
+        self.app = app
+        self.window = window
+
+    def _in_window(self, scope: Scope) -> bool:
+        value = HTTPConnection(scope).cookies.get(self.COOKIE)
+        try:
+            return value is not None and float(value) > time.time()
+        except ValueError:
+            return False
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http" or self.window <= 0:
+            await self.app(scope, receive, send)
+            return
+        is_write = scope["method"] not in self.SAFE_METHODS
+
+        async def send_wrapper(message: Message) -> None:
+            if (
+                is_write
+                and message["type"] == "http.response.start"
+                and message["status"] < 400
+            ):
+                until = time.time() + self.window
+                MutableHeaders(scope=message).append(
+                    "set-cookie",
+                    f"{self.COOKIE}={until:.3f}; "
+                    f"Max-Age={math.ceil(self.window)}; "
+                    "Path=/; HttpOnly; SameSite=Lax",
+                )
+            await send(message)
+
+        token = use_primary.set(self._in_window(scope))
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            use_primary.reset(token)
@@ -0,0 +1,323 @@
+"""
+Массовая загрузка уведомлений из NDJSON или CSV через COPY.
+
+Запуск: python -m src.ingest notifications.ndjson
+        cat notifications.csv | python -m src.ingest - --format csv
+"""
+
+import argparse
+import csv
+import io
+import logging
+import math
+import queue
+import sys
+import threading
+import time
+import uuid
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import IO, Iterable, Iterator, NamedTuple
+
+import orjson
+
+from src.core.config import settings
+from src.core.db import get_sync_db_session
+from src.core.log_config import setup_logging
+from src.core.redis_client import get_sync_redis
+from src.repositories.counters_repo import CountersRepository
+from src.repositories.notification_repo import NotificationRepository
+from src.repositories.partition_repo import PartitionRepository
+from src.schemas.enums import ProcessingStatus
+from src.tasks.task_analyze import analyze_pending_notifications
+
+logger = logging.getLogger(__name__)
+
+TITLE_MAX_LENGTH = 256
+PREFETCH_CHUNKS = 2
+
+
+class IngestRow(NamedTuple):
+    id: uuid.UUID
+    user_id: uuid.UUID
+    title: str
+    text: str
+    created_at: datetime
+
+    def copy_values(self) -> tuple:
+        """Значения в порядке COPY_COLUMNS."""
+        return (
+            self.id,
+            self.user_id,
+            self.title,
+            self.text,
+            self.created_at,
+            self.created_at,
+            ProcessingStatus.PENDING.name,
+        )
+
+
+@dataclass
+class IngestStats:
+    rows: int = 0
+    skipped: int = 0
+    chunks: int = 0
+    seconds: float = 0.0
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows / self.seconds if self.seconds else 0.0
+
+
+def read_ndjson(stream: IO[bytes]) -> Iterator[dict]:
+    for line in stream:
+        if line.strip():
+            yield orjson.loads(line)
+
+
+def read_csv(stream: IO[bytes]) -> Iterator[dict]:
+    yield from csv.DictReader(io.TextIOWrapper(stream, encoding="utf-8"))
+
+
+READERS = {"ndjson": read_ndjson, "csv": read_csv}
+
+
+def to_row(record: dict, now: datetime) -> IngestRow:
+    """
+    Проверяет запись и собирает строку загрузки. Обязательны user_id,
+    title и text; id и created_at (ISO 8601, без зоны считается UTC,
+    допускается суффикс Z) необязательны. Некорректная запись вызывает
+    ValueError.
+    """
+    title, text = record.get("title"), record.get("text")
+    if not isinstance(title, str) or len(title) > TITLE_MAX_LENGTH:
+        raise ValueError("invalid title")
+    if not isinstance(text, str):
+        raise ValueError("invalid text")
+    created_at = now
+    if record.get("created_at"):
+        # fromisoformat в Python 3.10 не принимает суффикс Z, которым
+        # экспорт (orjson.OPT_UTC_Z) записывает время в UTC.
+        value = record["created_at"]
+        if value.endswith("Z"):
+            value = value[:-1] + "+00:00"
+        created_at = datetime.fromisoformat(value)
+        if created_at.tzinfo is None:
+            created_at = created_at.replace(tzinfo=timezone.utc)
+    return IngestRow(
+        id=uuid.UUID(record["id"]) if record.get("id") else uuid.uuid4(),
+        user_id=uuid.UUID(record["user_id"]),
+        title=title,
+        text=text,
+        created_at=created_at,
+    )
+
+
+def read_chunks(
+    records: Iterable[dict], chunk_size: int, stats: IngestStats
+) -> Iterator[list[IngestRow]]:
+    """Разбивает записи на пачки, пропуская некорректные."""
+    now = datetime.now(timezone.utc)
+    chunk: list[IngestRow] = []
+    for number, record in enumerate(records, start=1):
+        try:
+            chunk.append(to_row(record, now))
+        except (ValueError, KeyError, TypeError) as exc:
+            stats.skipped += 1
+            logger.warning("Skip record %d: %s", number, exc)
+            continue
+        if len(chunk) == chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def encode_chunks(
+    chunks: Iterable[list[IngestRow]],
+) -> Iterator[tuple[list[IngestRow], io.StringIO]]:
+    """Добавляет к каждой пачке ее CSV буфер для COPY."""
+    for rows in chunks:
+        yield (
+            rows,
+            NotificationRepository.copy_buffer(
+                row.copy_values() for row in rows
+            ),
+        )
+
+
+def prefetch(items: Iterator, size: int) -> Iterator:
+    """
+    Читает элементы items в фоновом потоке с очередью на size элементов:
+    разбор следующей пачки идет, пока текущая загружается в БД, а память
+    ограничена size пачками.
+    """
+    buffer: queue.Queue = queue.Queue(maxsize=size)
+    done = object()
+    stop = threading.Event()
+
+    def produce() -> None:
+        try:
+            for item in items:
+                if stop.is_set():
+                    return
+                buffer.put(item)
+        except BaseException as exc:
+            buffer.put(exc)
+            return
+        buffer.put(done)
+
+    thread = threading.Thread(target=produce, daemon=True)
+    thread.start()
+    try:
+        while (item := buffer.get()) is not done:
+            if isinstance(item, BaseException):
+                raise item
+            yield item
+    finally:
+        stop.set()
+
+
+class Ingestor:
+    """
+    Загружает пачки уведомлений командой COPY, каждую в своей
+    транзакции. Недостающие месячные секции создаются до COPY в
+    отдельной короткой транзакции. Записи с уже занятыми id
+    пропускаются. После фиксации пачки обновляются счетчики
+    пользователей и ставится задача пакетного анализа PENDING
+    уведомлений.
+    """
+
+    def __init__(self, analyze: bool = True):
+        self.analyze = analyze
+        self.counters = CountersRepository(get_sync_redis())
+        self._months: set[datetime] | None = None
+
+    def _ensure_partitions(self, rows: list[IngestRow]) -> None:
+        """
+        Создает недостающие секции месяцев пачки и фиксирует их сразу:
+        CREATE TABLE ... PARTITION OF блокирует notifications целиком,
+        и блокировка не должна держаться на время COPY.
+        """
+        months = {PartitionRepository.month_start(r.created_at) for r in rows}
+        if self._months is not None and months <= self._months:
+            return
+        with get_sync_db_session() as session:
+            partitions = PartitionRepository(session)
+            known = self._months
+            if known is None:
+                known = set(partitions.sync_list_months())
+            for month in sorted(months - known):
+                partitions.sync_create(month)
+        self._months = known | months
+
+    @staticmethod
+    def _new_rows(
+        repo: NotificationRepository, rows: list[IngestRow]
+    ) -> list[IngestRow]:
+        """
+        Отбрасывает записи с id, повторенным в пачке или уже занятым
+        уведомлением. Конкурентная загрузка тех же id завершится ошибкой
+        уникальности notification_keys.
+        """
+        existing = repo.sync_existing_ids([row.id for row in rows])
+        new_rows = []
+        for row in rows:
+            if row.id not in existing:
+                existing.add(row.id)
+                new_rows.append(row)
+        return new_rows
+
+    def load_chunk(self, rows: list[IngestRow], buffer: io.StringIO) -> int:
+        """Загружает пачку и возвращает число загруженных строк."""
+        self._ensure_partitions(rows)
+        with get_sync_db_session() as session:
+            repo = NotificationRepository(session)
+            new_rows = self._new_rows(repo, rows)
+            if len(new_rows) < len(rows):
+                logger.warning(
+                    "Skip %d records with existing ids",
+                    len(rows) - len(new_rows),
+                )
+                buffer = NotificationRepository.copy_buffer(
+                    row.copy_values() for row in new_rows
+                )
+            if not new_rows:
+                return 0
+            repo.sync_copy(buffer)
+            session.commit()
+            committed_at = repo.sync_clock()
+        self.counters.sync_on_created(new_rows, committed_at)
+        if self.analyze:
+            analyze_pending_notifications.delay(
+                max_batches=math.ceil(
+                    len(new_rows) / settings.analysis.batch_size
+                )
+            )
+        return len(new_rows)
+
+    def run(self, records: Iterable[dict], chunk_size: int) -> IngestStats:
+        stats = IngestStats()
+        start = time.perf_counter()
+        # Разбор и кодирование пачек идут в фоновом потоке параллельно
+        # с COPY предыдущей пачки.
+        chunks = prefetch(
+            encode_chunks(read_chunks(records, chunk_size, stats)),
+            PREFETCH_CHUNKS,
+        )
+        for rows, buffer in chunks:
+            loaded = self.load_chunk(rows, buffer)
+            stats.rows += loaded
+            stats.skipped += len(rows) - loaded
+            stats.chunks += 1
+            stats.seconds = time.perf_counter() - start
+            logger.info(
+                "Ingested %d rows (%.0f rows/s)",
+                stats.rows,
+                stats.rows_per_second,
+            )
+        stats.seconds = time.perf_counter() - start
+        return stats
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(
+        description="Массовая загрузка уведомлений через COPY"
+    )
+    parser.add_argument(
+        "path", nargs="?", default="-", help="Файл или - для stdin"
+    )
+    parser.add_argument(
+        "--format",
+        choices=READERS,
+        help="Формат ввода; по умолчанию по расширению файла или ndjson",
+    )
+    parser.add_argument(
+        "--chunk-size", type=int, default=settings.ingest.chunk_size
+    )
+    parser.add_argument(
+        "--no-analyze",
+        action="store_true",
+        help="Не ставить задачи AI анализа",
+    )
+    args = parser.parse_args(argv)
+    setup_logging()
+
+    fmt = args.format or ("csv" if args.path.endswith(".csv") else "ndjson")
+    if args.path == "-":
+        stream = sys.stdin.buffer
+    else:
+        stream = open(args.path, "rb")
+    with stream:
+        stats = Ingestor(analyze=not args.no_analyze).run(
+            READERS[fmt](stream), args.chunk_size
+        )
+    print(
+        f"Ingested {stats.rows} rows in {stats.chunks} chunks, "
+        f"skipped {stats.skipped}, {stats.seconds:.1f} s, "
+        f"{stats.rows_per_second:.0f} rows/s"
+    )
+
+
+if __name__ == "__main__":
+    main()
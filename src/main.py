@@ -1,16 +1,49 @@
+import asyncio
+import contextlib
 import logging
+from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
 from fastapi.responses import ORJSONResponse
 
 from src.api import router as api_router
+from src.core.cache import listen_invalidations
+from src.core.config import settings
+from src.core.db import replica_engines, replica_router
 from src.core.error_handlers import exception_handlers
+from src.core.events import init_event_broadcaster
 from src.core.log_config import setup_logging
+from src.core.metrics import PrometheusMiddleware, metrics_endpoint
+from src.core.redis_client import close_redis, init_redis
+from src.core.routing import ReadYourWritesMiddleware
 
 setup_logging()
 logger = logging.getLogger(__name__)
 
 
+@asynccontextmanager
+async def lifespan(_: FastAPI):
+    """Запуск и остановка общих ресурсов и фоновых задач приложения."""
+    redis = await init_redis()
+    background_tasks = [
+        asyncio.create_task(listen_invalidations(redis)),
+        asyncio.create_task(init_event_broadcaster(redis).run()),
+    ]
+    if replica_engines:
+        background_tasks.append(
+            asyncio.create_task(
+                replica_router.run(settings.postgres.replica_check_interval)
+            )
+        )
+    yield
+    for task in background_tasks:
+        task.cancel()
+    for task in background_tasks:
+        with contextlib.suppress(asyncio.CancelledError):
+            await task
+    await close_redis()
+
+
 app = FastAPI(
     title="Notification API",
     description="Notification service",
@@ -19,6 +52,13 @@ app = FastAPI(
     docs_url="/api/openapi",
     openapi_url="/api/openapi.json",
     default_response_class=ORJSONResponse,
+    lifespan=lifespan,
 )
 
+app.add_middleware(
+    ReadYourWritesMiddleware,
+    window=settings.postgres.read_your_writes_window,
+)
+app.add_middleware(PrometheusMiddleware)
+app.add_route("/metrics", metrics_endpoint, include_in_schema=False)
 app.include_router(api_router, prefix="/api")
@@ -2,21 +2,40 @@ import uuid
 from datetime import datetime
 from typing import Optional
 
-from sqlalchemy import Enum, Index, String, Text, func
-from sqlalchemy.dialects.postgresql import TIMESTAMP, UUID
+from sqlalchemy import Computed, Enum, Index, Integer, String, Text, func
+from sqlalchemy.dialects.postgresql import ARRAY, TIMESTAMP, TSVECTOR, UUID
 from sqlalchemy.orm import Mapped, mapped_column
 
 from src.core.db import Base
 from src.schemas.enums import NotificationCategory, ProcessingStatus
 
+# Полнотекстовый индекс по заголовку (вес A) и тексту (вес B).
+# Конфигурация simple не зависит от языка уведомлений.
+SEARCH_CONFIG = "simple"
+SEARCH_VECTOR_EXPRESSION = (
+    f"setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(title, '')), 'A')"
+    f" || setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(text, '')), 'B')"
+)
+
 
 class Notification(Base):
-    """Модель уведомлений."""
+    """
+    Модель уведомлений.
+    Таблица секционирована по месяцам created_at, поэтому created_at
+    входит в первичный ключ. Секции создаются и удаляются задачей
+    обслуживания секций. Уникальность id обеспечивает NotificationKey.
+    """
 
     __tablename__ = "notifications"
 
+    # id генерируется на клиенте и служит sentinel для insertmanyvalues:
+    # без него составной ключ с серверным created_at лишает
+    # INSERT ... RETURNING пакетной вставки.
     id: Mapped[uuid.UUID] = mapped_column(
-        UUID(as_uuid=True), primary_key=True, default=uuid.uuid4
+        UUID(as_uuid=True),
+        primary_key=True,
+        default=uuid.uuid4,
+        insert_sentinel=True,
     )
     user_id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True), nullable=False, index=True
@@ -24,7 +43,7 @@ class Notification(Base):
     title: Mapped[str] = mapped_column(String(256), nullable=False)
     text: Mapped[str] = mapped_column(Text, nullable=False)
     created_at: Mapped[datetime] = mapped_column(
-        TIMESTAMP(timezone=True), server_default=func.now()
+        TIMESTAMP(timezone=True), primary_key=True, server_default=func.now()
     )
     updated_at: Mapped[datetime] = mapped_column(
         TIMESTAMP(timezone=True),
@@ -41,6 +60,9 @@ class Notification(Base):
         index=True,
     )
     confidence: Mapped[Optional[float]] = mapped_column(nullable=True)
+    keywords: Mapped[list[str]] = mapped_column(
+        ARRAY(Text), nullable=False, default=list, server_default="{}"
+    )
 
     processing_status: Mapped[ProcessingStatus] = mapped_column(
         Enum(ProcessingStatus, name="notification_processing_status"),
@@ -48,6 +70,14 @@ class Notification(Base):
         nullable=False,
         index=True,
     )
+    version: Mapped[int] = mapped_column(
+        Integer, nullable=False, default=1, server_default="1"
+    )
+    search_vector: Mapped[str] = mapped_column(
+        TSVECTOR,
+        Computed(SEARCH_VECTOR_EXPRESSION, persisted=True),
+        deferred=True,
+    )
 
     __table_args__ = (
         Index(
@@ -56,4 +86,39 @@ class Notification(Base):
             "processing_status",
             "created_at",
         ),
+        Index("ix_notifications_created_id", "created_at", "id"),
+        Index(
+            "ix_notifications_user_created_id",
+            "user_id",
+            "created_at",
+            "id",
+        ),
+        Index(
+            "ix_notifications_search_vector",
+            "search_vector",
+            postgresql_using="gin",
+        ),
+        {"postgresql_partition_by": "RANGE (created_at)"},
+    )
+
+
+class NotificationKey(Base):
+    """
+    Ключи уведомлений: id -> created_at. Таблица секционирована по месяцам
+    created_at с теми же границами, что и notifications, и секция месяца
+    удаляется вместе с секцией уведомлений. Строки добавляются и
+    удаляются триггерами на notifications (миграции 9a4f1c6e3b27 и
+    c3b8e1f05d62); триггер вставки проверяет уникальность id по всем
+    секциям, поэтому вставка через ORM и COPY получает ошибку
+    уникальности при повторе id. По created_at из этой таблицы поиск
+    уведомления по id обращается к одной секции уведомлений.
+    """
+
+    __tablename__ = "notification_keys"
+
+    id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True)
+    created_at: Mapped[datetime] = mapped_column(
+        TIMESTAMP(timezone=True), primary_key=True
     )
+
+    __table_args__ = ({"postgresql_partition_by": "RANGE (created_at)"},)
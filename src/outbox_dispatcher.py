@@ -0,0 +1,114 @@
+import logging
+import signal
+import time
+from datetime import datetime, timedelta, timezone
+
+from celery import group
+
+from src.core.config import settings
+from src.core.db import get_sync_db_session
+from src.core.log_config import setup_logging
+from src.core.redis_client import get_sync_redis
+from src.repositories.counters_repo import CountersRepository
+from src.repositories.notification_repo import NotificationRepository
+from src.repositories.outbox_repo import OutboxRepository
+from src.tasks.task_analyze import analyze_notification
+
+logger = logging.getLogger(__name__)
+
+
+class OutboxDispatcher:
+    """
+    Диспетчер outbox: забирает пачки неотправленных записей, публикует
+    задачи AI анализа в брокер одной групповой публикацией и отмечает
+    записи отправленными в той же транзакции. Если брокер недоступен,
+    транзакция откатывается и пачка будет отправлена повторно.
+    Счетчики созданных уведомлений пользователей обновляются после
+    фиксации транзакции: пересчет счетчиков учитывает уведомления только
+    с отправленной записью outbox, и приращение с временем фиксации не
+    применяется к счетчикам, пересчитанным позже.
+    """
+
+    def __init__(
+        self,
+        batch_size: int | None = None,
+        poll_interval: float | None = None,
+    ):
+        self.batch_size = batch_size or settings.outbox.batch_size
+        self.poll_interval = poll_interval or settings.outbox.poll_interval
+        self.counters = CountersRepository(get_sync_redis())
+        self._running = False
+        self._last_purge = 0.0
+
+    def dispatch_batch(self) -> int:
+        """Отправляет одну пачку записей. Возвращает их количество."""
+        with get_sync_db_session() as session:
+            repo = OutboxRepository(session)
+            rows = repo.sync_claim(self.batch_size)
+            if not rows:
+                return 0
+            group(
+                analyze_notification.s(row.notification_id) for row in rows
+            ).apply_async()
+            repo.sync_mark_dispatched([row.id for row in rows])
+            session.commit()
+            committed_at = NotificationRepository(session).sync_clock()
+        self.counters.sync_on_created(rows, committed_at)
+        logger.info("Dispatched %d outbox rows", len(rows))
+        return len(rows)
+
+    def purge(self) -> None:
+        """Удаляет отправленные записи старше retention секунд."""
+        before = datetime.now(timezone.utc) - timedelta(
+            seconds=settings.outbox.retention
+        )
+        with get_sync_db_session() as session:
+            OutboxRepository(session).sync_purge_dispatched(before)
+        self._last_purge = time.monotonic()
+
+    def run_once(self) -> int:
+        """
+        Один цикл диспетчера: пачка записей, а при пустой очереди -
+        периодическая очистка отправленных записей.
+        """
+        dispatched = self.dispatch_batch()
+        if (
+            dispatched < self.batch_size
+            and time.monotonic() - self._last_purge
+            >= settings.outbox.purge_interval
+        ):
+            self.purge()
+        return dispatched
+
+    def run(self) -> None:
+        """
+        Основной цикл: пока очередь не пуста, пачки отправляются подряд,
+        иначе диспетчер ждет poll_interval секунд.
+        """
+        self._running = True
+        logger.info("Outbox dispatcher started")
+        while self._running:
+            try:
+                dispatched = self.run_once()
+            except Exception as ex:
+                logger.error("Outbox dispatch error: %s", ex)
+                dispatched = 0
+            if dispatched < self.batch_size:
+                time.sleep(self.poll_interval)
+        logger.info("Outbox dispatcher stopped")
+
+    def stop(self, *_) -> None:
+        """Останавливает основной цикл после текущей пачки."""
+        self._running = False
+
+
+def main() -> None:
+    setup_logging()
+    dispatcher = OutboxDispatcher()
+    signal.signal(signal.SIGTERM, dispatcher.stop)
+    signal.signal(signal.SIGINT, dispatcher.stop)
+    dispatcher.run()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,261 @@
+import logging
+import uuid
+from collections import Counter, defaultdict
+from typing import Iterable
+
+from redis import Redis as SyncRedis
+from redis.asyncio import Redis
+
+from src.schemas.enums import ProcessingStatus
+
+logger = logging.getLogger(__name__)
+
+# Поле хэша с временем БД, с которого начат пересчет счетчиков.
+REBUILT_AT = "rebuilt_at"
+
+# Приращения применяются, только если хэш счетчиков уже есть: HINCRBY по
+# отсутствующему ключу создал бы неполный хэш, и get() перестал бы
+# возвращать None, из-за чего пересчет по БД не выполнялся бы.
+# ARGV[1] - время фиксации изменения по часам БД (или пустая строка):
+# хэш, пересчитанный позже, уже учитывает изменение, и приращение
+# пропускается, иначе оно было бы учтено дважды.
+INCR_IF_EXISTS_SCRIPT = """
+if redis.call('EXISTS', KEYS[1]) == 0 then
+    return 0
+end
+if ARGV[1] ~= '' then
+    local rebuilt_at = redis.call('HGET', KEYS[1], 'rebuilt_at')
+    if rebuilt_at and tonumber(rebuilt_at) > tonumber(ARGV[1]) then
+        return 0
+    end
+end
+for i = 2, #ARGV, 2 do
+    redis.call('HINCRBY', KEYS[1], ARGV[i], ARGV[i + 1])
+end
+return 1
+"""
+
+
+class CountersRepository:
+    """
+    Счетчики уведомлений пользователя в Redis хэше counters:user:{id}.
+    Поля: total, unread, category:<категория> (непрочитанные по
+    категориям) и status:<статус обработки>. Счетчики обновляются
+    инкрементально и периодически пересчитываются из PostgreSQL.
+    Приращения к еще не рассчитанным счетчикам пропускаются: их
+    рассчитывает по БД первое чтение. Пересчет сохраняет время БД,
+    с которого он начат (rebuilt_at), а приращение с временем фиксации
+    committed_at не применяется к хэшу, пересчитанному после фиксации.
+    Асинхронные методы используются API, sync_ методы - Celery.
+    """
+
+    def __init__(self, redis: Redis | SyncRedis):
+        self.redis = redis
+        self.incr_if_exists = redis.register_script(INCR_IF_EXISTS_SCRIPT)
+
+    @staticmethod
+    def _key(user_id: uuid.UUID) -> str:
+        return f"counters:user:{user_id}"
+
+    @staticmethod
+    def _created_deltas(notifications: Iterable) -> dict[str, Counter]:
+        deltas: dict[str, Counter] = defaultdict(Counter)
+        for note in notifications:
+            fields = deltas[CountersRepository._key(note.user_id)]
+            fields["total"] += 1
+            fields["unread"] += 1
+            fields[f"status:{ProcessingStatus.PENDING.value}"] += 1
+        return deltas
+
+    @staticmethod
+    def _deleted_deltas(notifications: Iterable) -> dict[str, Counter]:
+        deltas: dict[str, Counter] = defaultdict(Counter)
+        for note in notifications:
+            fields = deltas[CountersRepository._key(note.user_id)]
+            fields["total"] -= 1
+            fields[f"status:{note.processing_status.value}"] -= 1
+            if note.read_at is None:
+                fields["unread"] -= 1
+                if note.category:
+                    fields[f"category:{note.category.value}"] -= 1
+        return deltas
+
+    @staticmethod
+    def _read_deltas(notifications: Iterable) -> dict[str, Counter]:
+        deltas: dict[str, Counter] = defaultdict(Counter)
+        for note in notifications:
+            fields = deltas[CountersRepository._key(note.user_id)]
+            fields["unread"] -= 1
+            if note.category:
+                fields[f"category:{note.category.value}"] -= 1
+        return deltas
+
+    @staticmethod
+    def _status_deltas(
+        notifications: Iterable, previous_status: ProcessingStatus
+    ) -> dict[str, Counter]:
+        deltas: dict[str, Counter] = defaultdict(Counter)
+        for note in notifications:
+            if note is None:
+                continue
+            fields = deltas[CountersRepository._key(note.user_id)]
+            fields[f"status:{previous_status.value}"] -= 1
+            fields[f"status:{note.processing_status.value}"] += 1
+            if (
+                note.processing_status == ProcessingStatus.COMPLETED
+                and note.category
+                and note.read_at is None
+            ):
+                fields[f"category:{note.category.value}"] += 1
+        return deltas
+
+    @staticmethod
+    def from_grouped_rows(rows: Iterable) -> dict[uuid.UUID, dict[str, int]]:
+        """
+        Собирает счетчики из строк (user_id, processing_status, category,
+        unread, count), сгруппированных в PostgreSQL.
+        """
+        counters: dict[uuid.UUID, Counter] = defaultdict(Counter)
+        for user_id, status, category, unread, count in rows:
+            fields = counters[user_id]
+            fields["total"] += count
+            fields[f"status:{status.value}"] += count
+            if unread:
+                fields["unread"] += count
+                if category:
+                    fields[f"category:{category.value}"] += count
+        return {user_id: dict(fields) for user_id, fields in counters.items()}
+
+    @staticmethod
+    def _incr_args(
+        deltas: dict[str, Counter], committed_at: float | None
+    ) -> Iterable[tuple[str, list]]:
+        """
+        Пары (ключ, [время фиксации, поле, приращение, ...]) с ненулевыми
+        приращениями.
+        """
+        stamp = "" if committed_at is None else repr(committed_at)
+        for key, fields in deltas.items():
+            args = []
+            for field, delta in fields.items():
+                if delta:
+                    args += [field, delta]
+            if args:
+                yield key, [stamp, *args]
+
+    async def _apply(
+        self, deltas: dict[str, Counter], committed_at: float | None = None
+    ) -> None:
+        if not deltas:
+            return
+        try:
+            async with self.redis.pipeline(transaction=False) as pipe:
+                for key, args in self._incr_args(deltas, committed_at):
+                    await self.incr_if_exists(
+                        keys=[key], args=args, client=pipe
+                    )
+                await pipe.execute()
+        except Exception as ex:
+            logger.error("Error updating counters: %s", ex)
+
+    def _sync_apply(
+        self, deltas: dict[str, Counter], committed_at: float | None = None
+    ) -> None:
+        if not deltas:
+            return
+        try:
+            with self.redis.pipeline(transaction=False) as pipe:
+                for key, args in self._incr_args(deltas, committed_at):
+                    self.incr_if_exists(keys=[key], args=args, client=pipe)
+                pipe.execute()
+        except Exception as ex:
+            logger.error("Error updating counters: %s", ex)
+
+    async def get(self, user_id: uuid.UUID) -> dict[str, int] | None:
+        """Возвращает счетчики пользователя или None, если их нет."""
+        try:
+            data = await self.redis.hgetall(self._key(user_id))
+        except Exception as ex:
+            logger.error("Error retrieving counters: %s", ex)
+            return None
+        if not data:
+            return None
+        data.pop(REBUILT_AT.encode(), None)
+        return {field.decode(): int(value) for field, value in data.items()}
+
+    async def on_read(self, notifications: Iterable) -> None:
+        """Учитывает уведомления, впервые отмеченные прочитанными."""
+        await self._apply(self._read_deltas(notifications))
+
+    async def set(
+        self,
+        user_id: uuid.UUID,
+        counters: dict[str, int],
+        rebuilt_at: float,
+    ) -> None:
+        """
+        Перезаписывает счетчики пользователя, пересчитанные по БД
+        начиная с времени БД rebuilt_at.
+        """
+        key = self._key(user_id)
+        try:
+            async with self.redis.pipeline(transaction=True) as pipe:
+                pipe.delete(key)
+                pipe.hset(
+                    key, mapping={**counters, REBUILT_AT: repr(rebuilt_at)}
+                )
+                await pipe.execute()
+        except Exception as ex:
+            logger.error("Error storing counters: %s", ex)
+
+    def sync_on_created(
+        self, notifications: Iterable, committed_at: float | None = None
+    ) -> None:
+        """
+        Учитывает созданные уведомления. committed_at - время БД после
+        фиксации, с которой уведомления учитываются пересчетом.
+        """
+        self._sync_apply(self._created_deltas(notifications), committed_at)
+
+    def sync_on_deleted(
+        self, notifications: Iterable, committed_at: float | None = None
+    ) -> None:
+        """Учитывает удаленные (заархивированные) уведомления."""
+        self._sync_apply(self._deleted_deltas(notifications), committed_at)
+
+    def sync_on_dropped(
+        self, rows: Iterable, committed_at: float | None = None
+    ) -> None:
+        """
+        Учитывает удаленную секцию уведомлений по строкам (user_id,
+        processing_status, category, unread, count), сгруппированным
+        в PostgreSQL.
+        """
+        deltas: dict[str, Counter] = defaultdict(Counter)
+        for user_id, fields in self.from_grouped_rows(rows).items():
+            deltas[self._key(user_id)].subtract(fields)
+        self._sync_apply(deltas, committed_at)
+
+    def sync_on_status_changed(
+        self, notifications: Iterable, previous_status: ProcessingStatus
+    ) -> None:
+        """Учитывает смену статуса обработки уведомлений."""
+        self._sync_apply(self._status_deltas(notifications, previous_status))
+
+    def sync_set_many(
+        self,
+        counters_by_user: dict[uuid.UUID, dict[str, int]],
+        rebuilt_at: float,
+    ) -> None:
+        """
+        Перезаписывает счетчики нескольких пользователей, пересчитанные
+        по БД начиная с времени БД rebuilt_at.
+        """
+        with self.redis.pipeline(transaction=True) as pipe:
+            for user_id, counters in counters_by_user.items():
+                key = self._key(user_id)
+                pipe.delete(key)
+                pipe.hset(
+                    key, mapping={**counters, REBUILT_AT: repr(rebuilt_at)}
+                )
+            pipe.execute()
@@ -1,8 +1,29 @@
+import csv
+import io
 import logging
 import uuid
 from contextlib import asynccontextmanager
+from dataclasses import fields
+from datetime import datetime
+from typing import AsyncIterator, Iterable, List
 
-from sqlalchemy import select, update
+from sqlalchemy import (
+    Float,
+    Row,
+    any_,
+    bindparam,
+    cast,
+    column,
+    delete,
+    func,
+    insert,
+    literal_column,
+    select,
+    tuple_,
+    update,
+    values,
+)
+from sqlalchemy.dialects.postgresql import ARRAY, UUID
 from sqlalchemy.exc import (
     DataError,
     IntegrityError,
@@ -11,28 +32,107 @@ from sqlalchemy.exc import (
 )
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
+from sqlalchemy.sql import FromClause
 
-from src.core.cache import CacheManager
+from src.core.cache import CacheManager, SyncCacheManager
 from src.core.exceptions import (
     NotificationRepositoryError,
 )
-from src.models.notification import Notification
-from src.schemas.filters import NotificationFilter
+from src.core.pagination import decode_cursor, decode_rank_cursor
+from src.core.routing import RoutingSession, primary_reads
+from src.models.notification import (
+    SEARCH_CONFIG,
+    Notification,
+    NotificationKey,
+)
+from src.models.outbox import NotificationOutbox
+from src.schemas.enums import NotificationCategory, ProcessingStatus
+from src.schemas.filters import (
+    NotificationExport,
+    NotificationFilter,
+    NotificationSearch,
+)
+from src.schemas.notifications import NotificationDTO
 
 logger = logging.getLogger(__name__)
 
+# Колонки таблицы в порядке полей NotificationDTO: строки Core запросов
+# распаковываются в DTO позиционно, без ORM и identity map.
+DTO_COLUMNS = tuple(
+    Notification.__table__.c[f.name] for f in fields(NotificationDTO)
+)
+# Колонки, которые заполняет массовая загрузка через COPY; остальные
+# получают значения по умолчанию сервера.
+COPY_COLUMNS = (
+    "id",
+    "user_id",
+    "title",
+    "text",
+    "created_at",
+    "updated_at",
+    "processing_status",
+)
+
+# clock_timestamp, а не now(): время начала транзакции раньше фиксации.
+CLOCK_QUERY = select(func.extract("epoch", func.clock_timestamp()))
+
+
+def key_filter(notific_id, created_at=None) -> tuple:
+    """
+    Условия поиска уведомления по id. Без известного created_at он
+    берется из notification_keys скалярным подзапросом, и планировщик
+    отсекает остальные секции при выполнении.
+    """
+    if created_at is None:
+        created_at = (
+            select(NotificationKey.created_at)
+            .where(NotificationKey.id == notific_id)
+            .scalar_subquery()
+        )
+    return Notification.id == notific_id, Notification.created_at == created_at
+
+
+# Запросы по id строятся один раз; SQLAlchemy кэширует их компиляцию.
+GET_BY_ID_QUERY = select(*DTO_COLUMNS).where(
+    *key_filter(bindparam("notific_id"))
+)
+GET_BY_KEY_QUERY = select(*DTO_COLUMNS).where(
+    *key_filter(bindparam("notific_id"), bindparam("created_at"))
+)
+
 
 class NotificationRepository:
     """
     Репозиторий для работы с уведомлениями в базе данных.
     Предоставляет методы для создания, получения и обновления уведомлений
     с поддержкой фильтрации и пагинации.
+    Каждое обновление увеличивает версию строки, а сохраненная строка
+    записывается в кэш (write-through) без перезаписи более новых версий.
     """
 
-    def __init__(self, session: AsyncSession | Session):
-        """Инициализация репозитория с асинхронной сессией."""
+    CACHE_TTL = 100
+    READ_CHUNK_SIZE = 1000
+
+    def __init__(
+        self,
+        session: AsyncSession | Session,
+        cache: CacheManager | SyncCacheManager | None = None,
+    ):
+        """
+        Инициализация репозитория с сессией БД.
+        Асинхронные методы используют CacheManager, синхронные методы
+        для Celery - SyncCacheManager. Без кэша репозиторий работает
+        только с БД.
+        """
         self.session = session
-        self.cache = CacheManager()
+        self.cache = cache
+
+    @staticmethod
+    def _cache_key(notific_id: uuid.UUID) -> str:
+        return f"notification:{notific_id}"
+
+    def _cache_values(self, notifications: List[Notification]) -> dict:
+        return {self._cache_key(note.id): note for note in notifications}
 
     @asynccontextmanager
     async def _transaction_handler(self, error_message: str):
@@ -59,14 +159,50 @@ class NotificationRepository:
                 "Unexpected repository error"
             ) from exc
 
+    @staticmethod
+    def _outbox_values(notifications: List[Notification]) -> List[dict]:
+        return [
+            {"notification_id": note.id, "user_id": note.user_id}
+            for note in notifications
+        ]
+
     async def create(self, notification: Notification) -> Notification:
-        """Создает новое уведомление в базе данных."""
+        """
+        Создает новое уведомление в базе данных вместе с записью outbox
+        для его AI анализа в одной транзакции.
+        """
         async with self._transaction_handler("Failed create notification"):
             self.session.add(notification)
+            await self.session.flush()
+            await self.session.execute(
+                insert(NotificationOutbox),
+                self._outbox_values([notification]),
+            )
         await self.session.refresh(notification)
         logger.info("Created notification %s", notification.id)
         return notification
 
+    async def create_many(self, values: list[dict]) -> list[Notification]:
+        """
+        Создает пачку уведомлений одним multi-row INSERT ... RETURNING
+        и записи outbox для их AI анализа в той же транзакции.
+        Порядок результата совпадает с порядком входных данных.
+        """
+        async with self._transaction_handler("Failed create notifications"):
+            result = await self.session.scalars(
+                insert(Notification).returning(
+                    Notification, sort_by_parameter_order=True
+                ),
+                values,
+            )
+            notifications = list(result.all())
+            await self.session.execute(
+                insert(NotificationOutbox),
+                self._outbox_values(notifications),
+            )
+        logger.info("Created %d notifications", len(notifications))
+        return notifications
+
     async def update(
         self,
         notification_id: uuid.UUID,
@@ -75,40 +211,193 @@ class NotificationRepository:
         async with self._transaction_handler("Failed read notification"):
             result = await self.session.execute(
                 update(Notification)
-                .where(Notification.id == notification_id)
-                .values(**update_data)
+                .where(*key_filter(notification_id))
+                .values(**update_data, version=Notification.version + 1)
                 .returning(Notification)
             )
-            cache_key = f"notification:{notification_id}"
-            await self.cache.delete(cache_key)
-        return result.scalar_one_or_none()
+            notification = result.scalar_one_or_none()
+        if notification and self.cache:
+            await self.cache.write_through(
+                self._cache_values([notification]), self.CACHE_TTL
+            )
+        return notification
 
-    async def get_by_id(self, notific_id: uuid.UUID) -> Notification | None:
-        """Получает уведомление по идентификатору."""
-        cache_key = f"notification:{notific_id}"
-        cached_data = await self.cache.get(cache_key)
-        if cached_data:
-            return cached_data
-        try:
+    async def mark_as_read(
+        self, notification_id: uuid.UUID
+    ) -> Notification | None:
+        """
+        Отмечает уведомление как прочитанное, если оно еще не прочитано.
+        Возвращает None, если уведомление не найдено или уже прочитано.
+        """
+        async with self._transaction_handler("Failed mark notification"):
+            result = await self.session.execute(
+                update(Notification)
+                .where(
+                    *key_filter(notification_id),
+                    Notification.read_at.is_(None),
+                )
+                .values(read_at=func.now(), version=Notification.version + 1)
+                .returning(Notification)
+            )
+            notification = result.scalar_one_or_none()
+        if notification and self.cache:
+            await self.cache.write_through(
+                self._cache_values([notification]), self.CACHE_TTL
+            )
+        return notification
+
+    async def mark_many_as_read(
+        self,
+        ids: List[uuid.UUID] | None = None,
+        user_id: uuid.UUID | None = None,
+        category: NotificationCategory | None = None,
+        created_before: datetime | None = None,
+        chunk_size: int | None = None,
+    ) -> AsyncIterator[List[NotificationDTO]]:
+        """
+        Отмечает непрочитанные уведомления как прочитанные пачками по
+        chunk_size, каждую в своей транзакции, и отдает отмеченные
+        уведомления пачки. Пачки выбираются по ключу (created_at, id) с
+        блокировкой строк; обновленные строки записываются в кэш
+        (write-through), версии не дают загрузкам вернуть в кэш строки
+        до отметки. В памяти одновременно находится одна пачка.
+        """
+        chunk_size = chunk_size or self.READ_CHUNK_SIZE
+        keys = (
+            select(Notification.created_at, Notification.id)
+            .where(Notification.read_at.is_(None))
+            .order_by(Notification.created_at, Notification.id)
+            .limit(chunk_size)
+            .with_for_update()
+        )
+        if ids is not None:
+            keys = keys.where(Notification.id.in_(ids))
+        if user_id:
+            keys = keys.where(Notification.user_id == user_id)
+        if category:
+            keys = keys.where(Notification.category == category)
+        if created_before:
+            keys = keys.where(Notification.created_at < created_before)
+
+        after = None
+        while True:
+            query = keys
+            if after:
+                query = query.where(
+                    Notification.created_at >= after[0],
+                    tuple_(Notification.created_at, Notification.id)
+                    > tuple_(*after),
+                )
+            chunk, notifications = await self._mark_chunk_as_read(query)
+            if notifications:
+                if self.cache:
+                    await self.cache.write_through(
+                        self._cache_values(notifications), self.CACHE_TTL
+                    )
+                logger.info(
+                    "Marked %d notifications as read", len(notifications)
+                )
+                yield notifications
+            if len(chunk) < chunk_size:
+                return
+            after = (chunk[-1].created_at, chunk[-1].id)
+
+    async def _mark_chunk_as_read(
+        self, keys
+    ) -> tuple[List[Row], List[NotificationDTO]]:
+        """
+        Блокирует пачку строк по запросу ключей (created_at, id) и
+        отмечает непрочитанные из них одним UPDATE в одной транзакции.
+        Диапазон created_at пачки ограничивает UPDATE нужными секциями.
+        """
+        table = Notification.__table__
+        async with self._transaction_handler("Failed mark notifications"):
+            chunk = list((await self.session.execute(keys)).all())
+            if not chunk:
+                return chunk, []
             result = await self.session.execute(
-                select(Notification).where(Notification.id == notific_id)
+                update(table)
+                .where(
+                    table.c.created_at >= chunk[0].created_at,
+                    table.c.created_at <= chunk[-1].created_at,
+                    tuple_(table.c.id, table.c.created_at).in_(
+                        [(row.id, row.created_at) for row in chunk]
+                    ),
+                    table.c.read_at.is_(None),
+                )
+                .values(read_at=func.now(), version=table.c.version + 1)
+                .returning(*DTO_COLUMNS)
             )
+            notifications = [NotificationDTO(*row) for row in result]
+        return chunk, notifications
+
+    async def release(self) -> None:
+        """
+        Завершает транзакцию сессии и возвращает соединение в пул.
+        Используется перед долгими потоковыми ответами.
+        """
+        await self.session.close()
+
+    async def get_by_id(
+        self, notific_id: uuid.UUID, created_at: datetime | None = None
+    ) -> NotificationDTO | None:
+        """
+        Получает уведомление по идентификатору.
+        Известный вызывающему created_at сразу ограничивает поиск его
+        секцией, без обращения к notification_keys.
+        Промах на реплике перепроверяется на основном сервере: реплика
+        могла еще не получить только что созданное уведомление.
+        Конкурентные промахи кэша по одному уведомлению объединяются
+        в одну загрузку из БД.
+        """
+        if not self.cache:
+            return await self._load_by_id(notific_id, created_at)
+        return await self.cache.get_or_load(
+            self._cache_key(notific_id),
+            lambda: self._load_by_id(notific_id, created_at),
+            ttl=self.CACHE_TTL,
+        )
+
+    async def _load_by_id(
+        self, notific_id: uuid.UUID, created_at: datetime | None = None
+    ) -> NotificationDTO | None:
+        if created_at is None:
+            query = GET_BY_ID_QUERY
+            params = {"notific_id": notific_id}
+        else:
+            query = GET_BY_KEY_QUERY
+            params = {"notific_id": notific_id, "created_at": created_at}
+        try:
+            row = (await self.session.execute(query, params)).one_or_none()
+            if row is None and self._reads_from_replica():
+                with primary_reads():
+                    result = await self.session.execute(query, params)
+                row = result.one_or_none()
         except SQLAlchemyError as exc:
             logger.error("Failed to get note %s: %s", notific_id, exc)
             raise NotificationRepositoryError("Fail get note") from exc
+        return NotificationDTO(*row) if row else None
 
-        notification = result.scalar_one_or_none()
-        if notification:
-            await self.cache.set(cache_key, notification, ttl=100)
-        return notification
+    def _reads_from_replica(self) -> bool:
+        session = getattr(self.session, "sync_session", self.session)
+        return (
+            isinstance(session, RoutingSession)
+            and session.reads_from_replica()
+        )
 
-    async def list(
-        self,
-        filters: NotificationFilter,
-    ) -> list[Notification]:
-        """Получает список уведомлений с фильтрацией и пагинацией."""
-        query = select(Notification)
+    @staticmethod
+    def _created_range(query, filters):
+        # Условия по created_at отсекают секции вне диапазона.
+        if filters.created_from:
+            query = query.where(
+                Notification.created_at >= filters.created_from
+            )
+        if filters.created_to:
+            query = query.where(Notification.created_at < filters.created_to)
+        return query
 
+    @classmethod
+    def _filtered(cls, query, filters):
         if filters.user_id:
             query = query.where(Notification.user_id == filters.user_id)
         if filters.category:
@@ -117,14 +406,271 @@ class NotificationRepository:
             query = query.where(
                 Notification.processing_status == filters.processing_status
             )
+        return cls._created_range(query, filters)
+
+    async def list(
+        self,
+        filters: NotificationFilter,
+    ) -> List[NotificationDTO]:
+        """
+        Получает список уведомлений с фильтрацией и пагинацией.
+        Уведомления упорядочены от новых к старым по (created_at, id);
+        при наличии курсора используется keyset-пагинация вместо OFFSET.
+        Строки Core запроса отображаются в NotificationDTO без ORM.
+        """
+        query = self._filtered(select(*DTO_COLUMNS), filters)
+
+        if filters.cursor:
+            created_at, notific_id = decode_cursor(filters.cursor)
+            # Отдельное условие по created_at позволяет планировщику
+            # отсечь секции новее курсора.
+            query = query.where(
+                Notification.created_at <= created_at,
+                tuple_(Notification.created_at, Notification.id)
+                < tuple_(created_at, notific_id),
+            )
+        else:
+            query = query.offset(filters.offset)
 
-        query = query.offset(filters.offset).limit(filters.limit)
+        query = query.order_by(
+            Notification.created_at.desc(), Notification.id.desc()
+        ).limit(filters.limit)
         result = await self.session.execute(query)
-        return result.scalars().all()
+        return [NotificationDTO(*row) for row in result]
+
+    async def stream(
+        self, filters: NotificationExport, chunk_size: int
+    ) -> AsyncIterator[List[NotificationDTO]]:
+        """
+        Потоково читает уведомления по фильтрам в порядке (created_at, id)
+        через серверный курсор, отдавая пачки по chunk_size DTO.
+        В памяти одновременно находится не больше одной пачки.
+        """
+        query = (
+            self._filtered(select(*DTO_COLUMNS), filters)
+            .order_by(Notification.created_at, Notification.id)
+            .execution_options(yield_per=chunk_size)
+        )
+        result = await self.session.stream(query)
+        try:
+            async for rows in result.partitions():
+                yield [NotificationDTO(*row) for row in rows]
+        finally:
+            await result.close()
+
+    async def search(self, filters: NotificationSearch) -> List[Row]:
+        """
+        Полнотекстовый поиск по заголовку и тексту через GIN индекс
+        search_vector. Результаты упорядочены по релевантности ts_rank,
+        затем по id; при наличии курсора используется keyset-пагинация.
+        Возвращает строки с колонками NotificationDTO и rank.
+        """
+        ts_query = func.websearch_to_tsquery(
+            literal_column(f"'{SEARCH_CONFIG}'::regconfig"), filters.q
+        )
+        rank = func.ts_rank(Notification.search_vector, ts_query)
+        query = select(*DTO_COLUMNS, rank.label("rank")).where(
+            Notification.search_vector.bool_op("@@")(ts_query)
+        )
+        if filters.user_id:
+            query = query.where(Notification.user_id == filters.user_id)
+        query = self._created_range(query, filters)
+        if filters.cursor:
+            last_rank, notific_id = decode_rank_cursor(filters.cursor)
+            query = query.where(
+                tuple_(rank, Notification.id) < tuple_(last_rank, notific_id)
+            )
+        query = query.order_by(rank.desc(), Notification.id.desc()).limit(
+            filters.limit
+        )
+        result = await self.session.execute(query)
+        return list(result.all())
+
+    @staticmethod
+    def _counts_query(*criteria, table: FromClause = Notification.__table__):
+        # Уведомления с неотправленной записью outbox не считаются: их
+        # приращение счетчиков применит диспетчер outbox после фиксации.
+        unread = table.c.read_at.is_(None).label("unread")
+        pending_outbox = select(NotificationOutbox.id).where(
+            NotificationOutbox.notification_id == table.c.id,
+            NotificationOutbox.dispatched_at.is_(None),
+        )
+        return (
+            select(
+                table.c.user_id,
+                table.c.processing_status,
+                table.c.category,
+                unread,
+                func.count(),
+            )
+            .where(*criteria, ~pending_outbox.exists())
+            .group_by(
+                table.c.user_id,
+                table.c.processing_status,
+                table.c.category,
+                unread,
+            )
+        )
+
+    async def clock(self) -> float:
+        """
+        Текущее время сервера БД (epoch секунды). Отметки пересчета и
+        фиксации счетчиков берутся по одним часам основного сервера.
+        """
+        return float(await self.session.scalar(CLOCK_QUERY))
+
+    def sync_clock(self) -> float:
+        """Синхронный вариант clock."""
+        return float(self.session.scalar(CLOCK_QUERY))
+
+    async def count_by_users(self, user_ids: List[uuid.UUID]) -> List[Row]:
+        """
+        Считает уведомления пользователей в разрезе статуса обработки,
+        категории и прочтения. Уведомления, еще не отправленные
+        диспетчером outbox, не учитываются.
+        """
+        try:
+            result = await self.session.execute(
+                self._counts_query(Notification.user_id.in_(user_ids))
+            )
+        except SQLAlchemyError as exc:
+            logger.error("Failed to count notes: %s", exc)
+            raise NotificationRepositoryError("Fail count notes") from exc
+        return list(result.all())
+
+    def sync_count_by_users(self, user_ids: List[uuid.UUID]) -> List[Row]:
+        """Синхронный вариант count_by_users."""
+        return list(
+            self.session.execute(
+                self._counts_query(Notification.user_id.in_(user_ids))
+            ).all()
+        )
+
+    def sync_count_detached(self, table: FromClause) -> List[Row]:
+        """
+        Считает уведомления отсоединенной секции table в разрезе
+        пользователя, статуса обработки, категории и прочтения.
+        """
+        return list(
+            self.session.execute(self._counts_query(table=table)).all()
+        )
+
+    def sync_user_ids_after(
+        self, last_user_id: uuid.UUID | None, limit: int
+    ) -> List[uuid.UUID]:
+        """Возвращает следующую страницу идентификаторов пользователей."""
+        query = select(Notification.user_id).group_by(Notification.user_id)
+        if last_user_id:
+            query = query.where(Notification.user_id > last_user_id)
+        query = query.order_by(Notification.user_id).limit(limit)
+        return list(self.session.scalars(query).all())
+
+    def sync_archivable_chunk(
+        self,
+        read_before: datetime,
+        after: tuple[datetime, uuid.UUID] | None,
+        limit: int,
+    ) -> List[Row]:
+        """
+        Возвращает следующую пачку обработанных уведомлений, прочитанных
+        раньше read_before, в порядке (created_at, id) после позиции after.
+        Строки содержат все колонки, кроме search_vector.
+        """
+        columns = [
+            c for c in Notification.__table__.c if c.key != "search_vector"
+        ]
+        query = select(*columns).where(
+            Notification.processing_status == ProcessingStatus.COMPLETED,
+            Notification.read_at < read_before,
+        )
+        if after:
+            created_at, notific_id = after
+            query = query.where(
+                Notification.created_at >= created_at,
+                tuple_(Notification.created_at, Notification.id)
+                > tuple_(created_at, notific_id),
+            )
+        query = query.order_by(Notification.created_at, Notification.id).limit(
+            limit
+        )
+        return list(self.session.execute(query).all())
+
+    def sync_delete_many(self, rows: List[Row]) -> set[uuid.UUID]:
+        """
+        Удаляет уведомления по (id, created_at) без фиксации транзакции.
+        Диапазон created_at пачки ограничивает удаление нужными секциями.
+        Возвращает id действительно удаленных строк: уведомления, удаленные
+        конкурентно, в него не входят.
+        """
+        result = self.session.execute(
+            delete(Notification)
+            .where(
+                Notification.created_at >= rows[0].created_at,
+                Notification.created_at <= rows[-1].created_at,
+                tuple_(Notification.id, Notification.created_at).in_(
+                    [(row.id, row.created_at) for row in rows]
+                ),
+            )
+            .returning(Notification.id)
+            .execution_options(synchronize_session=False)
+        )
+        return set(result.scalars())
+
+    def sync_invalidate(self, notific_ids: Iterable[uuid.UUID]) -> None:
+        """
+        Заменяет кэш удаленных уведомлений надгробиями и сбрасывает
+        их локальные копии на всех репликах.
+        """
+        if self.cache:
+            self.cache.delete_many(
+                [self._cache_key(notific_id) for notific_id in notific_ids]
+            )
+
+    @staticmethod
+    def copy_buffer(rows: Iterable[tuple]) -> io.StringIO:
+        """
+        Кодирует строки со значениями COPY_COLUMNS в CSV для sync_copy.
+        Все значения передаются в кавычках, поэтому пустая строка
+        не превращается в NULL.
+        """
+        buffer = io.StringIO()
+        csv.writer(buffer, quoting=csv.QUOTE_ALL).writerows(rows)
+        buffer.seek(0)
+        return buffer
+
+    def sync_copy(self, buffer: io.StringIO) -> None:
+        """
+        Загружает строки из copy_buffer одной командой COPY в текущей
+        транзакции.
+        """
+        cursor = self.session.connection().connection.cursor()
+        try:
+            cursor.copy_expert(
+                f"COPY {Notification.__tablename__} "
+                f"({', '.join(COPY_COLUMNS)}) FROM STDIN WITH (FORMAT csv)",
+                buffer,
+            )
+        finally:
+            cursor.close()
+
+    def sync_existing_ids(self, ids: List[uuid.UUID]) -> set[uuid.UUID]:
+        """
+        Возвращает id из ids, уже занятые уведомлениями. Список
+        передается одним параметром-массивом, а не IN со значением на
+        каждый id.
+        """
+        ids_param = bindparam("ids", ids, type_=ARRAY(UUID(as_uuid=True)))
+        return set(
+            self.session.scalars(
+                select(NotificationKey.id).where(
+                    NotificationKey.id == any_(ids_param)
+                )
+            )
+        )
 
     def sync_get_by_id(self, notific_id) -> Notification | None:
         result = self.session.execute(
-            select(Notification).where(Notification.id == notific_id)
+            select(Notification).where(*key_filter(notific_id))
         )
         return result.scalars().one_or_none()
 
@@ -135,9 +681,188 @@ class NotificationRepository:
     ) -> Notification | None:
         result = self.session.execute(
             update(Notification)
-            .where(Notification.id == notification_id)
-            .values(**update_data)
+            .where(*key_filter(notification_id))
+            .values(**update_data, version=Notification.version + 1)
+            .returning(Notification)
+        )
+        notification = result.scalar_one_or_none()
+        self.session.commit()
+        if notification and self.cache:
+            self.cache.write_through(
+                self._cache_values([notification]), self.CACHE_TTL
+            )
+        return notification
+
+    def sync_update_if_status(
+        self,
+        notification_id: uuid.UUID,
+        expected_status: ProcessingStatus,
+        update_data: dict,
+        created_at: datetime | None = None,
+    ) -> Notification | None:
+        """
+        Атомарно обновляет уведомление, только если оно находится в статусе
+        expected_status: UPDATE ... WHERE id = :id AND processing_status =
+        :expected RETURNING. Известный created_at ограничивает UPDATE
+        секцией уведомления. Возвращает None, если уведомление не найдено
+        или его статус уже изменен другим воркером.
+        """
+        result = self.session.execute(
+            update(Notification)
+            .where(
+                *key_filter(notification_id, created_at),
+                Notification.processing_status == expected_status,
+            )
+            .values(
+                **update_data,
+                version=Notification.version + 1,
+                updated_at=func.now(),
+            )
+            .returning(Notification)
+            .execution_options(
+                synchronize_session=False, populate_existing=True
+            )
+        )
+        notification = result.scalar_one_or_none()
+        self.session.commit()
+        if notification and self.cache:
+            self.cache.write_through(
+                self._cache_values([notification]), self.CACHE_TTL
+            )
+        return notification
+
+    def sync_claim_pending(self, limit: int) -> List[Notification]:
+        """
+        Захватывает до limit уведомлений в статусе PENDING и одним
+        запросом переводит их в PROCESSING. Строки, заблокированные
+        другими воркерами, пропускаются (FOR UPDATE SKIP LOCKED).
+        updated_at отмечает время захвата для sync_requeue_stale.
+        """
+        pending_ids = (
+            select(Notification.id)
+            .where(Notification.processing_status == ProcessingStatus.PENDING)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        result = self.session.execute(
+            update(Notification)
+            .where(Notification.id.in_(pending_ids.scalar_subquery()))
+            .values(
+                processing_status=ProcessingStatus.PROCESSING,
+                version=Notification.version + 1,
+                updated_at=func.now(),
+            )
+            .returning(Notification)
+            .execution_options(
+                synchronize_session=False, populate_existing=True
+            )
+        )
+        notifications = list(result.scalars().all())
+        self.session.commit()
+        if self.cache:
+            self.cache.write_through(
+                self._cache_values(notifications), self.CACHE_TTL
+            )
+        return notifications
+
+    def sync_requeue_stale(
+        self, claimed_before: datetime, limit: int
+    ) -> List[Notification]:
+        """
+        Возвращает в PENDING до limit уведомлений, захваченных в
+        PROCESSING раньше claimed_before: воркер, захвативший их, упал
+        между захватом и записью результата, а повторная доставка
+        задачи пропускает уведомления не в статусе PENDING.
+        """
+        stale_ids = (
+            select(Notification.id)
+            .where(
+                Notification.processing_status == ProcessingStatus.PROCESSING,
+                Notification.updated_at < claimed_before,
+            )
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        result = self.session.execute(
+            update(Notification)
+            .where(
+                Notification.id.in_(stale_ids.scalar_subquery()),
+                Notification.processing_status == ProcessingStatus.PROCESSING,
+            )
+            .values(
+                processing_status=ProcessingStatus.PENDING,
+                version=Notification.version + 1,
+                updated_at=func.now(),
+            )
+            .returning(Notification)
+            .execution_options(
+                synchronize_session=False, populate_existing=True
+            )
+        )
+        notifications = list(result.scalars().all())
+        self.session.commit()
+        if self.cache:
+            self.cache.write_through(
+                self._cache_values(notifications), self.CACHE_TTL
+            )
+        return notifications
+
+    def sync_bulk_update_results(
+        self, results: List[dict]
+    ) -> List[Notification]:
+        """
+        Записывает результаты анализа пачки уведомлений одним
+        UPDATE ... FROM (VALUES ...).
+        Каждый элемент results содержит id, category, confidence,
+        keywords и processing_status. Обновляются только уведомления,
+        оставшиеся в PROCESSING (не возвращенные в очередь
+        sync_requeue_stale). Возвращает обновленные уведомления.
+        """
+        category_type = Notification.category.type
+        status_type = Notification.processing_status.type
+        keywords_type = Notification.keywords.type
+        rows = values(
+            column("id", UUID(as_uuid=True)),
+            column("category", category_type),
+            column("confidence", Float),
+            column("keywords", keywords_type),
+            column("processing_status", status_type),
+            name="results",
+        ).data(
+            [
+                (
+                    item["id"],
+                    item["category"],
+                    item["confidence"],
+                    item["keywords"],
+                    item["processing_status"],
+                )
+                for item in results
+            ]
+        )
+        result = self.session.execute(
+            update(Notification)
+            .where(
+                Notification.id == rows.c.id,
+                Notification.processing_status == ProcessingStatus.PROCESSING,
+            )
+            .values(
+                category=cast(rows.c.category, category_type),
+                confidence=cast(rows.c.confidence, Float),
+                keywords=cast(rows.c.keywords, keywords_type),
+                processing_status=cast(rows.c.processing_status, status_type),
+                version=Notification.version + 1,
+                updated_at=func.now(),
+            )
             .returning(Notification)
+            .execution_options(
+                synchronize_session=False, populate_existing=True
+            )
         )
+        notifications = list(result.scalars().all())
         self.session.commit()
-        return result.scalar_one_or_none()
+        if self.cache:
+            self.cache.write_through(
+                self._cache_values(notifications), self.CACHE_TTL
+            )
+        return notifications
@@ -0,0 +1,57 @@
+import logging
+from datetime import datetime
+from typing import List
+
+from sqlalchemy import Row, delete, func, select, update
+from sqlalchemy.orm import Session
+
+from src.models.outbox import NotificationOutbox
+
+logger = logging.getLogger(__name__)
+
+
+class OutboxRepository:
+    """
+    Репозиторий записей outbox для диспетчера задач AI анализа.
+    Работает в синхронной сессии, транзакцией управляет вызывающий код.
+    """
+
+    def __init__(self, session: Session):
+        self.session = session
+
+    def sync_claim(self, limit: int) -> List[Row]:
+        """
+        Блокирует пачку неотправленных записей. Записи, заблокированные
+        другими диспетчерами, пропускаются (FOR UPDATE SKIP LOCKED).
+        Возвращает строки (id, notification_id, user_id).
+        """
+        query = (
+            select(
+                NotificationOutbox.id,
+                NotificationOutbox.notification_id,
+                NotificationOutbox.user_id,
+            )
+            .where(NotificationOutbox.dispatched_at.is_(None))
+            .order_by(NotificationOutbox.id)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        return list(self.session.execute(query).all())
+
+    def sync_mark_dispatched(self, ids: List[int]) -> None:
+        """Отмечает записи отправленными в брокер."""
+        self.session.execute(
+            update(NotificationOutbox)
+            .where(NotificationOutbox.id.in_(ids))
+            .values(dispatched_at=func.now())
+        )
+
+    def sync_purge_dispatched(self, before: datetime) -> int:
+        """Удаляет записи, отправленные раньше before."""
+        result = self.session.execute(
+            delete(NotificationOutbox).where(
+                NotificationOutbox.dispatched_at < before
+            )
+        )
+        logger.info("Purged %d dispatched outbox rows", result.rowcount)
+        return result.rowcount
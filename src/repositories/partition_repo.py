@@ -0,0 +1,144 @@
+import logging
+import re
+import uuid
+from datetime import datetime, timezone
+from typing import Iterable, Iterator, List
+
+from sqlalchemy import column, table, text
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import TableClause
+
+from src.models.notification import Notification, NotificationKey
+
+logger = logging.getLogger(__name__)
+
+
+class PartitionRepository:
+    """
+    Управление месячными секциями таблицы уведомлений и таблицы их ключей.
+    Секции месяца называются notifications_YYYY_MM и
+    notification_keys_YYYY_MM и содержат строки с created_at
+    в [начало месяца, начало следующего месяца) по UTC.
+    Работает в синхронной сессии, транзакцией управляет вызывающий код.
+    """
+
+    TABLE = Notification.__tablename__
+    KEYS_TABLE = NotificationKey.__tablename__
+    NAME_PATTERN = re.compile(rf"^{TABLE}_(\d{{4}})_(\d{{2}})$")
+
+    def __init__(self, session: Session):
+        self.session = session
+
+    @staticmethod
+    def month_start(value: datetime) -> datetime:
+        """Начало месяца value по UTC."""
+        value = value.astimezone(timezone.utc)
+        return datetime(value.year, value.month, 1, tzinfo=timezone.utc)
+
+    @staticmethod
+    def add_months(month: datetime, months: int) -> datetime:
+        """Сдвигает начало месяца на months месяцев."""
+        index = month.year * 12 + month.month - 1 + months
+        return month.replace(year=index // 12, month=index % 12 + 1)
+
+    @classmethod
+    def partition_name(cls, month: datetime, table: str | None = None) -> str:
+        return f"{table or cls.TABLE}_{month:%Y_%m}"
+
+    @classmethod
+    def detached_table(cls, month: datetime) -> TableClause:
+        """Отсоединенная секция уведомлений месяца month для запросов."""
+        return table(
+            cls.partition_name(month),
+            *(column(c.name, c.type) for c in Notification.__table__.c),
+        )
+
+    @classmethod
+    def _months(cls, names: Iterable[str]) -> List[datetime]:
+        months = []
+        for name in names:
+            match = cls.NAME_PATTERN.match(name)
+            if match:
+                year, month = map(int, match.groups())
+                months.append(datetime(year, month, 1, tzinfo=timezone.utc))
+        return sorted(months)
+
+    def sync_list_months(self) -> List[datetime]:
+        """Возвращает месяцы существующих секций по возрастанию."""
+        names = self.session.scalars(
+            text(
+                "SELECT c.relname FROM pg_inherits i "
+                "JOIN pg_class c ON c.oid = i.inhrelid "
+                "WHERE i.inhparent = CAST(:table AS regclass)"
+            ),
+            {"table": self.TABLE},
+        ).all()
+        return self._months(names)
+
+    def sync_list_detached_months(self) -> List[datetime]:
+        """
+        Возвращает месяцы секций, отсоединенных sync_detach, но еще
+        не удаленных sync_drop.
+        """
+        names = self.session.scalars(
+            text(
+                "SELECT relname FROM pg_class "
+                "WHERE relkind = 'r' AND NOT relispartition "
+                "AND relname LIKE :prefix"
+            ),
+            {"prefix": f"{self.TABLE}\\_%"},
+        ).all()
+        return self._months(names)
+
+    def sync_create(self, month: datetime) -> None:
+        """Создает секции уведомлений и их ключей месяца month."""
+        upper = self.add_months(month, 1)
+        for parent in (self.TABLE, self.KEYS_TABLE):
+            self.session.execute(
+                text(
+                    "CREATE TABLE IF NOT EXISTS "
+                    f"{self.partition_name(month, parent)} "
+                    f"PARTITION OF {parent} "
+                    f"FOR VALUES FROM ('{month.isoformat()}') "
+                    f"TO ('{upper.isoformat()}')"
+                )
+            )
+        logger.info("Created partition %s", self.partition_name(month))
+
+    def sync_detach(self, month: datetime) -> None:
+        """
+        Отсоединяет секции месяца month: после фиксации их строки не видны
+        запросам к notifications, но остаются в отдельных таблицах, пока
+        по ним уменьшаются счетчики и сбрасывается кэш.
+        """
+        for parent in (self.TABLE, self.KEYS_TABLE):
+            self.session.execute(
+                text(
+                    f"ALTER TABLE {parent} DETACH PARTITION "
+                    f"{self.partition_name(month, parent)}"
+                )
+            )
+        logger.info("Detached partition %s", self.partition_name(month))
+
+    def sync_detached_ids(
+        self, month: datetime, batch_size: int
+    ) -> Iterator[List[uuid.UUID]]:
+        """Отдает id отсоединенной секции месяца month пачками."""
+        result = self.session.execute(
+            text(
+                f"SELECT id FROM {self.partition_name(month, self.KEYS_TABLE)}"
+            ).execution_options(yield_per=batch_size)
+        )
+        for ids in result.scalars().partitions():
+            yield list(ids)
+
+    def sync_drop(self, month: datetime) -> None:
+        """
+        Удаляет отсоединенные секции месяца month целиком, без DELETE
+        строк и перестроения индексов остальных секций.
+        """
+        for parent in (self.TABLE, self.KEYS_TABLE):
+            self.session.execute(
+                text(f"DROP TABLE {self.partition_name(month, parent)}")
+            )
+        logger.info("Dropped partition %s", self.partition_name(month))
@@ -0,0 +1,42 @@
+import uuid
+
+from pydantic import BaseModel, Field
+
+
+class UserCountersResponse(BaseModel):
+    """
+    Схема для вывода счетчиков уведомлений пользователя.
+    """
+
+    user_id: uuid.UUID
+    total: int = Field(0, description="Всего уведомлений")
+    unread: int = Field(0, description="Непрочитанных уведомлений")
+    unread_by_category: dict[str, int] = Field(
+        default_factory=dict,
+        description="Непрочитанные уведомления по категориям",
+    )
+    by_status: dict[str, int] = Field(
+        default_factory=dict,
+        description="Уведомления по статусу обработки",
+    )
+
+    @classmethod
+    def from_fields(
+        cls, user_id: uuid.UUID, fields: dict[str, int]
+    ) -> "UserCountersResponse":
+        """Собирает ответ из полей Redis хэша счетчиков."""
+        unread_by_category = {}
+        by_status = {}
+        for field, value in fields.items():
+            prefix, _, name = field.partition(":")
+            if prefix == "category":
+                unread_by_category[name] = max(value, 0)
+            elif prefix == "status":
+                by_status[name] = max(value, 0)
+        return cls(
+            user_id=user_id,
+            total=max(fields.get("total", 0), 0),
+            unread=max(fields.get("unread", 0), 0),
+            unread_by_category=unread_by_category,
+            by_status=by_status,
+        )
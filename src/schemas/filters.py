@@ -1,8 +1,13 @@
 import uuid
+from datetime import datetime
 
 from pydantic import BaseModel, ConfigDict, Field
 
-from src.schemas.enums import NotificationCategory, ProcessingStatus
+from src.schemas.enums import (
+    ExportFormat,
+    NotificationCategory,
+    ProcessingStatus,
+)
 
 
 class NotificationFilter(BaseModel):
@@ -18,9 +23,79 @@ class NotificationFilter(BaseModel):
         default=None, description="Статус обработки уведомления"
     )
 
+    created_from: datetime | None = Field(
+        default=None, description="Создано не раньше (включительно)"
+    )
+    created_to: datetime | None = Field(
+        default=None, description="Создано раньше (не включительно)"
+    )
+
     limit: int = Field(
         default=20, ge=1, le=100, description="Максимум на страницу"
     )
     offset: int = Field(default=0, ge=0, description="Смещение для пагинации")
+    cursor: str | None = Field(
+        default=None,
+        description=(
+            "Курсор следующей страницы из заголовка X-Next-Cursor. "
+            "Если передан, offset игнорируется"
+        ),
+    )
 
     model_config = ConfigDict(from_attributes=True)
+
+
+class NotificationSearch(BaseModel):
+    q: str = Field(
+        ...,
+        min_length=1,
+        max_length=256,
+        description=(
+            "Поисковый запрос по заголовку и тексту. Поддерживает "
+            'синтаксис websearch: "фраза", OR, -исключение'
+        ),
+    )
+
+    user_id: uuid.UUID | None = Field(
+        default=None, description="UUID пользователя"
+    )
+
+    created_from: datetime | None = Field(
+        default=None, description="Создано не раньше (включительно)"
+    )
+    created_to: datetime | None = Field(
+        default=None, description="Создано раньше (не включительно)"
+    )
+
+    limit: int = Field(
+        default=20, ge=1, le=100, description="Максимум на страницу"
+    )
+    cursor: str | None = Field(
+        default=None,
+        description="Курсор следующей страницы из заголовка X-Next-Cursor",
+    )
+
+
+class NotificationExport(BaseModel):
+    user_id: uuid.UUID | None = Field(
+        default=None, description="UUID пользователя"
+    )
+
+    category: NotificationCategory | None = Field(
+        default=None, description="Категория уведомления"
+    )
+
+    processing_status: ProcessingStatus | None = Field(
+        default=None, description="Статус обработки уведомления"
+    )
+
+    created_from: datetime | None = Field(
+        default=None, description="Создано не раньше (включительно)"
+    )
+    created_to: datetime | None = Field(
+        default=None, description="Создано раньше (не включительно)"
+    )
+
+    format: ExportFormat = Field(
+        default=ExportFormat.NDJSON, description="Формат выгрузки"
+    )
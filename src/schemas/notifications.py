@@ -1,7 +1,14 @@
 import uuid
+from dataclasses import dataclass, field
 from datetime import datetime
+from typing import Annotated
 
-from pydantic import BaseModel, ConfigDict, Field
+from pydantic import BaseModel, ConfigDict, Field, model_validator
+
+from src.schemas.enums import NotificationCategory, ProcessingStatus
+
+BATCH_MAX_SIZE = 1000
+EVENTS_MAX_SUBSCRIPTIONS = 100
 
 
 class NotificationCreate(BaseModel):
@@ -16,6 +23,53 @@ class NotificationCreate(BaseModel):
     text: str = Field(..., description="Текст уведомления")
 
 
+NotificationBatchCreate = Annotated[
+    list[NotificationCreate],
+    Field(
+        min_length=1,
+        max_length=BATCH_MAX_SIZE,
+        description="Список уведомлений для пакетного создания",
+    ),
+]
+
+
+class NotificationBulkRead(BaseModel):
+    """
+    Схема для массовой отметки уведомлений как прочитанных.
+    Требуется явный список ids или user_id; остальные поля сужают выборку.
+    """
+
+    ids: list[uuid.UUID] | None = Field(
+        default=None,
+        min_length=1,
+        max_length=BATCH_MAX_SIZE,
+        description="UUID уведомлений",
+    )
+    user_id: uuid.UUID | None = Field(
+        default=None, description="UUID пользователя"
+    )
+    category: NotificationCategory | None = Field(
+        default=None, description="Категория уведомления"
+    )
+    created_before: datetime | None = Field(
+        default=None, description="Только уведомления, созданные до момента"
+    )
+
+    @model_validator(mode="after")
+    def check_target(self) -> "NotificationBulkRead":
+        if self.ids is None and self.user_id is None:
+            raise ValueError("ids or user_id is required")
+        return self
+
+
+class NotificationBulkReadResponse(BaseModel):
+    """
+    Схема ответа массовой отметки о прочтении.
+    """
+
+    updated: int = Field(..., description="Количество отмеченных уведомлений")
+
+
 class NotificationResponse(BaseModel):
     """
     Схема для вывода уведомления.
@@ -31,5 +85,35 @@ class NotificationResponse(BaseModel):
     category: str | None = None
     confidence: float | None = None
     processing_status: str
+    keywords: list[str] = Field(default_factory=list)
 
     model_config = ConfigDict(from_attributes=True)
+
+
+class NotificationSearchResult(NotificationResponse):
+    """
+    Схема для вывода найденного уведомления с его релевантностью.
+    """
+
+    rank: float
+
+
+@dataclass(frozen=True, slots=True)
+class NotificationDTO:
+    """
+    Легковесное представление уведомления без ORM инструментирования.
+    Содержит поля NotificationResponse и версию строки.
+    """
+
+    id: uuid.UUID
+    user_id: uuid.UUID
+    title: str
+    text: str
+    created_at: datetime
+    updated_at: datetime
+    read_at: datetime | None
+    category: NotificationCategory | None
+    confidence: float | None
+    processing_status: ProcessingStatus
+    keywords: list[str] = field(default_factory=list)
+    version: int = 1
@@ -1,3 +1,4 @@
+import asyncio
 import random
 from time import sleep
 
@@ -5,7 +6,32 @@ from time import sleep
 class AIService:
     def analyze_text(self, text: str) -> dict:
         sleep(random.uniform(1, 3))
+        return self._classify(text)
 
+    async def aanalyze_text(self, text: str) -> dict:
+        """Неблокирующий вариант analyze_text для asyncio."""
+        await asyncio.sleep(random.uniform(1, 3))
+        return self._classify(text)
+
+    async def analyze_many(
+        self, texts: list[str], concurrency: int
+    ) -> list[dict | BaseException]:
+        """
+        Анализирует тексты конкурентно, одновременно выполняется не более
+        concurrency запросов. Результаты возвращаются в порядке texts,
+        ошибки анализа возвращаются на месте результата.
+        """
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def analyze(text: str) -> dict:
+            async with semaphore:
+                return await self.aanalyze_text(text)
+
+        return await asyncio.gather(
+            *(analyze(text) for text in texts), return_exceptions=True
+        )
+
+    def _classify(self, text: str) -> dict:
         crit = ("error", "exception", "failed")
         warn = ("warning", "attention", "careful")
 
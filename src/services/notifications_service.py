@@ -1,13 +1,27 @@
+import asyncio
 import logging
 import uuid
-from typing import Any
-
-from sqlalchemy import func
+from typing import Any, AsyncIterator
 
+from src.core.config import settings
+from src.core.events import FINAL_STATUSES, EventBroadcaster, status_event
+from src.core.export import csv_chunk, csv_header, ndjson_chunk
+from src.core.routing import primary_reads
 from src.models.notification import Notification
+from src.repositories.counters_repo import CountersRepository
 from src.repositories.notification_repo import NotificationRepository
-from src.schemas.filters import NotificationFilter
-from src.tasks.task_analyze import analyze_notification
+from src.schemas.counters import UserCountersResponse
+from src.schemas.enums import ExportFormat
+from src.schemas.filters import (
+    NotificationExport,
+    NotificationFilter,
+    NotificationSearch,
+)
+from src.schemas.notifications import (
+    NotificationBulkRead,
+    NotificationCreate,
+    NotificationDTO,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -18,39 +32,74 @@ class NotificationService:
     def __init__(
         self,
         repo: NotificationRepository,
+        counters: CountersRepository,
     ) -> None:
         self.repo = repo
+        self.counters = counters
 
     async def create_notification(
         self, user_id: uuid.UUID, title: str, text: str
     ) -> Notification:
         """
-        Создает новое уведомление, инициирует запуск AI анализа.
+        Создает новое уведомление. Задача AI анализа записывается в outbox
+        в той же транзакции и публикуется в брокер диспетчером outbox.
         """
         new_notification = Notification(
             user_id=user_id, title=title, text=text
         )
-        created = await self.repo.create(new_notification)
+        return await self.repo.create(new_notification)
 
-        try:
-            analyze_notification.delay(created.id, text)
-            logger.info(f"Task queued for notification {created.id}")
-        except Exception as exc:
-            logger.error(f"Failed queue task notification {created.id}: {exc}")
-        return created
+    async def create_notifications(
+        self, payloads: list[NotificationCreate]
+    ) -> list[Notification]:
+        """
+        Создает пачку уведомлений одним запросом к БД вместе с записями
+        outbox для их AI анализа.
+        """
+        return await self.repo.create_many(
+            [payload.model_dump() for payload in payloads]
+        )
 
     async def list_notifications(
         self,
         filters: NotificationFilter,
-    ) -> list[Notification]:
+    ) -> list[NotificationDTO]:
         """
         Возвращает список уведомлений пользователя.
         """
         return await self.repo.list(filters)
 
+    async def search_notifications(self, filters: NotificationSearch) -> list:
+        """
+        Ищет уведомления по заголовку и тексту.
+        Возвращает строки с колонками уведомления и релевантностью rank.
+        """
+        return await self.repo.search(filters)
+
+    async def export_notifications(
+        self, filters: NotificationExport
+    ) -> AsyncIterator[bytes]:
+        """
+        Потоковая выгрузка уведомлений по фильтрам в NDJSON или CSV.
+        Каждая пачка серверного курсора кодируется в один фрагмент ответа;
+        следующая пачка читается, когда клиент принял предыдущую.
+        """
+        if filters.format == ExportFormat.CSV:
+            encode = csv_chunk
+            yield csv_header()
+        else:
+            encode = ndjson_chunk
+        try:
+            async for notifications in self.repo.stream(
+                filters, settings.export.chunk_size
+            ):
+                yield encode(notifications)
+        finally:
+            await self.repo.release()
+
     async def get_notification(
         self, notification_id: uuid.UUID
-    ) -> Notification | None:
+    ) -> NotificationDTO | None:
         """
         Получает уведомление по ID.
         """
@@ -61,14 +110,94 @@ class NotificationService:
     ) -> Notification | None:
         """
         Отмечает уведомление как прочитанное, обновляя поле read_at.
+        Для уже прочитанного уведомления время прочтения не меняется.
         """
-        notification = await self.repo.update(
-            notification_id, {"read_at": func.now()}
-        )
+        notification = await self.repo.mark_as_read(notification_id)
         if not notification:
-            return None
+            return await self.repo.get_by_id(notification_id)
+        await self.counters.on_read([notification])
         return notification
 
+    async def mark_many_as_read(self, payload: NotificationBulkRead) -> int:
+        """
+        Отмечает пачку уведомлений как прочитанные: по списку ID или все
+        непрочитанные уведомления пользователя. Счетчики обновляются после
+        каждой пачки репозитория. Возвращает количество отмеченных.
+        """
+        updated = 0
+        async for notifications in self.repo.mark_many_as_read(
+            ids=payload.ids,
+            user_id=payload.user_id,
+            category=payload.category,
+            created_before=payload.created_before,
+        ):
+            await self.counters.on_read(notifications)
+            updated += len(notifications)
+        return updated
+
+    async def get_user_counters(
+        self, user_id: uuid.UUID
+    ) -> UserCountersResponse:
+        """
+        Возвращает счетчики уведомлений пользователя из Redis.
+        Если счетчиков еще нет, они рассчитываются по БД и сохраняются.
+        Пересчет читает основной сервер: отметка времени пересчета
+        сравнивается с временем фиксаций по его часам.
+        """
+        fields = await self.counters.get(user_id)
+        if fields is None:
+            with primary_reads():
+                rebuilt_at = await self.repo.clock()
+                rows = await self.repo.count_by_users([user_id])
+            fields = self.counters.from_grouped_rows(rows).get(user_id, {})
+            await self.counters.set(user_id, fields, rebuilt_at)
+        return UserCountersResponse.from_fields(user_id, fields)
+
+    async def stream_status_events(
+        self,
+        broadcaster: EventBroadcaster,
+        user_ids: list[uuid.UUID],
+        notifications: list,
+    ) -> AsyncIterator[dict[str, Any] | None]:
+        """
+        Поток событий смены статуса уведомлений пользователей user_ids и
+        отдельных уведомлений notifications. Сначала отдается текущий
+        статус отдельных уведомлений; поток только по ним завершается,
+        когда все они обработаны. None отдается, если событий не было
+        дольше heartbeat_interval.
+        """
+        users = {str(user_id) for user_id in user_ids}
+        channels = set(user_ids) | {n.user_id for n in notifications}
+        async with broadcaster.subscribe(channels) as queue:
+            # Снимок читается после подписки, чтобы не потерять переходы
+            # между ним и первым событием.
+            pending = set()
+            for notification in notifications:
+                current = await self.repo.get_by_id(
+                    notification.id, notification.created_at
+                )
+                event = status_event(current or notification)
+                if event["processing_status"] not in FINAL_STATUSES:
+                    pending.add(event["id"])
+                yield event
+            await self.repo.release()
+
+            watched = {str(n.id) for n in notifications}
+            while users or pending:
+                try:
+                    event = await asyncio.wait_for(
+                        queue.get(), settings.events.heartbeat_interval
+                    )
+                except asyncio.TimeoutError:
+                    yield None
+                    continue
+                if event["id"] in watched:
+                    if event["processing_status"] in FINAL_STATUSES:
+                        pending.discard(event["id"])
+                elif event["user_id"] not in users:
+                    continue
+                yield event
+
     async def check_notification_status(
         self, notification_id: uuid.UUID
     ) -> dict[str, Any] | None:
@@ -1,3 +1,17 @@
-from src.tasks.task_analyze import analyze_notification
+from src.tasks.task_analyze import (
+    analyze_notification,
+    analyze_pending_notifications,
+    requeue_stale_notifications,
+)
+from src.tasks.task_archive import archive_notifications
+from src.tasks.task_counters import reconcile_user_counters
+from src.tasks.task_partitions import maintain_notification_partitions
 
-__all__ = ("analyze_notification",)
+__all__ = (
+    "analyze_notification",
+    "analyze_pending_notifications",
+    "archive_notifications",
+    "maintain_notification_partitions",
+    "reconcile_user_counters",
+    "requeue_stale_notifications",
+)
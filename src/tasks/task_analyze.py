@@ -1,8 +1,18 @@
+import asyncio
 import logging
+import math
+from datetime import datetime, timedelta, timezone
 from uuid import UUID
 
 from src.celery_app import app_celery
+from src.core.analysis_cache import AnalysisCache
+from src.core.cache import SyncCacheManager
+from src.core.config import settings
 from src.core.db import get_sync_db_session
+from src.core.events import publish_status_events
+from src.core.metrics import observe_pending_lag
+from src.core.redis_client import get_sync_redis
+from src.repositories.counters_repo import CountersRepository
 from src.repositories.notification_repo import NotificationRepository
 from src.schemas.enums import ProcessingStatus
 from src.services.mock_ai_service import AIService
@@ -10,42 +20,221 @@ from src.services.mock_ai_service import AIService
 logger = logging.getLogger(__name__)
 
 
+def _analysis_cache() -> AnalysisCache | None:
+    if not settings.analysis.cache_enabled:
+        return None
+    return AnalysisCache(get_sync_redis())
+
+
 @app_celery.task
-def analyze_notification(notification_id: UUID, text: str):
+def analyze_notification(notification_id: UUID, *_):
     """
     Задача для анализа уведомления.
-    Принимает notification_id и text, обновляет статус и результаты в БД.
+    Переводит уведомление из PENDING в PROCESSING условным UPDATE,
+    получая из БД его текст, и вторым условным UPDATE из PROCESSING
+    записывает результат. Повторная доставка того же сообщения не
+    проходит первое условие и не запускает анализ второй раз.
+    Лишние аргументы принимаются для совместимости с сообщениями,
+    в которых передавался текст уведомления.
     """
     logger.info("Task started for notification %s", notification_id)
     with get_sync_db_session() as session:
-        repo = NotificationRepository(session)
-        note = repo.sync_get_by_id(notification_id)
-
-        if note and note.processing_status == ProcessingStatus.PENDING:
-            logger.info("Start analyze notification: %s", notification_id)
-            repo.sync_update(
-                notification_id,
-                {"processing_status": ProcessingStatus.PROCESSING},
-            )
-
-            try:
-                ai_service = AIService()
-                analysis = ai_service.analyze_text(text)
-                update_data = {
-                    "category": analysis["category"],
-                    "confidence": analysis["confidence"],
-                    "processing_status": ProcessingStatus.COMPLETED,
-                }
-                repo.sync_update(notification_id, update_data)
-                logger.info("Success analyze note: %s", notification_id)
-                return {"status": "success"}
-            except Exception as exc:
-                repo.sync_update(
-                    notification_id,
-                    {"processing_status": ProcessingStatus.FAILED},
-                )
-                logger.error("Error analyz note %s:%s", notification_id, exc)
-        else:
+        repo = NotificationRepository(
+            session, SyncCacheManager(get_sync_redis())
+        )
+        counters = CountersRepository(get_sync_redis())
+        note = repo.sync_update_if_status(
+            notification_id,
+            ProcessingStatus.PENDING,
+            {"processing_status": ProcessingStatus.PROCESSING},
+        )
+        if note is None:
             logger.info(
                 "Note %s already done or not found", str(notification_id)
             )
+            return {"status": "skipped"}
+
+        logger.info("Start analyze notification: %s", notification_id)
+        observe_pending_lag([note])
+        counters.sync_on_status_changed([note], ProcessingStatus.PENDING)
+        publish_status_events(get_sync_redis(), [note])
+
+        try:
+            analysis_cache = _analysis_cache()
+            analysis = (
+                analysis_cache.get(note.text) if analysis_cache else None
+            )
+            if analysis is None:
+                analysis = AIService().analyze_text(note.text)
+                if analysis_cache:
+                    analysis_cache.set(note.text, analysis)
+            update_data = {
+                "category": analysis["category"],
+                "confidence": analysis["confidence"],
+                "keywords": analysis.get("keywords", []),
+                "processing_status": ProcessingStatus.COMPLETED,
+            }
+        except Exception as exc:
+            logger.error("Error analyz note %s:%s", notification_id, exc)
+            update_data = {"processing_status": ProcessingStatus.FAILED}
+
+        note = repo.sync_update_if_status(
+            notification_id,
+            ProcessingStatus.PROCESSING,
+            update_data,
+            created_at=note.created_at,
+        )
+        if note is None:
+            logger.info("Note %s changed during analyze", notification_id)
+            return {"status": "skipped"}
+        counters.sync_on_status_changed([note], ProcessingStatus.PROCESSING)
+        publish_status_events(get_sync_redis(), [note])
+        if note.processing_status == ProcessingStatus.FAILED:
+            return {"status": "failed"}
+        logger.info("Success analyze note: %s", notification_id)
+        return {"status": "success"}
+
+
+def _analyze_batch(
+    ai_service: AIService,
+    analysis_cache: AnalysisCache | None,
+    notes: list,
+    concurrency: int,
+) -> list[dict | BaseException]:
+    """
+    Анализирует тексты пачки уведомлений. Результаты из кэша анализа
+    используются без обращения к AI сервису, одинаковые тексты внутри
+    пачки анализируются один раз.
+    """
+    if analysis_cache is None:
+        return asyncio.run(
+            ai_service.analyze_many([note.text for note in notes], concurrency)
+        )
+    keys = [analysis_cache.key(note.text) for note in notes]
+    unique_keys = list(dict.fromkeys(keys))
+    by_key = dict(
+        zip(unique_keys, analysis_cache.get_many(unique_keys), strict=True)
+    )
+    missing: dict[str, str] = {}
+    for key, note in zip(keys, notes, strict=True):
+        if by_key[key] is None:
+            missing.setdefault(key, note.text)
+    if missing:
+        fresh = asyncio.run(
+            ai_service.analyze_many(list(missing.values()), concurrency)
+        )
+        by_key.update(zip(missing, fresh, strict=True))
+        analysis_cache.set_many(
+            {
+                key: by_key[key]
+                for key in missing
+                if not isinstance(by_key[key], BaseException)
+            }
+        )
+    return [by_key[key] for key in keys]
+
+
+@app_celery.task
+def analyze_pending_notifications(
+    batch_size: int | None = None,
+    max_batches: int | None = None,
+    concurrency: int | None = None,
+):
+    """
+    Пакетный анализ уведомлений для разбора накопившейся очереди.
+    На каждой итерации захватывает до batch_size уведомлений в статусе
+    PENDING, анализирует их конкурентно (не более concurrency запросов
+    к AI сервису одновременно) и записывает результаты одним UPDATE.
+    Работает, пока есть PENDING уведомления или не достигнут max_batches.
+    """
+    batch_size = batch_size or settings.analysis.batch_size
+    concurrency = concurrency or settings.analysis.concurrency
+    ai_service = AIService()
+    analysis_cache = _analysis_cache()
+    counters = CountersRepository(get_sync_redis())
+    processed = batches = 0
+
+    while max_batches is None or batches < max_batches:
+        with get_sync_db_session() as session:
+            repo = NotificationRepository(
+                session, SyncCacheManager(get_sync_redis())
+            )
+            notes = repo.sync_claim_pending(batch_size)
+            if not notes:
+                break
+            observe_pending_lag(notes)
+            counters.sync_on_status_changed(notes, ProcessingStatus.PENDING)
+            publish_status_events(get_sync_redis(), notes)
+            logger.info("Start analyze batch of %d notifications", len(notes))
+
+            analyses = _analyze_batch(
+                ai_service, analysis_cache, notes, concurrency
+            )
+            results = []
+            for note, analysis in zip(notes, analyses, strict=True):
+                if isinstance(analysis, BaseException):
+                    logger.error("Error analyz note %s:%s", note.id, analysis)
+                    results.append(
+                        {
+                            "id": note.id,
+                            "category": None,
+                            "confidence": None,
+                            "keywords": [],
+                            "processing_status": ProcessingStatus.FAILED,
+                        }
+                    )
+                else:
+                    results.append(
+                        {
+                            "id": note.id,
+                            "category": analysis["category"],
+                            "confidence": analysis["confidence"],
+                            "keywords": analysis.get("keywords", []),
+                            "processing_status": ProcessingStatus.COMPLETED,
+                        }
+                    )
+            updated = repo.sync_bulk_update_results(results)
+            counters.sync_on_status_changed(
+                updated, ProcessingStatus.PROCESSING
+            )
+            publish_status_events(get_sync_redis(), updated)
+
+        processed += len(notes)
+        batches += 1
+
+    logger.info("Batch analyze done, processed %d notifications", processed)
+    return {"status": "success", "processed": processed}
+
+
+@app_celery.task
+def requeue_stale_notifications(timeout: int | None = None):
+    """
+    Возвращает в PENDING уведомления, которые дольше timeout секунд
+    остаются в PROCESSING после захвата упавшим воркером, и ставит задачу
+    пакетного анализа для них. timeout должен превышать время анализа
+    одной пачки, иначе уведомление может быть проанализировано дважды.
+    """
+    timeout = timeout or settings.analysis.processing_timeout
+    batch_size = settings.analysis.batch_size
+    claimed_before = datetime.now(timezone.utc) - timedelta(seconds=timeout)
+    counters = CountersRepository(get_sync_redis())
+    requeued = 0
+
+    while True:
+        with get_sync_db_session() as session:
+            repo = NotificationRepository(
+                session, SyncCacheManager(get_sync_redis())
+            )
+            notes = repo.sync_requeue_stale(claimed_before, batch_size)
+        if not notes:
+            break
+        counters.sync_on_status_changed(notes, ProcessingStatus.PROCESSING)
+        publish_status_events(get_sync_redis(), notes)
+        requeued += len(notes)
+
+    if requeued:
+        logger.warning("Requeued %d stale notifications", requeued)
+        analyze_pending_notifications.delay(
+            max_batches=math.ceil(requeued / batch_size)
+        )
+    return {"status": "success", "requeued": requeued}
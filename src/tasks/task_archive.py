@@ -0,0 +1,74 @@
+import logging
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+from src.celery_app import app_celery
+from src.core.archive import ArchiveCheckpoint, write_chunk
+from src.core.cache import SyncCacheManager
+from src.core.config import settings
+from src.core.db import get_sync_db_session
+from src.core.redis_client import get_sync_redis
+from src.repositories.counters_repo import CountersRepository
+from src.repositories.notification_repo import NotificationRepository
+
+logger = logging.getLogger(__name__)
+
+
+@app_celery.task
+def archive_notifications(
+    chunk_size: int | None = None, max_chunks: int | None = None
+):
+    """
+    Периодическая задача архивации обработанных уведомлений, прочитанных
+    более read_older_than_days дней назад.
+    Уведомления читаются пачками по chunk_size в порядке (created_at, id),
+    каждая пачка пишется в отдельный NDJSON.gz файл и удаляется из БД
+    только после проверки записанного файла. После удаления кэш пачки
+    заменяется надгробиями, а счетчики уменьшаются только на строки,
+    которые удалил этот прогон. После каждой пачки сохраняется
+    checkpoint, с которого продолжается прерванный прогон.
+    """
+    chunk_size = chunk_size or settings.archive.chunk_size
+    directory = Path(settings.archive.directory)
+    directory.mkdir(parents=True, exist_ok=True)
+
+    checkpoint = ArchiveCheckpoint.load(directory)
+    if checkpoint:
+        logger.info("Resume archive from chunk %d", checkpoint.chunk)
+    else:
+        checkpoint = ArchiveCheckpoint(
+            read_before=datetime.now(timezone.utc)
+            - timedelta(days=settings.archive.read_older_than_days)
+        )
+    counters = CountersRepository(get_sync_redis())
+    chunks = 0
+
+    while max_chunks is None or chunks < max_chunks:
+        with get_sync_db_session() as session:
+            repo = NotificationRepository(
+                session, SyncCacheManager(get_sync_redis())
+            )
+            rows = repo.sync_archivable_chunk(
+                checkpoint.read_before, checkpoint.position, chunk_size
+            )
+            if not rows:
+                ArchiveCheckpoint.clear(directory)
+                break
+            write_chunk(checkpoint.chunk_path(directory, rows[0]), rows)
+            deleted = repo.sync_delete_many(rows)
+            session.commit()
+            committed_at = repo.sync_clock()
+            repo.sync_invalidate(row.id for row in rows)
+        counters.sync_on_deleted(
+            [row for row in rows if row.id in deleted], committed_at
+        )
+        checkpoint.advance(rows[-1], len(rows))
+        checkpoint.save(directory)
+        chunks += 1
+
+    logger.info("Archived %d notifications", checkpoint.archived)
+    return {
+        "status": "success",
+        "archived": checkpoint.archived,
+        "chunks": checkpoint.chunk,
+    }
@@ -0,0 +1,44 @@
+import logging
+
+from src.celery_app import app_celery
+from src.core.config import settings
+from src.core.db import get_sync_db_session
+from src.core.redis_client import get_sync_redis
+from src.repositories.counters_repo import CountersRepository
+from src.repositories.notification_repo import NotificationRepository
+
+logger = logging.getLogger(__name__)
+
+
+@app_celery.task
+def reconcile_user_counters(batch_size: int | None = None):
+    """
+    Периодическая задача пересчета счетчиков пользователей из PostgreSQL.
+    Пользователи обходятся страницами по user_id, счетчики каждой
+    страницы считаются одним запросом по индексу
+    ix_notifications_user_status_created и перезаписываются в Redis.
+    """
+    batch_size = batch_size or settings.counters.reconcile_batch_size
+    counters = CountersRepository(get_sync_redis())
+    last_user_id = None
+    reconciled = 0
+
+    while True:
+        with get_sync_db_session() as session:
+            repo = NotificationRepository(session)
+            user_ids = repo.sync_user_ids_after(last_user_id, batch_size)
+            if not user_ids:
+                break
+            rebuilt_at = repo.sync_clock()
+            rows = repo.sync_count_by_users(user_ids)
+
+        by_user = counters.from_grouped_rows(rows)
+        counters.sync_set_many(
+            {user_id: by_user.get(user_id, {}) for user_id in user_ids},
+            rebuilt_at,
+        )
+        reconciled += len(user_ids)
+        last_user_id = user_ids[-1]
+
+    logger.info("Reconciled counters for %d users", reconciled)
+    return {"status": "success", "users": reconciled}
@@ -0,0 +1,91 @@
+import logging
+from datetime import datetime, timezone
+
+from src.celery_app import app_celery
+from src.core.cache import SyncCacheManager
+from src.core.config import settings
+from src.core.db import get_sync_db_session
+from src.core.redis_client import get_sync_redis
+from src.repositories.counters_repo import CountersRepository
+from src.repositories.notification_repo import NotificationRepository
+from src.repositories.partition_repo import PartitionRepository
+
+logger = logging.getLogger(__name__)
+
+
+@app_celery.task
+def maintain_notification_partitions(
+    months_ahead: int | None = None,
+    retention_months: int | None = None,
+):
+    """
+    Периодическая задача обслуживания секций уведомлений.
+    Создает секции от текущего месяца на months_ahead месяцев вперед и
+    удаляет секции, целиком вышедшие за retention_months месяцев
+    хранения (0 - хранить без ограничения).
+    Секции удаляются в два шага: сначала отсоединяются, после чего
+    счетчики пользователей уменьшаются на их уведомления, а кэш этих
+    уведомлений заменяется надгробиями, как при архивации, и только
+    затем отсоединенные таблицы удаляются. Секции, отсоединенные
+    прерванным прогоном, удаляются при следующем.
+    """
+    if months_ahead is None:
+        months_ahead = settings.partitions.months_ahead
+    if retention_months is None:
+        retention_months = settings.partitions.retention_months
+    current = PartitionRepository.month_start(datetime.now(timezone.utc))
+    created, detached = [], []
+
+    with get_sync_db_session() as session:
+        repo = PartitionRepository(session)
+        existing = set(repo.sync_list_months())
+        for offset in range(months_ahead + 1):
+            month = repo.add_months(current, offset)
+            if month not in existing:
+                repo.sync_create(month)
+                created.append(repo.partition_name(month))
+
+        if retention_months:
+            oldest_kept = repo.add_months(current, -retention_months)
+            for month in sorted(existing):
+                if month >= oldest_kept:
+                    break
+                repo.sync_detach(month)
+                detached.append(month)
+        session.commit()
+        committed_at = NotificationRepository(session).sync_clock()
+
+    if detached:
+        counters = CountersRepository(get_sync_redis())
+        for month in detached:
+            with get_sync_db_session() as session:
+                rows = NotificationRepository(session).sync_count_detached(
+                    PartitionRepository.detached_table(month)
+                )
+            counters.sync_on_dropped(rows, committed_at)
+
+    dropped = []
+    with get_sync_db_session() as session:
+        months = PartitionRepository(session).sync_list_detached_months()
+    for month in months:
+        _drop_detached(month)
+        dropped.append(PartitionRepository.partition_name(month))
+
+    logger.info(
+        "Partitions maintained, created: %s, dropped: %s", created, dropped
+    )
+    return {"status": "success", "created": created, "dropped": dropped}
+
+
+def _drop_detached(month: datetime) -> None:
+    """Сбрасывает кэш уведомлений отсоединенной секции и удаляет ее."""
+    with get_sync_db_session() as session:
+        repo = PartitionRepository(session)
+        notes = NotificationRepository(
+            session, SyncCacheManager(get_sync_redis())
+        )
+        for ids in repo.sync_detached_ids(
+            month, NotificationRepository.READ_CHUNK_SIZE
+        ):
+            notes.sync_invalidate(ids)
+        repo.sync_drop(month)
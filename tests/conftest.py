@@ -1,7 +1,9 @@
+from contextlib import contextmanager
 from unittest.mock import AsyncMock, MagicMock
 
 import pytest
 
+from src.repositories.counters_repo import CountersRepository
 from src.services.notifications_service import NotificationService
 
 
@@ -10,13 +12,46 @@ def mock_repo():
     """Мок-репозиторий"""
     repo = MagicMock()
     repo.create = AsyncMock()
+    repo.create_many = AsyncMock()
     repo.list = AsyncMock()
     repo.get_by_id = AsyncMock()
     repo.update = AsyncMock()
+    repo.mark_as_read = AsyncMock()
+    repo.count_by_users = AsyncMock()
+    repo.clock = AsyncMock(return_value=1760000000.5)
+    repo.release = AsyncMock()
     return repo
 
 
 @pytest.fixture
-def service(mock_repo):
-    """Сервис с подменённым репозиторием."""
-    return NotificationService(repo=mock_repo)
+def mock_counters():
+    """Мок-репозиторий счетчиков"""
+    counters = MagicMock()
+    counters.get = AsyncMock()
+    counters.set = AsyncMock()
+    counters.on_read = AsyncMock()
+    counters.from_grouped_rows = CountersRepository.from_grouped_rows
+    return counters
+
+
+@pytest.fixture
+def sync_session():
+    """Мок синхронной сессии БД"""
+    return MagicMock()
+
+
+@pytest.fixture
+def fake_sync_session(sync_session):
+    """Подмена get_sync_db_session, отдающая мок сессии."""
+
+    @contextmanager
+    def session():
+        yield sync_session
+
+    return session
+
+
+@pytest.fixture
+def service(mock_repo, mock_counters):
+    """Сервис с подменёнными репозиториями."""
+    return NotificationService(repo=mock_repo, counters=mock_counters)
@@ -0,0 +1,30 @@
+import asyncio
+from unittest.mock import patch
+
+import pytest
+
+from src.services.mock_ai_service import AIService
+
+
+@pytest.mark.asyncio
+async def test_analyze_many_respects_concurrency():
+    service = AIService()
+    running = max_running = 0
+
+    async def fake_analyze(text):
+        nonlocal running, max_running
+        running += 1
+        max_running = max(max_running, running)
+        await asyncio.sleep(0.01)
+        running -= 1
+        if text == "bad":
+            raise RuntimeError("boom")
+        return {"category": "info"}
+
+    with patch.object(service, "aanalyze_text", side_effect=fake_analyze):
+        results = await service.analyze_many(["a", "bad", "c", "d", "e"], 2)
+
+    assert max_running == 2
+    assert results[0] == {"category": "info"}
+    assert isinstance(results[1], RuntimeError)
+    assert len(results) == 5
@@ -0,0 +1,39 @@
+import pytest
+
+from src.core.analysis_cache import ANALYSIS_INDEX_KEY, AnalysisCache
+
+
+def test_key_ignores_case_and_whitespace():
+    assert AnalysisCache.key("Disk  FULL\n") == AnalysisCache.key("disk full")
+    assert AnalysisCache.key("disk full") != AnalysisCache.key("disk fail")
+
+
+def test_stats_from_fields():
+    stats = AnalysisCache.stats_from_fields(
+        {b"hits": b"3", b"misses": b"1", b"stored": b"1"}, size=1
+    )
+
+    assert stats == {
+        "hits": 3,
+        "misses": 1,
+        "hit_rate": 0.75,
+        "analyzer_calls_saved": 3,
+        "stored": 1,
+        "size": 1,
+    }
+    assert AnalysisCache.stats_from_fields({}, size=0)["hit_rate"] == 0.0
+
+
+def test_set_many_evicts_beyond_unpack_limit():
+    fakeredis = pytest.importorskip("fakeredis")
+    redis = fakeredis.FakeRedis()
+    cache = AnalysisCache(redis, ttl=3600, max_size=10)
+    analysis = {"category": "info", "confidence": 0.9}
+    # Больше записей, чем помещается в unpack() Lua.
+    cache.set_many({f"analysis:{n}": analysis for n in range(10000)})
+
+    cache.set_many({"analysis:new": analysis})
+
+    assert redis.zcard(ANALYSIS_INDEX_KEY) == 10
+    assert len(redis.keys("analysis:[0-9n]*")) == 10
+    assert redis.exists("analysis:new")
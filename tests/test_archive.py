@@ -0,0 +1,164 @@
+import gzip
+import uuid
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import orjson
+import pytest
+
+from src.core.archive import (
+    ArchiveCheckpoint,
+    ArchiveVerificationError,
+    write_chunk,
+)
+from src.tasks import task_archive
+
+
+def make_row(created_at):
+    notific_id = uuid.uuid4()
+    mapping = {"id": notific_id, "created_at": created_at, "title": "t"}
+    return SimpleNamespace(
+        id=notific_id, created_at=created_at, _mapping=mapping
+    )
+
+
+def test_write_chunk_roundtrip(tmp_path):
+    now = datetime.now(timezone.utc)
+    rows = [make_row(now), make_row(now + timedelta(seconds=1))]
+    path = tmp_path / "chunk.ndjson.gz"
+
+    write_chunk(path, rows)
+
+    with gzip.open(path, "rb") as archive:
+        written = [orjson.loads(line) for line in archive]
+    assert [item["id"] for item in written] == [str(r.id) for r in rows]
+    assert not path.with_name(path.name + ".tmp").exists()
+
+
+def test_write_chunk_verification_error(tmp_path):
+    row = make_row(datetime.now(timezone.utc))
+    row._mapping = {**row._mapping, "id": uuid.uuid4()}
+    path = tmp_path / "chunk.ndjson.gz"
+
+    with pytest.raises(ArchiveVerificationError):
+        write_chunk(path, [row])
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_checkpoint_save_load(tmp_path):
+    checkpoint = ArchiveCheckpoint(read_before=datetime.now(timezone.utc))
+    assert ArchiveCheckpoint.load(tmp_path) is None
+
+    checkpoint.advance(make_row(datetime.now(timezone.utc)), 10)
+    checkpoint.save(tmp_path)
+
+    assert ArchiveCheckpoint.load(tmp_path) == checkpoint
+    ArchiveCheckpoint.clear(tmp_path)
+    assert ArchiveCheckpoint.load(tmp_path) is None
+
+
+def test_archive_notifications_resumes_and_deletes(
+    tmp_path, sync_session, fake_sync_session
+):
+    read_before = datetime.now(timezone.utc) - timedelta(days=90)
+    first = make_row(read_before - timedelta(days=10))
+    ArchiveCheckpoint(
+        read_before=read_before,
+        created_at=first.created_at,
+        id=first.id,
+        chunk=1,
+        archived=1,
+    ).save(tmp_path)
+    rows = [make_row(read_before - timedelta(days=n)) for n in (5, 4)]
+    counters = MagicMock()
+    cache = MagicMock()
+
+    with (
+        patch.object(task_archive.settings.archive, "directory", tmp_path),
+        patch.object(task_archive, "get_sync_db_session", fake_sync_session),
+        patch.object(task_archive, "get_sync_redis"),
+        patch.object(
+            task_archive, "CountersRepository", return_value=counters
+        ),
+        patch.object(task_archive, "SyncCacheManager", return_value=cache),
+        patch.object(
+            task_archive.NotificationRepository,
+            "sync_archivable_chunk",
+            side_effect=[rows, []],
+        ) as sync_chunk,
+        # Вторую строку пачки конкурентно удалил другой процесс.
+        patch.object(
+            task_archive.NotificationRepository,
+            "sync_delete_many",
+            return_value={rows[0].id},
+        ) as sync_delete,
+        patch.object(
+            task_archive.NotificationRepository,
+            "sync_clock",
+            return_value=1760000000.5,
+        ),
+    ):
+        result = task_archive.archive_notifications(chunk_size=2)
+
+    assert sync_chunk.call_args_list[0].args == (
+        read_before,
+        (first.created_at, first.id),
+        2,
+    )
+    sync_delete.assert_called_once_with(rows)
+    sync_session.commit.assert_called_once()
+    cache.delete_many.assert_called_once_with(
+        [f"notification:{row.id}" for row in rows]
+    )
+    counters.sync_on_deleted.assert_called_once_with([rows[0]], 1760000000.5)
+    assert result == {"status": "success", "archived": 3, "chunks": 2}
+    assert ArchiveCheckpoint.load(tmp_path) is None
+    chunk = ArchiveCheckpoint(read_before=read_before)
+    assert chunk.chunk_path(tmp_path, rows[0]).exists()
+
+
+def test_archive_crash_before_checkpoint_keeps_archived_chunk(
+    tmp_path, fake_sync_session
+):
+    read_before = datetime.now(timezone.utc) - timedelta(days=90)
+    deleted = [make_row(read_before - timedelta(days=n)) for n in (5, 4)]
+    remaining = [make_row(read_before - timedelta(days=n)) for n in (3, 2)]
+
+    def run(chunks):
+        with (
+            patch.object(task_archive.settings.archive, "directory", tmp_path),
+            patch.object(
+                task_archive, "get_sync_db_session", fake_sync_session
+            ),
+            patch.object(task_archive, "get_sync_redis"),
+            patch.object(task_archive, "CountersRepository"),
+            patch.object(
+                task_archive.NotificationRepository,
+                "sync_archivable_chunk",
+                side_effect=chunks,
+            ),
+            patch.object(
+                task_archive.NotificationRepository, "sync_delete_many"
+            ),
+        ):
+            return task_archive.archive_notifications(chunk_size=2)
+
+    # Пачка удалена из БД, но процесс упал до сохранения checkpoint.
+    with patch.object(ArchiveCheckpoint, "save", side_effect=OSError):
+        with pytest.raises(OSError):
+            run([deleted])
+    assert ArchiveCheckpoint.load(tmp_path) is None
+
+    # Повторный прогон начинается заново и получает следующие строки.
+    result = run([remaining, []])
+
+    assert result["archived"] == 2
+    archived = []
+    for path in sorted(tmp_path.glob("*.ndjson.gz")):
+        with gzip.open(path, "rb") as archive:
+            archived.append([orjson.loads(line)["id"] for line in archive])
+    assert archived == [
+        [str(row.id) for row in deleted],
+        [str(row.id) for row in remaining],
+    ]
@@ -0,0 +1,272 @@
+import asyncio
+import uuid
+from datetime import datetime, timezone
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import orjson
+import pytest
+
+from src.core.cache import (
+    CacheManager,
+    CacheStats,
+    LocalCache,
+    NotificationSerializer,
+    SingleFlight,
+    SyncCacheManager,
+    listen_invalidations,
+)
+from src.core.config import settings
+from src.models.notification import Notification
+from src.schemas.enums import NotificationCategory, ProcessingStatus
+from src.schemas.notifications import NotificationDTO
+
+
+@pytest.fixture
+def notification():
+    now = datetime(2025, 4, 18, 12, 0, tzinfo=timezone.utc)
+    return Notification(
+        id=uuid.uuid4(),
+        user_id=uuid.uuid4(),
+        title="Disk",
+        text="Disk usage warning",
+        created_at=now,
+        updated_at=now,
+        read_at=None,
+        category=NotificationCategory.WARNING,
+        confidence=0.75,
+        processing_status=ProcessingStatus.COMPLETED,
+        keywords=["disk", "usage"],
+        version=3,
+    )
+
+
+def test_notification_serializer_roundtrip(notification):
+    serializer = NotificationSerializer()
+
+    dto = serializer.loads(serializer.dumps(notification))
+
+    assert dto == NotificationDTO(
+        id=notification.id,
+        user_id=notification.user_id,
+        title="Disk",
+        text="Disk usage warning",
+        created_at=notification.created_at,
+        updated_at=notification.updated_at,
+        read_at=None,
+        category=NotificationCategory.WARNING,
+        confidence=0.75,
+        processing_status=ProcessingStatus.COMPLETED,
+        keywords=["disk", "usage"],
+        version=3,
+    )
+
+
+def test_notification_serializer_unknown_version(notification):
+    serializer = NotificationSerializer()
+    data = orjson.loads(serializer.dumps(notification))
+    data[0] = serializer.VERSION + 1
+
+    assert serializer.loads(orjson.dumps(data)) is None
+
+
+def test_local_cache_lru_eviction():
+    cache = LocalCache(max_size=2, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1
+
+    cache.set("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+
+
+def test_local_cache_ttl():
+    cache = LocalCache(max_size=10, ttl=5)
+    with patch("src.core.cache.time.monotonic", return_value=100.0):
+        cache.set("a", 1)
+        cache.set("b", 2, ttl=1)
+    with patch("src.core.cache.time.monotonic", return_value=102.0):
+        assert cache.get("a") == 1
+        assert cache.get("b") is None
+    with patch("src.core.cache.time.monotonic", return_value=106.0):
+        assert cache.get("a") is None
+    assert len(cache) == 0
+
+
+@pytest.mark.asyncio
+async def test_cache_manager_two_tiers(notification):
+    redis = MagicMock()
+    redis.hget = AsyncMock(
+        return_value=NotificationSerializer().dumps(notification)
+    )
+    manager = CacheManager(redis)
+    manager.local = LocalCache(max_size=10, ttl=5)
+    manager.stats = CacheStats()
+
+    first = await manager.get("key")
+    second = await manager.get("key")
+
+    assert first.id == notification.id
+    assert second is first
+
+    redis.hget.assert_awaited_once_with("key", "d")
+    assert manager.stats.as_dict() == {
+        "local": {"hits": 1, "misses": 1},
+        "redis": {"hits": 1, "misses": 0},
+    }
+
+
+@pytest.mark.asyncio
+async def test_single_flight_coalesces_concurrent_calls():
+    single_flight = SingleFlight()
+    calls = 0
+
+    async def load():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return "value"
+
+    results = await asyncio.gather(
+        *(single_flight.do("key", load) for _ in range(5))
+    )
+
+    assert results == ["value"] * 5
+    assert calls == 1
+
+
+@pytest.mark.asyncio
+async def test_single_flight_propagates_errors():
+    single_flight = SingleFlight()
+
+    async def load():
+        await asyncio.sleep(0.01)
+        raise RuntimeError("db down")
+
+    results = await asyncio.gather(
+        *(single_flight.do("key", load) for _ in range(3)),
+        return_exceptions=True,
+    )
+
+    assert all(isinstance(result, RuntimeError) for result in results)
+
+
+@pytest.mark.asyncio
+async def test_listen_invalidations_survives_idle_channel():
+    pubsub = MagicMock()
+    pubsub.__aenter__ = AsyncMock(return_value=pubsub)
+    pubsub.__aexit__ = AsyncMock(return_value=False)
+    pubsub.subscribe = AsyncMock()
+    pubsub.get_message = AsyncMock(
+        side_effect=[
+            None,
+            None,
+            {"type": "message", "data": b"notification:1 notification:2"},
+            asyncio.CancelledError(),
+        ]
+    )
+    redis = MagicMock()
+    redis.pubsub.return_value = pubsub
+    local = MagicMock()
+
+    with (
+        patch("src.core.cache.local_cache", local),
+        pytest.raises(asyncio.CancelledError),
+    ):
+        await listen_invalidations(redis)
+
+    pubsub.subscribe.assert_awaited_once()
+    local.clear.assert_called_once_with()
+    assert [c.args for c in local.delete.call_args_list] == [
+        ("notification:1",),
+        ("notification:2",),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_get_or_load_serves_stale_when_reload_fails(notification):
+    pipe = MagicMock()
+    pipe.__aenter__ = AsyncMock(return_value=pipe)
+    pipe.__aexit__ = AsyncMock(return_value=False)
+    pipe.execute = AsyncMock(
+        return_value=[NotificationSerializer().dumps(notification), 1000]
+    )
+    redis = MagicMock()
+    redis.pipeline.return_value = pipe
+    redis.set = AsyncMock(return_value=True)
+    manager = CacheManager(redis)
+    manager.local = LocalCache(max_size=10, ttl=5)
+    manager.single_flight = SingleFlight()
+    loader = AsyncMock(side_effect=RuntimeError("db down"))
+
+    value = await manager.get_or_load("key", loader, ttl=60)
+
+    loader.assert_awaited_once()
+    assert value.id == notification.id
+    assert value.version == notification.version
+
+
+@pytest.mark.asyncio
+async def test_get_or_load_propagates_error_without_stale_value():
+    pipe = MagicMock()
+    pipe.__aenter__ = AsyncMock(return_value=pipe)
+    pipe.__aexit__ = AsyncMock(return_value=False)
+    pipe.execute = AsyncMock(return_value=[None, -2])
+    redis = MagicMock()
+    redis.pipeline.return_value = pipe
+    manager = CacheManager(redis)
+    manager.local = LocalCache(max_size=10, ttl=5)
+    manager.single_flight = SingleFlight()
+
+    with pytest.raises(RuntimeError):
+        await manager.get_or_load(
+            "key", AsyncMock(side_effect=RuntimeError("db down"))
+        )
+
+
+@pytest.mark.asyncio
+async def test_delete_many_leaves_tombstones(notification):
+    pipe = MagicMock()
+    pipe.__aenter__ = AsyncMock(return_value=pipe)
+    pipe.__aexit__ = AsyncMock(return_value=False)
+    pipe.execute = AsyncMock()
+    redis = MagicMock()
+    redis.pipeline.return_value = pipe
+    redis.register_script.return_value = AsyncMock()
+    manager = CacheManager(redis)
+    manager.local = LocalCache(max_size=10, ttl=5)
+    manager.local.set("a", notification)
+
+    await manager.delete_many(["a", "b"])
+
+    assert manager.local.get("a") is None
+    manager.tombstone.assert_awaited_once_with(
+        keys=["a", "b"],
+        args=[settings.cache.tombstone_ttl],
+        client=pipe,
+    )
+    pipe.publish.assert_called_once_with(
+        settings.cache.invalidation_channel, "a b"
+    )
+
+
+def test_sync_delete_many_leaves_tombstones():
+    pipe = MagicMock()
+    pipe.__enter__.return_value = pipe
+    redis = MagicMock()
+    redis.pipeline.return_value = pipe
+    manager = SyncCacheManager(redis)
+
+    manager.delete_many(["a", "b"])
+
+    manager.tombstone.assert_called_once_with(
+        keys=["a", "b"],
+        args=[settings.cache.tombstone_ttl],
+        client=pipe,
+    )
+    pipe.publish.assert_called_once_with(
+        settings.cache.invalidation_channel, "a b"
+    )
+    pipe.execute.assert_called_once()
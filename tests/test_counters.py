@@ -0,0 +1,96 @@
+import uuid
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from src.repositories.counters_repo import (
+    INCR_IF_EXISTS_SCRIPT,
+    CountersRepository,
+)
+from src.schemas.enums import NotificationCategory, ProcessingStatus
+
+
+def make_redis(is_async=False):
+    pipe = MagicMock()
+    pipe.__enter__.return_value = pipe
+    redis = MagicMock()
+    redis.pipeline.return_value = pipe
+    if is_async:
+        pipe.__aenter__ = AsyncMock(return_value=pipe)
+        pipe.__aexit__ = AsyncMock(return_value=False)
+        pipe.execute = AsyncMock()
+        redis.register_script.return_value = AsyncMock()
+    return redis, pipe
+
+
+def test_first_event_before_first_read_does_not_create_hash():
+    redis, pipe = make_redis()
+    counters = CountersRepository(redis)
+    user_id = uuid.uuid4()
+    note = SimpleNamespace(user_id=user_id)
+
+    counters.sync_on_created([note])
+
+    redis.register_script.assert_called_once_with(INCR_IF_EXISTS_SCRIPT)
+    assert "EXISTS" in INCR_IF_EXISTS_SCRIPT
+    counters.incr_if_exists.assert_called_once_with(
+        keys=[f"counters:user:{user_id}"],
+        args=["", "total", 1, "unread", 1, "status:pending", 1],
+        client=pipe,
+    )
+    pipe.hincrby.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_on_read_skips_zero_deltas():
+    redis, pipe = make_redis(is_async=True)
+    counters = CountersRepository(redis)
+    user_id = uuid.uuid4()
+    notes = [
+        SimpleNamespace(user_id=user_id, category=NotificationCategory.INFO),
+        SimpleNamespace(user_id=user_id, category=None),
+    ]
+
+    await counters.on_read(notes)
+    await counters.on_read([])
+
+    counters.incr_if_exists.assert_awaited_once_with(
+        keys=[f"counters:user:{user_id}"],
+        args=["", "unread", -2, "category:info", -1],
+        client=pipe,
+    )
+
+
+def test_status_change_without_delta_is_not_sent():
+    redis, pipe = make_redis()
+    counters = CountersRepository(redis)
+    note = SimpleNamespace(
+        user_id=uuid.uuid4(),
+        processing_status=ProcessingStatus.PENDING,
+        category=None,
+    )
+
+    counters.sync_on_status_changed([note], ProcessingStatus.PENDING)
+
+    counters.incr_if_exists.assert_not_called()
+
+
+def test_delta_committed_before_rebuild_is_not_applied_twice():
+    fakeredis = pytest.importorskip("fakeredis")
+    counters = CountersRepository(fakeredis.FakeRedis())
+    user_id = uuid.uuid4()
+    note = SimpleNamespace(user_id=user_id)
+    counters.sync_set_many({user_id: {"total": 1}}, rebuilt_at=100.0)
+
+    # Уведомление зафиксировано в 105, пересчет в 110 его уже учел,
+    # и только затем диспетчер применяет приращение.
+    counters.sync_set_many({user_id: {"total": 2}}, rebuilt_at=110.0)
+    counters.sync_on_created([note], committed_at=105.0)
+    fields = counters.redis.hgetall(f"counters:user:{user_id}")
+    assert int(fields[b"total"]) == 2
+
+    # Изменение, зафиксированное после пересчета, применяется.
+    counters.sync_on_created([note], committed_at=115.0)
+    fields = counters.redis.hgetall(f"counters:user:{user_id}")
+    assert int(fields[b"total"]) == 3
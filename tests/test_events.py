@@ -0,0 +1,104 @@
+import asyncio
+import uuid
+from contextlib import asynccontextmanager
+from unittest.mock import MagicMock
+
+import orjson
+import pytest
+
+from src.core.events import (
+    EventBroadcaster,
+    format_sse,
+    status_event,
+    user_channel,
+)
+from src.models.notification import Notification
+from src.schemas.enums import NotificationCategory, ProcessingStatus
+
+
+def make_notification(user_id, status=ProcessingStatus.PENDING):
+    return Notification(
+        id=uuid.uuid4(),
+        user_id=user_id,
+        title="T",
+        text="t",
+        processing_status=status,
+        category=NotificationCategory.INFO,
+        confidence=0.5,
+        version=1,
+    )
+
+
+def test_status_event_and_sse_format():
+    note = make_notification(uuid.uuid4())
+    event = status_event(note)
+
+    assert event["processing_status"] == "pending"
+    assert event["category"] == "info"
+    assert format_sse(None) == b": keep-alive\n\n"
+    payload = format_sse(event)
+    assert payload.startswith(b"event: status\ndata: ")
+    assert orjson.loads(payload.split(b"data: ")[1]) == event
+
+
+@pytest.mark.asyncio
+async def test_broadcaster_fans_out_to_subscribers():
+    broadcaster = EventBroadcaster(MagicMock())
+    user_id = uuid.uuid4()
+    channel = user_channel(user_id).encode()
+    event = {"id": "1", "user_id": str(user_id)}
+
+    async with broadcaster.subscribe([user_id]) as first:
+        async with broadcaster.subscribe([user_id]) as second:
+            broadcaster._dispatch(
+                {"channel": channel, "data": orjson.dumps(event)}
+            )
+        assert second.get_nowait() == event
+        assert first.get_nowait() == event
+        broadcaster._dispatch(
+            {"channel": channel, "data": orjson.dumps(event)}
+        )
+        assert second.empty()
+    assert not broadcaster._subscribers
+
+
+class FakeBroadcaster:
+    def __init__(self, events):
+        self.queue = asyncio.Queue()
+        for event in events:
+            self.queue.put_nowait(event)
+        self.channels = None
+
+    @asynccontextmanager
+    async def subscribe(self, user_ids):
+        self.channels = set(user_ids)
+        yield self.queue
+
+
+@pytest.mark.asyncio
+async def test_stream_status_events_until_processed(service, mock_repo):
+    user_id = uuid.uuid4()
+    note = make_notification(user_id)
+    other = str(uuid.uuid4())
+    mock_repo.get_by_id.return_value = note
+    broadcaster = FakeBroadcaster(
+        [
+            {"id": other, "user_id": str(user_id)},
+            {"id": str(note.id), "processing_status": "processing"},
+            {"id": str(note.id), "processing_status": "completed"},
+        ]
+    )
+
+    events = [
+        event
+        async for event in service.stream_status_events(
+            broadcaster, [], [note]
+        )
+    ]
+
+    assert broadcaster.channels == {user_id}
+    assert [event["processing_status"] for event in events] == [
+        "pending",
+        "processing",
+        "completed",
+    ]
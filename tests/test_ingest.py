@@ -0,0 +1,234 @@
+import csv
+import io
+import uuid
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from unittest.mock import MagicMock, patch
+
+import orjson
+import pytest
+
+from src import ingest
+from src.core.responses import dumps
+from src.repositories.notification_repo import NotificationRepository
+
+
+def test_to_row_validation():
+    now = datetime.now(timezone.utc)
+    user_id = uuid.uuid4()
+
+    row = ingest.to_row(
+        {
+            "user_id": str(user_id),
+            "title": "T",
+            "text": "x",
+            "created_at": "2026-01-02T03:04:05",
+        },
+        now,
+    )
+    assert row.user_id == user_id
+    assert row.created_at == datetime(2026, 1, 2, 3, 4, 5, tzinfo=timezone.utc)
+    assert (
+        ingest.to_row(
+            {"user_id": str(user_id), "title": "T", "text": ""}, now
+        ).created_at
+        == now
+    )
+
+    exported = ingest.to_row(
+        {
+            "user_id": str(user_id),
+            "title": "T",
+            "text": "x",
+            "created_at": "2026-01-02T03:04:05.123456Z",
+        },
+        now,
+    )
+    assert exported.created_at == datetime(
+        2026, 1, 2, 3, 4, 5, 123456, tzinfo=timezone.utc
+    )
+
+    with pytest.raises(ValueError):
+        ingest.to_row({"user_id": "bad", "title": "T", "text": "x"}, now)
+    with pytest.raises(ValueError):
+        ingest.to_row({"user_id": str(user_id), "title": "T" * 257}, now)
+
+
+def test_copy_buffer_quotes_values():
+    row = ingest.to_row(
+        {"user_id": str(uuid.uuid4()), "title": "", "text": 'a "b",\nc'},
+        datetime.now(timezone.utc),
+    )
+
+    line = NotificationRepository.copy_buffer([row.copy_values()]).read()
+
+    assert f'"{row.id}","{row.user_id}","","a ""b"",\nc",' in line
+    assert line.endswith('"PENDING"\r\n')
+
+
+def test_prefetch_propagates_errors():
+    def items():
+        yield 1
+        raise RuntimeError("broken input")
+
+    chunks = ingest.prefetch(items(), 1)
+    assert next(chunks) == 1
+    with pytest.raises(RuntimeError):
+        next(chunks)
+
+
+def test_ingestor_loads_chunks(fake_sync_session):
+    user_id = str(uuid.uuid4())
+    lines = [
+        orjson.dumps({"user_id": user_id, "title": f"T{n}", "text": "x"})
+        for n in range(5)
+    ]
+    lines.insert(2, b'{"user_id": "bad", "title": "T", "text": "x"}')
+    stream = io.BytesIO(b"\n".join(lines))
+    counters = MagicMock()
+
+    with (
+        patch.object(ingest, "get_sync_db_session", fake_sync_session),
+        patch.object(ingest, "get_sync_redis"),
+        patch.object(ingest, "CountersRepository", return_value=counters),
+        patch.object(ingest.Ingestor, "_ensure_partitions"),
+        patch.object(
+            NotificationRepository, "sync_existing_ids", return_value=set()
+        ),
+        patch.object(NotificationRepository, "sync_copy") as sync_copy,
+        patch.object(ingest.analyze_pending_notifications, "delay") as delay,
+    ):
+        stats = ingest.Ingestor().run(ingest.read_ndjson(stream), 2)
+
+    assert (stats.rows, stats.skipped, stats.chunks) == (5, 1, 3)
+    assert sync_copy.call_count == 3
+    assert [len(c.args[0]) for c in counters.sync_on_created.mock_calls] == [
+        2,
+        2,
+        1,
+    ]
+    assert delay.call_count == 3
+
+
+def test_ingestor_skips_existing_ids(fake_sync_session):
+    user_id = str(uuid.uuid4())
+    taken, repeated = str(uuid.uuid4()), str(uuid.uuid4())
+    records = [
+        {"id": taken, "user_id": user_id, "title": "T", "text": "x"},
+        {"id": repeated, "user_id": user_id, "title": "T1", "text": "x"},
+        {"id": repeated, "user_id": user_id, "title": "T2", "text": "x"},
+        {"user_id": user_id, "title": "T3", "text": "x"},
+    ]
+    counters = MagicMock()
+
+    with (
+        patch.object(ingest, "get_sync_db_session", fake_sync_session),
+        patch.object(ingest, "get_sync_redis"),
+        patch.object(ingest, "CountersRepository", return_value=counters),
+        patch.object(ingest.Ingestor, "_ensure_partitions"),
+        patch.object(
+            NotificationRepository,
+            "sync_existing_ids",
+            return_value={uuid.UUID(taken)},
+        ),
+        patch.object(NotificationRepository, "sync_copy") as sync_copy,
+    ):
+        stats = ingest.Ingestor(analyze=False).run(records, 10)
+
+    assert (stats.rows, stats.skipped) == (2, 2)
+    copied = list(csv.reader(sync_copy.call_args.args[0]))
+    assert [row[2] for row in copied] == ["T1", "T3"]
+    assert copied[0][:2] == [repeated, user_id]
+    rows, _ = counters.sync_on_created.call_args.args
+    assert [row.title for row in rows] == ["T1", "T3"]
+
+
+def test_ensure_partitions_commits_before_copy():
+    events = []
+
+    @contextmanager
+    def session():
+        events.append("begin")
+        yield MagicMock()
+        events.append("commit")
+
+    month = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    rows = [
+        ingest.to_row(
+            {"user_id": str(uuid.uuid4()), "title": "T", "text": "x"},
+            datetime(2026, 2, day, tzinfo=timezone.utc),
+        )
+        for day in (3, 4)
+    ]
+
+    with (
+        patch.object(ingest, "get_sync_db_session", session),
+        patch.object(ingest, "get_sync_redis"),
+        patch.object(ingest, "CountersRepository"),
+        patch.object(
+            ingest.PartitionRepository,
+            "sync_list_months",
+            return_value=[month],
+        ),
+        patch.object(
+            ingest.PartitionRepository,
+            "sync_create",
+            side_effect=lambda m: events.append(("create", m)),
+        ),
+        patch.object(
+            NotificationRepository, "sync_existing_ids", return_value=set()
+        ),
+        patch.object(
+            NotificationRepository,
+            "sync_copy",
+            side_effect=lambda _: events.append("copy"),
+        ),
+    ):
+        ingestor = ingest.Ingestor(analyze=False)
+        for row in rows:
+            ingestor.load_chunk([row], io.StringIO())
+
+    next_month = datetime(2026, 2, 1, tzinfo=timezone.utc)
+    assert events == [
+        "begin",
+        ("create", next_month),
+        "commit",
+        "begin",
+        "copy",
+        "commit",
+        "begin",
+        "copy",
+        "commit",
+    ]
+
+
+def test_ingestor_loads_exported_records(fake_sync_session):
+    created_at = datetime(2026, 1, 2, 3, 4, 5, 123456, tzinfo=timezone.utc)
+    exported = dumps(
+        {
+            "id": uuid.uuid4(),
+            "user_id": uuid.uuid4(),
+            "title": "T",
+            "text": "x",
+            "created_at": created_at,
+        }
+    )
+    assert b"05.123456Z" in exported
+
+    with (
+        patch.object(ingest, "get_sync_db_session", fake_sync_session),
+        patch.object(ingest, "get_sync_redis"),
+        patch.object(ingest, "CountersRepository"),
+        patch.object(ingest.Ingestor, "_ensure_partitions"),
+        patch.object(
+            NotificationRepository, "sync_existing_ids", return_value=set()
+        ),
+        patch.object(NotificationRepository, "sync_copy") as sync_copy,
+    ):
+        stats = ingest.Ingestor(analyze=False).run(
+            ingest.read_ndjson(io.BytesIO(exported)), 10
+        )
+
+    assert (stats.rows, stats.skipped) == (1, 0)
+    (copied,) = csv.reader(sync_copy.call_args.args[0])
+    assert datetime.fromisoformat(copied[4]) == created_at
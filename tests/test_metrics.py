@@ -0,0 +1,92 @@
+import uuid
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from prometheus_client import REGISTRY
+from sqlalchemy import create_engine, text
+
+from src.core.cache import CacheStats
+from src.core.metrics import (
+    PrometheusMiddleware,
+    TimedQueuePool,
+    instrument_engine,
+    metrics_endpoint,
+    observe_pending_lag,
+)
+
+
+def sample(name, **labels):
+    return REGISTRY.get_sample_value(name, labels) or 0
+
+
+def test_middleware_labels_route_template():
+    app = FastAPI()
+    app.add_middleware(PrometheusMiddleware)
+    app.add_route("/metrics", metrics_endpoint, include_in_schema=False)
+
+    @app.get("/items/{item_id}")
+    async def get_item(item_id: uuid.UUID):
+        return {"id": str(item_id)}
+
+    labels = {"method": "GET", "route": "/items/{item_id}", "status": "200"}
+    before = sample("http_request_duration_seconds_count", **labels)
+    client = TestClient(app)
+    client.get(f"/items/{uuid.uuid4()}")
+    client.get("/missing")
+
+    assert sample("http_request_duration_seconds_count", **labels) == (
+        before + 1
+    )
+    assert sample(
+        "http_request_duration_seconds_count",
+        method="GET",
+        route="unmatched",
+        status="404",
+    )
+    response = client.get("/metrics")
+    assert "http_request_duration_seconds_bucket" in response.text
+
+
+def test_cache_stats_counts_requests():
+    stats = CacheStats()
+    before = sample("cache_requests_total", tier="redis", result="hit")
+
+    stats.redis_hit()
+    stats.local_miss()
+
+    assert stats.redis_hits == 1 and stats.local_misses == 1
+    assert sample("cache_requests_total", tier="redis", result="hit") == (
+        before + 1
+    )
+
+
+def test_engine_query_and_pool_metrics():
+    engine = create_engine("sqlite://", poolclass=TimedQueuePool)
+    instrument_engine(engine, "test")
+    labels = {"engine": "test", "operation": "SELECT"}
+    checkouts = sample("db_pool_checkout_seconds_count")
+
+    with engine.connect() as conn:
+        conn.execute(text("SELECT 1"))
+        assert sample("db_pool_connections_in_use", engine="test") == 1
+
+    assert sample("db_pool_connections_in_use", engine="test") == 0
+    assert sample("db_query_duration_seconds_count", **labels) == 1
+    assert sample("db_pool_checkout_seconds_count") == checkouts + 1
+
+
+def test_observe_pending_lag_skips_unloaded():
+    before = sample("notification_pending_lag_seconds_count")
+    created_at = datetime.now(timezone.utc) - timedelta(seconds=30)
+
+    observe_pending_lag(
+        [
+            SimpleNamespace(created_at=created_at),
+            SimpleNamespace(created_at=None),
+        ]
+    )
+
+    assert sample("notification_pending_lag_seconds_count") == before + 1
+    assert sample("notification_pending_lag_seconds_sum") >= 30
@@ -0,0 +1,203 @@
+import uuid
+from datetime import datetime, timezone
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from sqlalchemy import insert
+from sqlalchemy.dialects import postgresql
+
+from src.core.routing import ReplicaRouter, RoutingSession, use_primary
+from src.models.notification import Notification
+from src.repositories.notification_repo import (
+    DTO_COLUMNS,
+    GET_BY_ID_QUERY,
+    GET_BY_KEY_QUERY,
+    NotificationRepository,
+)
+from src.schemas.enums import ProcessingStatus
+from src.schemas.filters import NotificationFilter
+from src.schemas.notifications import NotificationDTO
+
+
+def make_row():
+    now = datetime.now(timezone.utc)
+    return (
+        uuid.uuid4(),
+        uuid.uuid4(),
+        "Title",
+        "Text",
+        now,
+        now,
+        None,
+        None,
+        None,
+        ProcessingStatus.PENDING,
+        [],
+        1,
+    )
+
+
+def test_dto_columns_match_dto_fields():
+    assert [c.key for c in DTO_COLUMNS] == list(
+        NotificationDTO.__dataclass_fields__
+    )
+
+
+@pytest.mark.asyncio
+async def test_core_read_path_maps_rows_to_dto():
+    row = make_row()
+    session = MagicMock()
+    result = MagicMock()
+    result.one_or_none.return_value = row
+    result.__iter__.return_value = iter([row])
+    session.execute = AsyncMock(return_value=result)
+    repo = NotificationRepository(session)
+
+    note = await repo.get_by_id(row[0])
+    notes = await repo.list(NotificationFilter(user_id=row[1]))
+
+    assert session.execute.await_args_list[0].args == (
+        GET_BY_ID_QUERY,
+        {"notific_id": row[0]},
+    )
+    assert note == NotificationDTO(*row)
+    assert notes == [NotificationDTO(*row)]
+
+
+def test_conditional_update_refreshes_loaded_instances():
+    session = MagicMock()
+    repo = NotificationRepository(session)
+
+    repo.sync_update_if_status(
+        uuid.uuid4(),
+        ProcessingStatus.PROCESSING,
+        {"processing_status": ProcessingStatus.COMPLETED},
+    )
+
+    statement = session.execute.call_args.args[0]
+    assert statement.get_execution_options()["populate_existing"]
+
+
+def test_requeue_stale_selects_only_old_processing_rows():
+    session = MagicMock()
+    repo = NotificationRepository(session)
+
+    repo.sync_requeue_stale(datetime.now(timezone.utc), 10)
+
+    sql = str(
+        session.execute.call_args.args[0].compile(dialect=postgresql.dialect())
+    )
+    assert "notifications.updated_at < " in sql
+    assert "FOR UPDATE SKIP LOCKED" in sql
+    assert "processing_status=%(processing_status)s" in sql
+
+
+def execute_result(rows):
+    result = MagicMock()
+    result.all.return_value = rows
+    result.__iter__.return_value = iter(rows)
+    return result
+
+
+@pytest.mark.asyncio
+async def test_mark_many_as_read_in_keyset_chunks():
+    rows = [make_row() for _ in range(3)]
+    keys = [SimpleNamespace(created_at=row[4], id=row[0]) for row in rows]
+    session = MagicMock()
+    session.execute = AsyncMock(
+        side_effect=[
+            execute_result(keys[:2]),
+            execute_result(rows[:2]),
+            execute_result(keys[2:]),
+            execute_result(rows[2:]),
+        ]
+    )
+    session.commit = AsyncMock()
+    cache = MagicMock()
+    cache.write_through = AsyncMock()
+    repo = NotificationRepository(session, cache)
+
+    chunks = [
+        chunk
+        async for chunk in repo.mark_many_as_read(
+            user_id=rows[0][1], chunk_size=2
+        )
+    ]
+
+    assert chunks == [
+        [NotificationDTO(*row) for row in rows[:2]],
+        [NotificationDTO(*row) for row in rows[2:]],
+    ]
+    assert session.commit.await_count == 2
+    assert cache.write_through.await_count == 2
+    second_keys = session.execute.await_args_list[2].args[0]
+    params = second_keys.compile().params.values()
+    assert keys[1].created_at in params and keys[1].id in params
+
+
+def test_batch_insert_keeps_insertmanyvalues_sentinel():
+    # Без sentinel SQLAlchemy выполняет INSERT ... RETURNING с
+    # sort_by_parameter_order по одной строке.
+    statement = insert(Notification).returning(
+        Notification.id, sort_by_parameter_order=True
+    )
+
+    compiled = statement.compile(
+        dialect=postgresql.asyncpg.dialect(),
+        for_executemany=True,
+        column_keys=["user_id", "title", "text"],
+    )
+
+    assert compiled._insertmanyvalues.sentinel_columns == (
+        Notification.__table__.c.id,
+    )
+
+
+@pytest.mark.asyncio
+async def test_get_by_id_prunes_partitions_by_created_at():
+    row = make_row()
+    session = MagicMock()
+    result = MagicMock()
+    result.one_or_none.return_value = row
+    session.execute = AsyncMock(return_value=result)
+    repo = NotificationRepository(session)
+
+    await repo.get_by_id(row[0], row[4])
+
+    assert session.execute.await_args.args == (
+        GET_BY_KEY_QUERY,
+        {"notific_id": row[0], "created_at": row[4]},
+    )
+    by_id = str(GET_BY_ID_QUERY.compile(dialect=postgresql.dialect()))
+    by_key = str(GET_BY_KEY_QUERY.compile(dialect=postgresql.dialect()))
+    assert "notifications.created_at = (SELECT notification_keys" in by_id
+    assert "notification_keys" not in by_key
+
+
+@pytest.mark.asyncio
+async def test_get_by_id_rechecks_replica_miss_on_primary():
+    row = make_row()
+    router = ReplicaRouter(MagicMock(), [MagicMock()], max_lag=10)
+    session = MagicMock(sync_session=RoutingSession(router=router))
+    primary_flags = []
+
+    async def execute(*_):
+        primary_flags.append(use_primary.get())
+        result = MagicMock()
+        result.one_or_none.return_value = row if use_primary.get() else None
+        return result
+
+    session.execute = execute
+    repo = NotificationRepository(session)
+
+    note = await repo.get_by_id(row[0])
+
+    assert note == NotificationDTO(*row)
+    assert primary_flags == [False, True]
+    assert use_primary.get() is False
+
+    router._healthy = []
+    primary_flags.clear()
+    assert await repo.get_by_id(row[0]) is None
+    assert primary_flags == [False]
@@ -0,0 +1,77 @@
+import uuid
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from src import outbox_dispatcher
+from src.models.outbox import NotificationOutbox
+from src.outbox_dispatcher import OutboxDispatcher
+
+
+@pytest.fixture
+def outbox_repo(fake_sync_session):
+    """Мок репозитория outbox."""
+    repo = MagicMock()
+    with (
+        patch.object(outbox_dispatcher, "OutboxRepository") as repo_cls,
+        patch.object(
+            outbox_dispatcher, "get_sync_db_session", fake_sync_session
+        ),
+        patch.object(outbox_dispatcher, "get_sync_redis"),
+    ):
+        repo_cls.return_value = repo
+        yield repo
+
+
+def make_row(row_id):
+    return NotificationOutbox(
+        id=row_id, notification_id=uuid.uuid4(), user_id=uuid.uuid4()
+    )
+
+
+def test_dispatch_batch(outbox_repo):
+    rows = [make_row(1), make_row(2)]
+    outbox_repo.sync_claim.return_value = rows
+    dispatcher = OutboxDispatcher(batch_size=10)
+
+    with patch.object(outbox_dispatcher, "group") as mock_group:
+        assert dispatcher.dispatch_batch() == 2
+
+    outbox_repo.sync_claim.assert_called_once_with(10)
+    signatures = list(mock_group.call_args.args[0])
+    assert [s.args for s in signatures] == [
+        (rows[0].notification_id,),
+        (rows[1].notification_id,),
+    ]
+    mock_group.return_value.apply_async.assert_called_once_with()
+    outbox_repo.sync_mark_dispatched.assert_called_once_with([1, 2])
+
+
+def test_dispatch_batch_broker_error(outbox_repo):
+    outbox_repo.sync_claim.return_value = [make_row(1)]
+    dispatcher = OutboxDispatcher(batch_size=10)
+
+    with patch.object(outbox_dispatcher, "group") as mock_group:
+        mock_group.return_value.apply_async.side_effect = ConnectionError
+        with pytest.raises(ConnectionError):
+            dispatcher.dispatch_batch()
+
+    outbox_repo.sync_mark_dispatched.assert_not_called()
+
+
+def test_dispatch_batch_stamps_counters_after_commit(
+    outbox_repo, sync_session
+):
+    rows = [make_row(1)]
+    outbox_repo.sync_claim.return_value = rows
+    events = []
+    sync_session.commit.side_effect = lambda: events.append("commit")
+    sync_session.scalar.side_effect = lambda _: events.append("clock") or 42
+    dispatcher = OutboxDispatcher(batch_size=10)
+    dispatcher.counters = MagicMock()
+
+    with patch.object(outbox_dispatcher, "group"):
+        dispatcher.dispatch_batch()
+
+    assert events == ["commit", "clock"]
+    dispatcher.counters.sync_on_created.assert_called_once_with(rows, 42.0)
@@ -0,0 +1,38 @@
+import uuid
+from datetime import datetime, timezone
+
+import pytest
+
+from src.core.exceptions import InvalidCursorError
+from src.core.pagination import (
+    decode_cursor,
+    decode_rank_cursor,
+    encode_cursor,
+    encode_rank_cursor,
+)
+
+
+def test_cursor_roundtrip():
+    created_at = datetime(2025, 4, 18, 12, 30, 1, 123456, tzinfo=timezone.utc)
+    notific_id = uuid.uuid4()
+
+    cursor = encode_cursor(created_at, notific_id)
+
+    assert decode_cursor(cursor) == (created_at, notific_id)
+
+
+@pytest.mark.parametrize("cursor", ["", "not-a-cursor", "bm9waXBl"])
+def test_decode_invalid_cursor(cursor):
+    with pytest.raises(InvalidCursorError):
+        decode_cursor(cursor)
+
+
+def test_rank_cursor_roundtrip():
+    rank = 0.6687197685241699
+    notific_id = uuid.uuid4()
+
+    cursor = encode_rank_cursor(rank, notific_id)
+
+    assert decode_rank_cursor(cursor) == (rank, notific_id)
+    with pytest.raises(InvalidCursorError):
+        decode_rank_cursor(encode_cursor(datetime.now(), notific_id))
@@ -0,0 +1,157 @@
+import uuid
+from datetime import datetime, timedelta, timezone
+from unittest.mock import MagicMock, patch
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from src.repositories.counters_repo import CountersRepository
+from src.repositories.notification_repo import NotificationRepository
+from src.repositories.partition_repo import PartitionRepository
+from src.schemas.enums import NotificationCategory, ProcessingStatus
+from src.tasks import task_partitions
+
+
+def test_month_helpers():
+    moscow = timezone(timedelta(hours=3))
+    month = PartitionRepository.month_start(
+        datetime(2026, 1, 1, 1, 30, tzinfo=moscow)
+    )
+
+    assert month == datetime(2025, 12, 1, tzinfo=timezone.utc)
+    assert PartitionRepository.add_months(month, 1) == datetime(
+        2026, 1, 1, tzinfo=timezone.utc
+    )
+    assert PartitionRepository.add_months(month, -12) == datetime(
+        2024, 12, 1, tzinfo=timezone.utc
+    )
+    assert PartitionRepository.partition_name(month) == (
+        "notifications_2025_12"
+    )
+
+
+def test_maintain_notification_partitions(fake_sync_session):
+    current = PartitionRepository.month_start(datetime.now(timezone.utc))
+    months = [PartitionRepository.add_months(current, n) for n in (-3, 0)]
+    rows = [(uuid.uuid4(), ProcessingStatus.COMPLETED, None, True, 2)]
+    counters = MagicMock()
+
+    with (
+        patch.object(
+            task_partitions, "get_sync_db_session", fake_sync_session
+        ),
+        patch.object(task_partitions, "get_sync_redis"),
+        patch.object(
+            task_partitions, "CountersRepository", return_value=counters
+        ),
+        patch.object(
+            PartitionRepository, "sync_list_months", return_value=months
+        ),
+        patch.object(PartitionRepository, "sync_create") as sync_create,
+        patch.object(PartitionRepository, "sync_detach") as sync_detach,
+        patch.object(
+            PartitionRepository,
+            "sync_list_detached_months",
+            return_value=[months[0]],
+        ),
+        patch.object(
+            PartitionRepository,
+            "sync_detached_ids",
+            return_value=iter([[uuid.uuid4()]]),
+        ),
+        patch.object(PartitionRepository, "sync_drop") as sync_drop,
+        patch.object(
+            NotificationRepository, "sync_clock", return_value=1760000000.5
+        ),
+        patch.object(
+            NotificationRepository, "sync_count_detached", return_value=rows
+        ),
+        patch.object(
+            NotificationRepository, "sync_invalidate"
+        ) as sync_invalidate,
+    ):
+        result = task_partitions.maintain_notification_partitions(
+            months_ahead=2, retention_months=2
+        )
+
+    assert [call.args[0] for call in sync_create.call_args_list] == [
+        PartitionRepository.add_months(current, 1),
+        PartitionRepository.add_months(current, 2),
+    ]
+    sync_detach.assert_called_once_with(months[0])
+    counters.sync_on_dropped.assert_called_once_with(rows, 1760000000.5)
+    sync_invalidate.assert_called_once()
+    sync_drop.assert_called_once_with(months[0])
+    assert result["dropped"] == [PartitionRepository.partition_name(months[0])]
+
+
+def test_drop_removes_notification_keys_partition():
+    session = MagicMock()
+    month = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    repo = PartitionRepository(session)
+
+    repo.sync_detach(month)
+    repo.sync_drop(month)
+
+    statements = [str(call.args[0]) for call in session.execute.call_args_list]
+    assert statements == [
+        "ALTER TABLE notifications DETACH PARTITION notifications_2026_01",
+        "ALTER TABLE notification_keys "
+        "DETACH PARTITION notification_keys_2026_01",
+        "DROP TABLE notifications_2026_01",
+        "DROP TABLE notification_keys_2026_01",
+    ]
+
+
+def test_count_detached_partition():
+    table = PartitionRepository.detached_table(
+        datetime(2026, 1, 1, tzinfo=timezone.utc)
+    )
+
+    query = NotificationRepository._counts_query(table=table)
+
+    compiled = str(query.compile(dialect=postgresql.dialect()))
+    assert "FROM notifications_2026_01" in compiled
+    assert (
+        "notification_outbox.notification_id = notifications_2026_01.id"
+        in (compiled)
+    )
+
+
+def test_counters_on_dropped_partition():
+    fakeredis = pytest.importorskip("fakeredis")
+    counters = CountersRepository(fakeredis.FakeRedis())
+    user_id = uuid.uuid4()
+    counters.sync_set_many(
+        {
+            user_id: {
+                "total": 5,
+                "unread": 3,
+                "category:info": 1,
+                "status:completed": 5,
+            }
+        },
+        rebuilt_at=100.0,
+    )
+
+    counters.sync_on_dropped(
+        [
+            (user_id, ProcessingStatus.COMPLETED, None, False, 2),
+            (
+                user_id,
+                ProcessingStatus.COMPLETED,
+                NotificationCategory.INFO,
+                True,
+                1,
+            ),
+        ],
+        committed_at=200.0,
+    )
+
+    assert counters.redis.hgetall(counters._key(user_id)) == {
+        b"total": b"2",
+        b"unread": b"2",
+        b"category:info": b"0",
+        b"status:completed": b"2",
+        b"rebuilt_at": b"100.0",
+    }
@@ -0,0 +1,64 @@
+import uuid
+from datetime import datetime, timezone
+
+import orjson
+
+from src.core.responses import NotificationJSONResponse
+from src.schemas.enums import NotificationCategory, ProcessingStatus
+from src.schemas.notifications import (
+    NotificationDTO,
+    NotificationResponse,
+    NotificationSearchResult,
+)
+
+
+class DriverUUID(uuid.UUID):
+    """Подкласс UUID, как у asyncpg."""
+
+
+def test_notification_json_matches_response_model():
+    now = datetime.now(timezone.utc)
+    note = NotificationDTO(
+        id=DriverUUID(int=1),
+        user_id=uuid.uuid4(),
+        title="Title",
+        text="Text",
+        created_at=now,
+        updated_at=now,
+        read_at=None,
+        category=NotificationCategory.WARNING,
+        confidence=0.5,
+        processing_status=ProcessingStatus.COMPLETED,
+        keywords=["disk"],
+        version=3,
+    )
+    expected = NotificationResponse.model_validate(note).model_dump_json()
+
+    assert NotificationJSONResponse(note).body == expected.encode()
+    assert NotificationJSONResponse([note]).body == orjson.dumps(
+        [orjson.loads(expected)]
+    )
+
+
+def test_search_result_json_matches_response_model():
+    now = datetime.now(timezone.utc)
+    row = {
+        "id": DriverUUID(int=1),
+        "user_id": uuid.uuid4(),
+        "title": "Title",
+        "text": "Text",
+        "created_at": now,
+        "updated_at": now,
+        "read_at": None,
+        "category": NotificationCategory.INFO,
+        "confidence": 0.5,
+        "processing_status": ProcessingStatus.COMPLETED,
+        "keywords": ["disk"],
+        "version": 3,
+        "rank": 0.25,
+    }
+    result = NotificationSearchResult.model_validate(row)
+
+    assert NotificationJSONResponse([result]).body == orjson.dumps(
+        [orjson.loads(result.model_dump_json())]
+    )
@@ -0,0 +1,81 @@
+from unittest.mock import MagicMock
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import select, update
+
+from src.core.routing import (
+    ReadYourWritesMiddleware,
+    ReplicaRouter,
+    RoutingSession,
+    use_primary,
+)
+from src.models.notification import Notification
+
+
+def make_router(replicas=2):
+    return ReplicaRouter(
+        MagicMock(), [MagicMock() for _ in range(replicas)], max_lag=10
+    )
+
+
+def test_reader_round_robin_and_fallback():
+    router = make_router()
+    replicas = [replica.sync_engine for replica in router.replicas]
+
+    assert [router.reader() for _ in range(3)] == [
+        replicas[0],
+        replicas[1],
+        replicas[0],
+    ]
+    token = use_primary.set(True)
+    assert router.reader() is router.primary.sync_engine
+    use_primary.reset(token)
+
+    assert router.has_healthy_replica
+    router._healthy = []
+    assert not router.has_healthy_replica
+    assert router.reader() is router.primary.sync_engine
+
+
+def test_session_pins_to_primary_after_write():
+    router = make_router(replicas=1)
+    session = RoutingSession(router=router)
+    read = select(Notification)
+
+    assert session.get_bind(clause=read) is router.replicas[0].sync_engine
+    assert (
+        session.get_bind(clause=read.with_for_update())
+        is router.primary.sync_engine
+    )
+    assert session.get_bind(clause=read) is router.primary.sync_engine
+
+    session = RoutingSession(router=router)
+    session.get_bind(clause=update(Notification).values(title="t"))
+    assert session.get_bind(clause=read) is router.primary.sync_engine
+
+
+def test_session_without_router_uses_bind():
+    bind = MagicMock()
+    session = RoutingSession(bind=bind)
+
+    assert session.get_bind(clause=select(Notification)) is bind
+
+
+def test_read_your_writes_cookie():
+    app = FastAPI()
+    app.add_middleware(ReadYourWritesMiddleware, window=5)
+
+    @app.get("/")
+    async def read():
+        return {"primary": use_primary.get()}
+
+    @app.post("/")
+    async def write():
+        return {}
+
+    client = TestClient(app)
+    assert client.get("/").json() == {"primary": False}
+    response = client.post("/")
+    assert ReadYourWritesMiddleware.COOKIE in response.cookies
+    assert client.get("/").json() == {"primary": True}
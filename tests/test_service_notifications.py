@@ -1,15 +1,25 @@
+import csv
+import io
 import uuid
+from datetime import datetime, timezone
 from unittest.mock import patch
 
+import orjson
 import pytest
 
 from src.models.notification import Notification
-from src.schemas.filters import NotificationFilter
+from src.schemas.enums import NotificationCategory, ProcessingStatus
+from src.schemas.filters import NotificationExport, NotificationFilter
+from src.schemas.notifications import (
+    NotificationBulkRead,
+    NotificationCreate,
+    NotificationDTO,
+)
 from src.tasks.task_analyze import analyze_notification
 
 
 @pytest.mark.asyncio
-async def test_create_notification(service, mock_repo):
+async def test_create_notification(service, mock_repo, mock_counters):
     dummy_id = uuid.uuid4()
     user_id = uuid.uuid4()
     text = "Test notification"
@@ -24,10 +34,34 @@ async def test_create_notification(service, mock_repo):
         result = await service.create_notification(user_id, title, text)
 
         mock_repo.create.assert_awaited_once()
-        mock_delay.assert_called_once_with(dummy_id, text)
+        # Задача ставится в очередь диспетчером outbox, а не запросом.
+        mock_delay.assert_not_called()
+        assert not mock_counters.method_calls
         assert result is created_note
 
 
+@pytest.mark.asyncio
+async def test_create_notifications(service, mock_repo):
+    user_id = uuid.uuid4()
+    payloads = [
+        NotificationCreate(user_id=user_id, title="A", text="t1"),
+        NotificationCreate(user_id=user_id, title="B", text="t2"),
+    ]
+    created = []
+    for payload in payloads:
+        note = Notification(**payload.model_dump())
+        note.id = uuid.uuid4()
+        created.append(note)
+    mock_repo.create_many.return_value = created
+
+    result = await service.create_notifications(payloads)
+
+    mock_repo.create_many.assert_awaited_once_with(
+        [payload.model_dump() for payload in payloads]
+    )
+    assert result == created
+
+
 @pytest.mark.asyncio
 async def test_list_notifications(service, mock_repo):
     filters = NotificationFilter(user_id=uuid.uuid4(), limit=5, offset=2)
@@ -43,6 +77,60 @@ async def test_list_notifications(service, mock_repo):
     assert result == notifications
 
 
+@pytest.mark.asyncio
+async def test_export_notifications(service, mock_repo):
+    now = datetime.now(timezone.utc)
+    notes = [
+        NotificationDTO(
+            id=uuid.uuid4(),
+            user_id=uuid.uuid4(),
+            title=f"Title {n}",
+            text="Text, with comma",
+            created_at=now,
+            updated_at=now,
+            read_at=None,
+            category=NotificationCategory.INFO,
+            confidence=0.5,
+            processing_status=ProcessingStatus.COMPLETED,
+            keywords=["a", "b"],
+        )
+        for n in range(3)
+    ]
+
+    async def stream(filters, chunk_size):
+        yield notes[:2]
+        yield notes[2:]
+
+    mock_repo.stream = stream
+
+    chunks = [
+        chunk
+        async for chunk in service.export_notifications(NotificationExport())
+    ]
+    assert len(chunks) == 2
+    lines = b"".join(chunks).splitlines()
+    assert [orjson.loads(line)["title"] for line in lines] == [
+        "Title 0",
+        "Title 1",
+        "Title 2",
+    ]
+
+    rows = [
+        chunk
+        async for chunk in service.export_notifications(
+            NotificationExport(format="csv")
+        )
+    ]
+    reader = csv.DictReader(io.StringIO(b"".join(rows).decode()))
+    records = list(reader)
+    assert len(records) == 3
+    assert records[0]["text"] == "Text, with comma"
+    assert records[0]["read_at"] == ""
+    assert records[0]["keywords"] == "a;b"
+    assert records[0]["category"] == "info"
+    assert mock_repo.release.await_count == 2
+
+
 @pytest.mark.asyncio
 async def test_get_notification(service, mock_repo):
     nid = uuid.uuid4()
@@ -59,20 +147,108 @@ async def test_get_notification(service, mock_repo):
 
 
 @pytest.mark.asyncio
-async def test_mark_as_read(service, mock_repo):
+async def test_mark_as_read(service, mock_repo, mock_counters):
     nid = uuid.uuid4()
     updated_notification = Notification(
         user_id=uuid.uuid4(), title="C", text="t"
     )
-    mock_repo.update.return_value = updated_notification
+    mock_repo.mark_as_read.return_value = updated_notification
 
     result = await service.mark_as_read(nid)
-    mock_repo.update.assert_awaited_once()
+    mock_repo.mark_as_read.assert_awaited_once_with(nid)
+    mock_counters.on_read.assert_awaited_once_with([updated_notification])
     assert result == updated_notification
 
-    mock_repo.update.return_value = None
+    mock_repo.mark_as_read.return_value = None
+    mock_repo.get_by_id.return_value = None
     result_none = await service.mark_as_read(nid)
     assert result_none is None
+    mock_counters.on_read.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_mark_many_as_read(service, mock_repo, mock_counters):
+    user_id = uuid.uuid4()
+    payload = NotificationBulkRead(
+        user_id=user_id, category=NotificationCategory.INFO
+    )
+    chunks = [
+        [(uuid.uuid4(), user_id, NotificationCategory.INFO)] * 2,
+        [(uuid.uuid4(), user_id, NotificationCategory.INFO)],
+    ]
+
+    async def mark_many_as_read(**_):
+        for chunk in chunks:
+            yield chunk
+
+    mock_repo.mark_many_as_read.side_effect = mark_many_as_read
+
+    result = await service.mark_many_as_read(payload)
+
+    mock_repo.mark_many_as_read.assert_called_once_with(
+        ids=None,
+        user_id=user_id,
+        category=NotificationCategory.INFO,
+        created_before=None,
+    )
+    assert [c.args[0] for c in mock_counters.on_read.await_args_list] == (
+        chunks
+    )
+    assert result == 3
+
+
+@pytest.mark.asyncio
+async def test_get_user_counters_from_cache(service, mock_repo, mock_counters):
+    user_id = uuid.uuid4()
+    mock_counters.get.return_value = {
+        "total": 3,
+        "unread": 2,
+        "category:info": 1,
+        "status:completed": 3,
+    }
+
+    result = await service.get_user_counters(user_id)
+
+    mock_repo.count_by_users.assert_not_awaited()
+    assert result.total == 3
+    assert result.unread == 2
+    assert result.unread_by_category == {"info": 1}
+    assert result.by_status == {"completed": 3}
+
+
+@pytest.mark.asyncio
+async def test_get_user_counters_rebuilds_on_miss(
+    service, mock_repo, mock_counters
+):
+    user_id = uuid.uuid4()
+    mock_counters.get.return_value = None
+    mock_repo.count_by_users.return_value = [
+        (user_id, ProcessingStatus.COMPLETED, NotificationCategory.INFO, 1, 2),
+        (user_id, ProcessingStatus.PENDING, None, 0, 1),
+    ]
+
+    result = await service.get_user_counters(user_id)
+
+    mock_repo.count_by_users.assert_awaited_once_with([user_id])
+    mock_counters.set.assert_awaited_once_with(
+        user_id,
+        {
+            "total": 3,
+            "unread": 2,
+            "status:completed": 2,
+            "status:pending": 1,
+            "category:info": 2,
+        },
+        1760000000.5,
+    )
+    assert result.total == 3
+    assert result.unread == 2
+    assert result.by_status == {"completed": 2, "pending": 1}
+
+
+def test_bulk_read_requires_target():
+    with pytest.raises(ValueError):
+        NotificationBulkRead(category=NotificationCategory.INFO)
 
 
 @pytest.mark.asyncio
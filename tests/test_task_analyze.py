@@ -0,0 +1,201 @@
+import uuid
+from datetime import datetime, timedelta, timezone
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from src.core.analysis_cache import AnalysisCache
+from src.models.notification import Notification
+from src.schemas.enums import ProcessingStatus
+from src.tasks import task_analyze
+
+
+@pytest.fixture
+def sync_counters():
+    """Мок репозитория счетчиков для задач Celery."""
+    with patch.object(task_analyze, "CountersRepository") as counters_cls:
+        yield counters_cls.return_value
+
+
+@pytest.fixture
+def sync_repo(sync_counters, fake_sync_session):
+    """Мок синхронного репозитория для задач Celery."""
+    repo = MagicMock()
+    with (
+        patch.object(task_analyze, "NotificationRepository") as repo_cls,
+        patch.object(task_analyze, "get_sync_db_session", fake_sync_session),
+        patch.object(task_analyze, "get_sync_redis"),
+        patch.object(task_analyze, "_analysis_cache", return_value=None),
+    ):
+        repo_cls.return_value = repo
+        yield repo
+
+
+def test_analyze_notification(sync_repo, sync_counters):
+    note = Notification(
+        id=uuid.uuid4(), user_id=uuid.uuid4(), title="A", text="db text"
+    )
+    note.processing_status = ProcessingStatus.PROCESSING
+    done = Notification(id=note.id, user_id=note.user_id, title="A")
+    done.processing_status = ProcessingStatus.COMPLETED
+    sync_repo.sync_update_if_status.side_effect = [note, done]
+
+    with patch.object(task_analyze, "AIService") as ai_cls:
+        ai_cls.return_value.analyze_text.return_value = {
+            "category": "info",
+            "confidence": 0.8,
+            "keywords": ["db"],
+        }
+        result = task_analyze.analyze_notification(note.id, "stale text")
+
+    assert result == {"status": "success"}
+    ai_cls.return_value.analyze_text.assert_called_once_with("db text")
+    assert sync_repo.sync_update_if_status.call_args_list[1].args == (
+        note.id,
+        ProcessingStatus.PROCESSING,
+        {
+            "category": "info",
+            "confidence": 0.8,
+            "keywords": ["db"],
+            "processing_status": ProcessingStatus.COMPLETED,
+        },
+    )
+
+
+def test_analyze_notification_redelivered(sync_repo, sync_counters):
+    sync_repo.sync_update_if_status.return_value = None
+
+    with patch.object(task_analyze, "AIService") as ai_cls:
+        result = task_analyze.analyze_notification(uuid.uuid4())
+
+    assert result == {"status": "skipped"}
+    sync_repo.sync_update_if_status.assert_called_once()
+    ai_cls.return_value.analyze_text.assert_not_called()
+    sync_counters.sync_on_status_changed.assert_not_called()
+
+
+def test_analyze_pending_notifications(sync_repo, sync_counters):
+    notes = [
+        Notification(id=uuid.uuid4(), user_id=uuid.uuid4(), title="A", text=t)
+        for t in ("some error", "broken")
+    ]
+    sync_repo.sync_claim_pending.side_effect = [notes, []]
+    analysis = {"category": "critical", "confidence": 0.9, "keywords": []}
+
+    with patch.object(task_analyze, "AIService") as ai_cls:
+        analyze_many = ai_cls.return_value.analyze_many = AsyncMock()
+        analyze_many.return_value = [analysis, RuntimeError("boom")]
+        result = task_analyze.analyze_pending_notifications(
+            batch_size=2, concurrency=4
+        )
+
+    assert result == {"status": "success", "processed": 2}
+    analyze_many.assert_awaited_once_with(["some error", "broken"], 4)
+    sync_repo.sync_claim_pending.assert_called_with(2)
+    sync_repo.sync_bulk_update_results.assert_called_once_with(
+        [
+            {
+                "id": notes[0].id,
+                "category": "critical",
+                "confidence": 0.9,
+                "keywords": [],
+                "processing_status": ProcessingStatus.COMPLETED,
+            },
+            {
+                "id": notes[1].id,
+                "category": None,
+                "confidence": None,
+                "keywords": [],
+                "processing_status": ProcessingStatus.FAILED,
+            },
+        ]
+    )
+    sync_counters.sync_on_status_changed.assert_any_call(
+        notes, ProcessingStatus.PENDING
+    )
+    sync_counters.sync_on_status_changed.assert_any_call(
+        sync_repo.sync_bulk_update_results.return_value,
+        ProcessingStatus.PROCESSING,
+    )
+
+
+def test_analyze_pending_notifications_max_batches(sync_repo):
+    note = Notification(
+        id=uuid.uuid4(), user_id=uuid.uuid4(), title="A", text="text"
+    )
+    sync_repo.sync_claim_pending.return_value = [note]
+
+    with patch.object(task_analyze, "AIService") as ai_cls:
+        ai_cls.return_value.analyze_many = AsyncMock(
+            return_value=[{"category": "info", "confidence": 0.9}]
+        )
+        result = task_analyze.analyze_pending_notifications(
+            batch_size=1, max_batches=3
+        )
+
+    assert result == {"status": "success", "processed": 3}
+    assert sync_repo.sync_bulk_update_results.call_count == 3
+
+
+def test_analyze_batch_uses_analysis_cache():
+    notes = [
+        Notification(id=uuid.uuid4(), user_id=uuid.uuid4(), title="A", text=t)
+        for t in ("cached", "New  text", "new text", "broken")
+    ]
+    cached = {"category": "info", "confidence": 0.9, "keywords": []}
+    fresh = {"category": "warning", "confidence": 0.7, "keywords": []}
+    error = RuntimeError("boom")
+    analysis_cache = MagicMock()
+    analysis_cache.key.side_effect = AnalysisCache.key
+    analysis_cache.get_many.side_effect = lambda keys: [
+        cached if key == AnalysisCache.key("cached") else None for key in keys
+    ]
+    ai_service = MagicMock()
+    ai_service.analyze_many = AsyncMock(return_value=[fresh, error])
+
+    result = task_analyze._analyze_batch(ai_service, analysis_cache, notes, 4)
+
+    assert result == [cached, fresh, fresh, error]
+    ai_service.analyze_many.assert_awaited_once_with(
+        ["New  text", "broken"], 4
+    )
+    analysis_cache.set_many.assert_called_once_with(
+        {AnalysisCache.key("new text"): fresh}
+    )
+
+
+def test_requeue_stale_notifications(sync_repo, sync_counters):
+    notes = [
+        Notification(id=uuid.uuid4(), user_id=uuid.uuid4(), title="A")
+        for _ in range(3)
+    ]
+    sync_repo.sync_requeue_stale.side_effect = [notes[:2], notes[2:], []]
+
+    with (
+        patch.object(task_analyze.settings.analysis, "batch_size", 2),
+        patch.object(
+            task_analyze.analyze_pending_notifications, "delay"
+        ) as delay,
+    ):
+        result = task_analyze.requeue_stale_notifications(timeout=60)
+
+    assert result == {"status": "success", "requeued": 3}
+    claimed_before, limit = sync_repo.sync_requeue_stale.call_args.args
+    assert limit == 2
+    assert claimed_before < datetime.now(timezone.utc) - timedelta(seconds=59)
+    sync_counters.sync_on_status_changed.assert_any_call(
+        notes[:2], ProcessingStatus.PROCESSING
+    )
+    delay.assert_called_once_with(max_batches=2)
+
+
+def test_requeue_stale_notifications_nothing_stale(sync_repo):
+    sync_repo.sync_requeue_stale.return_value = []
+
+    with patch.object(
+        task_analyze.analyze_pending_notifications, "delay"
+    ) as delay:
+        result = task_analyze.requeue_stale_notifications()
+
+    assert result == {"status": "success", "requeued": 0}
+    delay.assert_not_called()